@@ -0,0 +1,4 @@
+"""
+Lead generation scraper: website lookup, concurrent crawling, relevance scoring and ranking.
+Run `python -m leadgen --help` for the commands.
+"""
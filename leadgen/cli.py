@@ -0,0 +1,142 @@
+"""
+Single entry point: python -m leadgen <command> [options]
+
+Each command's module is imported only when that command runs, so `train` and `score-one`
+never import Selenium, and only commands that score text unpickle the model.
+"""
+import argparse
+import importlib
+import sys
+
+COMMANDS = {
+    'prep': 'leadgen.prep',
+    'train': 'leadgen.training',
+    'rank': 'leadgen.pipeline',
+    'coordinate': 'leadgen.work_queue',
+    'worker': 'leadgen.work_queue',
+    'rescore': 'leadgen.rescore',
+    'score-one': 'leadgen.score_one',
+    'export-model': 'leadgen.compact_model',
+}
+
+
+def add_stage_options(p):
+    # Options of the lookup stages, shared by `rank` and `worker`
+    p.add_argument('--browsers', type=int, default=3, help="parallel headless browsers for search lookups")
+    p.add_argument('--lookup-store', default='lookup_store.sqlite',
+                   help="websites and revenues found by earlier runs, reused until they expire")
+    p.add_argument('--cache', default='page_cache.sqlite', help="on-disk cache of fetched pages, shared with `prep`")
+    p.add_argument('--resolvers', default=None,
+                   help="comma-separated website resolvers; cheap ones run first, browsers only for what they miss "
+                        "(domain-guess, html-search, selenium; default: all three)")
+    p.add_argument('--min-score', type=float, default=0.1,
+                   help="skip the revenue lookup for companies that cannot reach this final score (0 = never skip)")
+    p.add_argument('--checks', default=None,
+                   help="comma-separated cheap checks run before browser lookups, in cost order "
+                        "(relevance, acquisition, ca_hq; default: relevance,acquisition)")
+    p.add_argument('--near-dup', type=float, default=0,
+                   help="reuse the relevance score of an already-scored text at least this similar, e.g. 0.95 "
+                        "(MinHash estimate of shingle overlap; 0 = score every text). A signature costs about "
+                        "as much as scoring with the current model, so this pays off for lists dominated by "
+                        "template and franchise sites, or with a costlier model")
+    p.add_argument('--metrics', default='pipeline_metrics.jsonl',
+                   help="JSON-lines file of per-stage timings and outcomes, appended to (empty to disable)")
+    p.add_argument('--profile', default=None, metavar='STAGE_OR_COMPANY',
+                   help="profile every event of one stage (e.g. fetch, parse, score, revenue, resolve.selenium) "
+                        "or everything done for one company")
+    p.add_argument('--profiler', choices=['cprofile', 'pyinstrument'], default='cprofile')
+    p.add_argument('--profile-dir', default='profiles')
+
+
+def add_queue_options(p):
+    p.add_argument('--queue', default='work_queue.sqlite', help="SQLite task queue shared by coordinator and workers")
+    p.add_argument('--lease', type=float, default=300,
+                   help="seconds a task stays leased without a heartbeat before another worker may take it")
+    p.add_argument('--max-attempts', type=int, default=3)
+    p.add_argument('--poll', type=float, default=5, help="seconds between checks of the queue while waiting")
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog='leadgen', description="Lead generation scraper and relevance ranking")
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    p = sub.add_parser('prep', help="scrape new or changed labeled companies into the training set")
+    p.add_argument('--labels', default='data/labeled_companies.csv')
+    p.add_argument('--store', default='training_set.parquet',
+                   help="training set with texts, failure reasons and scrape times; updated in place")
+    p.add_argument('--output', default='labeled_companies_with_text.csv', help="CSV copy of the rows with text")
+    p.add_argument('--retries', type=int, default=2, help="extra attempts for sites that raised an error")
+    p.add_argument('--retry-failed', action='store_true', help="also re-scrape companies whose earlier scrape failed")
+    p.add_argument('--concurrency', type=int, default=32, help="sites crawled at once")
+    p.add_argument('--cache', default='page_cache.sqlite', help="on-disk cache of fetched pages, shared with `rank`")
+
+    p = sub.add_parser('train', help="train the relevance model")
+    p.add_argument('--data', default=None,
+                   help="training set: the `prep` store (default training_set.parquet) or a CSV with "
+                        "scraped_text and label_relevance (default labeled_companies_with_text.csv if there is no store)")
+    p.add_argument('--search', choices=['grid', 'halving', 'none'], default='grid',
+                   help="hyperparameter search over the values below ('none' trains the defaults)")
+    p.add_argument('--max-features', default='500,1000,2000', help="TF-IDF vocabulary sizes to try ('none' = all)")
+    p.add_argument('--C', default='0.3,1,3', help="logistic regression regularization strengths to try")
+    p.add_argument('--jobs', type=int, default=-1, help="parallel worker processes (-1 = all cores)")
+    p.add_argument('--cache-dir', default='.train_cache', help="on-disk cache of fitted TF-IDF steps")
+    p.add_argument('--near-dup', type=float, default=0.9,
+                   help="drop training rows at least this similar to an earlier row with the same label (0 = keep all)")
+    p.add_argument('--report', default='training_report.json')
+
+    p = sub.add_parser('rank', help="rank new companies by relevance and revenue")
+    p.add_argument('--resume', action='store_true',
+                   help="skip every stage already recorded in the journal instead of starting over")
+    p.add_argument('--journal', default='pipeline_journal.sqlite')
+    p.add_argument('--input', default='new_companies.csv')
+    p.add_argument('--output', default='ranked_companies.csv', help="a .csv or .parquet file")
+    p.add_argument('--chunk-size', type=int, default=500,
+                   help="companies read, processed and written per batch (memory stays flat)")
+    add_stage_options(p)
+
+    p = sub.add_parser('coordinate', help="shard the input into tasks for `worker` processes and rank their results")
+    p.add_argument('--input', default='new_companies.csv')
+    p.add_argument('--output', default='ranked_companies.csv', help="a .csv or .parquet file")
+    p.add_argument('--task-size', type=int, default=50, help="companies per task")
+    p.add_argument('--wait', action='store_true', help="wait for the workers to finish, then write the ranking")
+    p.add_argument('--reset', action='store_true', help="discard the existing queue and its results")
+    add_queue_options(p)
+
+    p = sub.add_parser('worker', help="lease tasks from the queue and run every stage for them")
+    p.add_argument('--worker-id', default=None, help="default: <hostname>-<pid>")
+    p.add_argument('--journal', default=None, help="default: worker_journal_<worker id>.sqlite")
+    p.add_argument('--max-tasks', type=int, default=None, help="stop after this many tasks")
+    add_stage_options(p)
+    add_queue_options(p)
+
+    p = sub.add_parser('rescore', help="re-score stored texts with the current model and re-rank (no crawling)")
+    p.add_argument('--journal', default='pipeline_journal.sqlite')
+    p.add_argument('--output', default='ranked_companies.csv', help="a .csv or .parquet file")
+    p.add_argument('--tfidf-cache', default='tfidf_cache',
+                   help="directory of cached TF-IDF rows, reused while the vectorizer is unchanged")
+    p.add_argument('--force', action='store_true', help="re-score every stored text, not just stale ones")
+
+    p = sub.add_parser('export-model', help="export the pickled model as a compact mmap artifact and verify it")
+    p.add_argument('--model', default='relevance_model.pkl')
+    p.add_argument('--vectorizer', default='vectorizer.pkl')
+    p.add_argument('--output', default='relevance_model', help="artifact directory")
+    p.add_argument('--texts', default='labeled_companies_with_text.csv',
+                   help="CSV with a scraped_text column to check against predict_proba (empty to skip)")
+    p.add_argument('--tolerance', type=float, default=1e-9)
+
+    p = sub.add_parser('score-one', help="scrape and score one company website")
+    p.add_argument('--company', required=True)
+    p.add_argument('--url', required=True)
+    p.add_argument('--revenue', action='store_true', help="also look up ZoomInfo revenue (starts a browser)")
+
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    module = importlib.import_module(COMMANDS[args.command])
+    return module.main(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
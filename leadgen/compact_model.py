@@ -0,0 +1,155 @@
+"""
+Compact inference artifact for the relevance model, and `export-model` to build and verify it.
+
+The artifact is a directory of memory-mappable arrays:
+    vocab.npy   sorted vocabulary (fixed-width unicode), looked up with np.searchsorted
+    idf.npy     IDF weights, aligned with vocab
+    coef.npy    logistic regression coefficients, aligned with vocab
+    meta.json   intercept, tokenizer settings and the version of the pickles it was exported from
+Loading it costs a few small mmaps and no scikit-learn import, and every worker process that
+maps the same files shares their pages.
+"""
+import json
+import os
+import re
+import shutil
+
+import numpy as np
+
+from .models import COMPACT_PATH, load_model, load_vectorizer, model_version
+
+# TfidfVectorizer settings the NumPy scorer reproduces; anything else is refused at export
+SUPPORTED = {
+    'analyzer': 'word', 'binary': False, 'ngram_range': (1, 1), 'norm': 'l2', 'preprocessor': None,
+    'strip_accents': None, 'sublinear_tf': False, 'tokenizer': None, 'use_idf': True,
+}
+
+
+def _idf(vectorizer):
+    try:
+        return vectorizer.idf_
+    except AttributeError:
+        # Pickled by an older scikit-learn, which kept the IDF as a sparse diagonal matrix
+        return np.ravel(vectorizer._tfidf._idf_diag.sum(axis=0))
+
+
+def export_compact(vectorizer, model, path=COMPACT_PATH, source_version=None):
+    """
+    Write the artifact for a fitted TfidfVectorizer + binary LogisticRegression.
+    """
+    params = vectorizer.get_params()
+    unsupported = {k: params[k] for k, v in SUPPORTED.items() if params[k] != v}
+    if unsupported:
+        raise ValueError(f"Vectorizer settings not supported by the compact scorer: {unsupported}")
+    if len(model.classes_) != 2:
+        raise ValueError("The compact scorer only supports binary classifiers")
+
+    # Stop words never make it into vocabulary_ and only unigrams are used, so they need no export
+    terms = sorted(vectorizer.vocabulary_)
+    order = np.array([vectorizer.vocabulary_[t] for t in terms])
+    os.makedirs(path, exist_ok=True)
+    np.save(os.path.join(path, 'vocab.npy'), np.array(terms))
+    np.save(os.path.join(path, 'idf.npy'), _idf(vectorizer)[order].astype(np.float64))
+    np.save(os.path.join(path, 'coef.npy'), model.coef_[0][order].astype(np.float64))
+    # meta.json last: an artifact without it is incomplete and is not loaded
+    with open(os.path.join(path, 'meta.json'), 'w') as f:
+        json.dump({
+            'intercept': float(model.intercept_[0]),
+            'token_pattern': params['token_pattern'],
+            'lowercase': params['lowercase'],
+            'source_version': source_version,
+        }, f, indent=2)
+
+
+class CompactModel:
+    """
+    Pure-NumPy equivalent of vectorizer.transform + model.predict_proba(X)[:, 1].
+    """
+
+    def __init__(self, path=COMPACT_PATH):
+        with open(os.path.join(path, 'meta.json')) as f:
+            self.meta = json.load(f)
+        self.vocab = np.load(os.path.join(path, 'vocab.npy'), mmap_mode='r')
+        self.idf = np.load(os.path.join(path, 'idf.npy'), mmap_mode='r')
+        self.coef = np.load(os.path.join(path, 'coef.npy'), mmap_mode='r')
+        self.intercept = self.meta['intercept']
+        self.lowercase = self.meta['lowercase']
+        self._token_re = re.compile(self.meta['token_pattern'])
+
+    @property
+    def source_version(self):
+        return self.meta.get('source_version')
+
+    def term_counts(self, texts):
+        """
+        (doc index, term index, count) arrays for every vocabulary term in every text.
+        """
+        tokens, lengths = [], []
+        for text in texts:
+            found = self._token_re.findall(text.lower() if self.lowercase else text)
+            tokens.extend(found)
+            lengths.append(len(found))
+        if not tokens:
+            empty = np.zeros(0, dtype=np.int64)
+            return empty, empty, empty
+
+        doc = np.repeat(np.arange(len(texts)), lengths)
+        # One char wider than the longest term: longer tokens get cut but can still never match
+        tokens = np.array(tokens, dtype=f'U{self.vocab.dtype.itemsize // 4 + 1}')
+        pos = np.searchsorted(self.vocab, tokens)
+        known = self.vocab[np.minimum(pos, len(self.vocab) - 1)] == tokens
+        keys = doc[known] * len(self.vocab) + pos[known]
+        keys, counts = np.unique(keys, return_counts=True)  # sorted by doc, then term (CSR order)
+        return keys // len(self.vocab), keys % len(self.vocab), counts
+
+    def score(self, texts):
+        """
+        Probability of the positive class for each (already preprocessed) text.
+        """
+        n = len(texts)
+        doc, term, counts = self.term_counts(texts)
+        weights = counts * self.idf[term]
+        norms = np.sqrt(np.bincount(doc, weights=weights * weights, minlength=n))
+        norms[norms == 0] = 1  # empty rows stay all-zero, as in sklearn's normalize
+        weights = weights / norms[doc]
+        decision = np.bincount(doc, weights=weights * self.coef[term], minlength=n) + self.intercept
+        return 1 / (1 + np.exp(-decision))
+
+
+def verify(compact, vectorizer, model, texts):
+    """
+    Largest absolute difference between the compact scorer and the sklearn path on texts.
+    """
+    from .text import preprocess_text
+
+    processed = [preprocess_text(t) for t in texts]
+    expected = model.predict_proba(vectorizer.transform(processed))[:, 1]
+    return float(np.max(np.abs(compact.score(processed) - expected))) if texts else 0.0
+
+
+def main(args):
+    import pandas as pd
+
+    vectorizer, model = load_vectorizer(args.vectorizer), load_model(args.model)
+    # Export next to the artifact and swap it in only once it is verified, so load_scorer never
+    # picks up an artifact that failed the check
+    output = args.output.rstrip('/')
+    tmp_path = output + '.tmp'
+    shutil.rmtree(tmp_path, ignore_errors=True)
+    export_compact(vectorizer, model, tmp_path, model_version(args.model, args.vectorizer))
+
+    if args.texts:
+        texts = pd.read_csv(args.texts, usecols=['scraped_text'])['scraped_text'].dropna().astype(str).tolist()
+        diff = verify(CompactModel(tmp_path), vectorizer, model, texts)
+        print(f"Checked {len(texts)} texts against predict_proba: max abs difference {diff:.2e}")
+        if diff > args.tolerance:
+            shutil.rmtree(tmp_path)
+            print(f"Compact scorer does not match the sklearn model; '{output}/' was not written")
+            if not hasattr(vectorizer, 'idf_'):
+                print("The vectorizer was pickled by an older scikit-learn, whose IDF weights this version's "
+                      "transform no longer applies; re-run `train` to pickle it again")
+            return 1
+
+    shutil.rmtree(output, ignore_errors=True)
+    os.replace(tmp_path, output)
+    print(f"Exported {len(vectorizer.vocabulary_)} terms to '{output}/'")
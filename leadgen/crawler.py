@@ -0,0 +1,228 @@
+import asyncio
+
+import aiohttp
+
+from .extraction import ExtractionPool, decode_html
+from .frontier import Frontier, RobotsCache
+from .metrics import metrics
+from .near_dup import strip_seen_blocks
+from .rate_limit import DomainRateLimiter
+
+HEADERS = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'}
+HTML_TYPES = ('text/html', 'application/xhtml+xml')
+MAX_PAGE_BYTES = 1024 * 1024  # more than enough for MAX_TEXT characters of visible text
+CHUNK_BYTES = 64 * 1024
+
+# Failure reasons of sites that answered but gave no text; retrying them will not help
+NO_TEXT = 'no page with enough text'
+ROBOTS_DISALLOWED = 'robots.txt disallows every page'
+PERMANENT_FAILURES = (NO_TEXT, ROBOTS_DISALLOWED)  # any other reason is an error worth retrying
+
+
+def is_html(content_type):
+    """
+    True for HTML content types, and when the server sent none (the parser copes with whatever it is).
+    """
+    if not content_type:
+        return True
+    return content_type.split(';')[0].strip().lower() in HTML_TYPES
+
+
+class Crawler:
+    """
+    Concurrent version of scrape_website_with_links.
+    concurrency caps how many sites are crawled at once, per_host caps open
+    connections to any single host so small company sites are not hammered.
+    All requests share one pooled aiohttp session.
+    Pass a PageCache to serve repeat pages from disk and revalidate stale ones.
+    Requests are paced per domain by a DomainRateLimiter, which backs off on 429/503.
+    HTML parsing runs in an ExtractionPool of worker processes (workers=0 parses inline);
+    pass extractor to share a pool that was started earlier.
+    Each site is crawled from a Frontier (best links first, every page once) and, with
+    respect_robots, only pages its robots.txt allows are fetched.
+    Blocks of text a site repeats on every page are kept only from the first page they appear on.
+    Why a site gave no text is kept in failures (url -> reason) until the caller pops it.
+    Bodies are streamed and cut off at max_bytes (None = no limit); responses whose Content-Type is not HTML
+    (PDFs, images, downloads behind a /products link) are dropped before their body is read.
+    """
+
+    def __init__(self, concurrency=32, per_host=2, max_pages=3, timeout=10, cache=None, limiter=None, retries=2,
+                 workers=None, extractor=None, respect_robots=True, max_bytes=MAX_PAGE_BYTES):
+        self.concurrency = concurrency
+        self.per_host = per_host
+        self.max_pages = max_pages
+        self.timeout = timeout
+        self.cache = cache
+        self.limiter = limiter or DomainRateLimiter()
+        self.retries = retries
+        self.workers = workers
+        self.extractor = extractor
+        self._own_extractor = extractor is None
+        self.robots = RobotsCache(self.fetch_text) if respect_robots else None
+        self.max_bytes = max_bytes
+        self.failures = {}
+        self.session = None
+        self._sites = None
+
+    async def __aenter__(self):
+        connector = aiohttp.TCPConnector(limit=self.concurrency, limit_per_host=self.per_host, ttl_dns_cache=300)
+        self.session = aiohttp.ClientSession(
+            connector=connector,
+            headers=HEADERS,
+            timeout=aiohttp.ClientTimeout(total=self.timeout),
+        )
+        self._sites = asyncio.Semaphore(self.concurrency)
+        if self._own_extractor:
+            self.extractor = ExtractionPool(self.workers)
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.session.close()
+        self.session = None
+        if self._own_extractor:
+            self.extractor.close()
+            self.extractor = None
+
+    async def _read(self, response):
+        # Stream the body, stopping at the byte budget; returns (body, truncated)
+        body = bytearray()
+        async for chunk in response.content.iter_chunked(CHUNK_BYTES):
+            body += chunk
+            if self.max_bytes and len(body) >= self.max_bytes:
+                return bytes(body[:self.max_bytes]), True
+        return bytes(body), False
+
+    async def fetch(self, url, html_only=True):
+        """
+        Returns (body bytes, charset or None), from the cache when possible.
+        With html_only, a response that is not HTML returns (None, None) without reading its body.
+        """
+        cached = self.cache.get(url) if self.cache else None
+        if cached and self.cache.is_fresh(cached):
+            self.cache.stats['hits'] += 1
+            metrics.observe('fetch', 0.0, 'cache_hit', url)
+            return cached.body, cached.encoding
+
+        headers = self.cache.conditional_headers(cached) if cached else None
+        for attempt in range(self.retries + 1):
+            delay = await self.limiter.wait_async(url)
+            if delay:
+                metrics.observe('wait.site_limiter', delay, key=url)
+            # Each attempt is one fetch event; the time spent waiting for the limiter is not part of it
+            with metrics.timer('fetch', url) as event:
+                async with self.session.get(url, headers=headers) as response:
+                    event['status'] = response.status
+                    throttled = self.limiter.feedback(url, response.status, response.headers.get('Retry-After'))
+                    if throttled and attempt < self.retries:
+                        event['outcome'] = 'throttled'
+                        continue  # the limiter has slowed this host down; try again once it allows
+                    if cached and response.status == 304:
+                        self.cache.stats['revalidations'] += 1
+                        self.cache.refresh(url)
+                        event['outcome'] = 'not_modified'
+                        return cached.body, cached.encoding
+                    response.raise_for_status()
+                    content_type = response.headers.get('Content-Type')
+                    if html_only and not is_html(content_type):
+                        event.update(outcome='not_html', content_type=content_type)
+                        return None, None
+                    body, truncated = await self._read(response)
+                    encoding = response.charset
+                    event['bytes'] = len(body)
+                    if truncated:
+                        event['truncated'] = True
+                        metrics.count('pages_truncated')
+                    metrics.count('bytes_downloaded', len(body))
+                    break
+
+        if self.cache:
+            self.cache.stats['misses'] += 1
+            self.cache.put(url, body, response.headers.get('ETag'), response.headers.get('Last-Modified'), encoding)
+        return body, encoding
+
+    async def fetch_text(self, url):
+        body, encoding = await self.fetch(url, html_only=False)
+        return decode_html(body, encoding)
+
+    async def scrape(self, url):
+        """
+        Scrape main page + a few internal links (services/products/etc.)
+        Same result as scrape_website_with_links: joined page text, or None.
+        """
+        if not url or not isinstance(url, str):
+            return None
+
+        async with self._sites:
+            scraped_texts = []
+            seen_blocks = set()
+            fetched = 0
+            with metrics.timer('scrape', url) as event:
+                try:
+                    frontier = Frontier(url)
+
+                    while frontier and fetched < self.max_pages:
+                        current_url = frontier.pop()
+                        if self.robots and not await self.robots.allowed(current_url):
+                            continue
+                        fetched += 1
+
+                        body, encoding = await self.fetch(current_url)
+                        if body is None:
+                            continue
+                        with metrics.timer('parse', current_url):
+                            text, links = await self.extractor.extract(body, current_url, encoding)
+                        text = strip_seen_blocks(text, seen_blocks)
+                        if len(text) > 100:
+                            scraped_texts.append(text)
+                        for link, score in links:
+                            frontier.push(link, score)
+
+                    event['pages'] = fetched
+                    if not scraped_texts:
+                        event['outcome'] = 'no_text'
+                        self.failures[url] = NO_TEXT if fetched else ROBOTS_DISALLOWED
+                    return ' '.join(scraped_texts) if scraped_texts else None
+                except Exception as e:
+                    print(f"Error scraping {url}: {e}")
+                    event.update(outcome='error', error=type(e).__name__, pages=fetched)
+                    self.failures[url] = f"{type(e).__name__}: {e}" if str(e) else type(e).__name__
+                    return None
+
+    async def scrape_many(self, urls, on_result=None):
+        """
+        Scrape every url; on_result(index, text) is called as each site finishes.
+        """
+        async def one(i, url):
+            text = await self.scrape(url)
+            if on_result:
+                on_result(i, text)
+            return text
+
+        return await asyncio.gather(*(one(i, url) for i, url in enumerate(urls)))
+
+
+async def scrape_many_async(urls, concurrency=32, per_host=2, max_pages=3, cache=None, limiter=None, on_result=None,
+                            workers=None, extractor=None, respect_robots=True, max_bytes=MAX_PAGE_BYTES, failures=None):
+    async with Crawler(concurrency=concurrency, per_host=per_host, max_pages=max_pages, cache=cache, limiter=limiter,
+                       workers=workers, extractor=extractor, respect_robots=respect_robots,
+                       max_bytes=max_bytes) as crawler:
+        if failures is not None:
+            crawler.failures = failures
+        return await crawler.scrape_many(urls, on_result)
+
+
+def scrape_many(urls, concurrency=32, per_host=2, max_pages=3, cache=None, limiter=None, on_result=None,
+                workers=None, extractor=None, respect_robots=True, max_bytes=MAX_PAGE_BYTES, failures=None):
+    """
+    Scrape a list of websites concurrently. Returns the texts in the same order as urls.
+    Pass a dict as failures to get the reason (url -> reason) for each site without text.
+    """
+    return asyncio.run(scrape_many_async(list(urls), concurrency, per_host, max_pages, cache, limiter, on_result,
+                                         workers, extractor, respect_robots, max_bytes, failures))
+
+
+def scrape_website_with_links(url, max_pages=3, cache=None):
+    """
+    Single-site convenience wrapper, kept so old call sites still work.
+    """
+    return scrape_many([url], concurrency=1, max_pages=max_pages, cache=cache, workers=0)[0]
@@ -0,0 +1,213 @@
+import queue
+import threading
+import time
+from contextlib import contextmanager
+
+
+def make_headless_driver():
+    """
+    Default factory: one headless Chrome. Selenium is only imported when a browser is actually started.
+    """
+    from selenium import webdriver
+    from selenium.webdriver.chrome.options import Options
+
+    options = Options()
+    options.add_argument("--headless=new")
+    options.add_argument("--disable-blink-features=AutomationControlled")
+    options.add_argument("--no-sandbox")
+    options.add_argument("--disable-dev-shm-usage")
+    options.add_argument("--window-size=1920,1080")
+    return webdriver.Chrome(options=options)
+
+
+class DriverPool:
+    """
+    Fixed-size pool of long-lived browsers.
+    Drivers are created on first lease (at most `size` of them) and handed back with release().
+    A driver is quit and replaced when it is released as broken, fails a health check,
+    has served max_uses lookups or is older than max_age seconds.
+    factory is any zero-argument callable returning a WebDriver-like object, so a stub can be used in tests.
+    """
+
+    def __init__(self, size=2, factory=make_headless_driver, max_uses=200, max_age=30 * 60):
+        self.size = size
+        self.factory = factory
+        self.max_uses = max_uses
+        self.max_age = max_age
+        self.stats = {'started': 0, 'recycled': 0, 'leases': 0}
+        self._idle = queue.LifoQueue()
+        self._meta = {}  # id(driver) -> [created_at, uses]
+        self._created = 0
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def _start(self):
+        driver = self.factory()
+        self._meta[id(driver)] = [time.monotonic(), 0]
+        self.stats['started'] += 1
+        return driver
+
+    def _quit(self, driver):
+        self._meta.pop(id(driver), None)
+        try:
+            driver.quit()
+        except Exception:
+            pass
+
+    def _stale(self, driver):
+        created_at, uses = self._meta.get(id(driver), (0, self.max_uses))
+        return uses >= self.max_uses or time.monotonic() - created_at > self.max_age
+
+    def _alive(self, driver):
+        try:
+            driver.current_url  # raises once the browser or session has died
+            return True
+        except Exception:
+            return False
+
+    def lease(self, timeout=None):
+        """
+        Take a driver from the pool, starting one if the pool is not full yet.
+        Blocks until a driver is free.
+        """
+        if self._closed:
+            raise RuntimeError("DriverPool is closed")
+        with self._lock:
+            start_new = self._idle.empty() and self._created < self.size
+            if start_new:
+                self._created += 1
+        driver = None if start_new else self._idle.get(timeout=timeout)
+        if driver is not None and (self._stale(driver) or not self._alive(driver)):
+            self.stats['recycled'] += 1
+            self._quit(driver)
+            driver = None
+        if driver is None:
+            # Empty slot: either never filled or freed by a broken driver
+            try:
+                driver = self._start()
+            except Exception:
+                self._idle.put(None)
+                raise
+        self.stats['leases'] += 1
+        return driver
+
+    def release(self, driver, broken=False):
+        """
+        Give a driver back. Broken drivers are quit and their slot is refilled on the next lease.
+        """
+        if broken:
+            self.stats['recycled'] += 1
+            self._quit(driver)
+            driver = None
+        elif self._closed:
+            self._quit(driver)
+            return
+        self._idle.put(driver)
+
+    @contextmanager
+    def leased(self, timeout=None):
+        driver = self.lease(timeout)
+        self._meta[id(driver)][1] += 1
+        try:
+            yield driver
+        except Exception:
+            self.release(driver, broken=not self._alive(driver))
+            raise
+        else:
+            self.release(driver)
+
+    def map(self, fn, items, retries=1):
+        """
+        Run fn(item, driver) for every item on `size` worker threads, each holding one driver
+        for its whole lifetime. Returns results in the same order as items (None on failure).
+        An item whose driver died is retried on a fresh driver. If no driver can be started for an
+        item within its retries, that worker stops and the factory's error is raised once all
+        workers are done.
+        """
+        items = list(items)
+        results = [None] * len(items)
+        errors = []
+        work = queue.Queue()
+        for i, item in enumerate(items):
+            work.put((i, item, 0))
+
+        def worker():
+            driver = None
+            try:
+                while True:
+                    try:
+                        i, item, attempt = work.get_nowait()
+                    except queue.Empty:
+                        return
+                    if driver is not None and self._stale(driver):
+                        self.release(driver)
+                        driver = None
+                    if driver is None:
+                        try:
+                            driver = self.lease()
+                        except Exception as e:
+                            if attempt < retries:
+                                work.put((i, item, attempt + 1))
+                                continue
+                            print(f"Could not start a browser for {item}: {e}")
+                            errors.append(e)
+                            return
+                    self._meta[id(driver)][1] += 1
+                    try:
+                        results[i] = fn(item, driver)
+                    except Exception as e:
+                        if self._alive(driver):
+                            print(f"Lookup failed for {item}: {e}")
+                            continue
+                        # Browser crashed: swap it out and retry the item
+                        self.release(driver, broken=True)
+                        driver = None
+                        if attempt < retries:
+                            work.put((i, item, attempt + 1))
+                        else:
+                            print(f"Lookup failed for {item}: {e}")
+            finally:
+                if driver is not None:
+                    self.release(driver)
+
+        threads = [threading.Thread(target=worker, daemon=True) for _ in range(min(self.size, len(items)))]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        if errors:
+            raise errors[0]
+        return results
+
+    def close(self):
+        self._closed = True
+        while True:
+            try:
+                driver = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            if driver is not None:
+                self._quit(driver)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def wait_for(driver, css_selector, timeout=5):
+    """
+    Block until css_selector is on the page (or timeout). Returns False if it never showed up.
+    Replaces fixed "let it render" sleeps: we only wait as long as the page actually needs.
+    """
+    from selenium.common.exceptions import TimeoutException
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support import expected_conditions as EC
+    from selenium.webdriver.support.ui import WebDriverWait
+
+    try:
+        WebDriverWait(driver, timeout).until(EC.presence_of_element_located((By.CSS_SELECTOR, css_selector)))
+        return True
+    except TimeoutException:
+        return False
@@ -0,0 +1,229 @@
+import asyncio
+import multiprocessing
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from urllib.parse import urljoin
+
+# Keyword weights for ranking internal links; links that match none are not followed
+LINK_KEYWORDS = {'service': 3, 'product': 3, 'solution': 3, 'about': 1}
+DROP_TAGS = ["script", "style", "nav", "header", "footer"]
+MAX_TEXT = 3000
+
+_META_CHARSET = re.compile(rb'<meta[^>]+charset=["\']?([\w-]+)', re.IGNORECASE)
+
+
+def decode_html(html, encoding=None):
+    """
+    Bytes -> str using the HTTP charset if known, else the page's <meta charset>, else utf-8.
+    """
+    if isinstance(html, str):
+        return html
+    if not encoding:
+        m = _META_CHARSET.search(html[:4096])
+        encoding = m.group(1).decode('ascii') if m else 'utf-8'
+    try:
+        return html.decode(encoding, errors='replace')
+    except LookupError:
+        return html.decode('utf-8', errors='replace')
+
+
+def link_score(href, anchor_text=''):
+    target = f"{href} {anchor_text}".lower()
+    return sum(weight for keyword, weight in LINK_KEYWORDS.items() if keyword in target)
+
+
+def _keep_link(url, href, anchor_text=''):
+    # Links that look like service/product/about pages, as (absolute url, score);
+    # the crawl frontier decides which of them are on the same site
+    score = link_score(href, anchor_text)
+    if score:
+        return urljoin(url, href.strip()), score
+    return None
+
+
+def _extract_lxml(html, url):
+    import lxml.html
+    from lxml import etree
+
+    try:
+        root = lxml.html.fromstring(html)
+    except ValueError:
+        # str input with an <?xml encoding=...?> declaration; let lxml decode the bytes itself
+        root = lxml.html.fromstring(html.encode('utf-8'))
+    except etree.ParserError:
+        return '', []
+
+    # Remove comments, scripts, styles, nav, header, footer (keeping the text that follows them)
+    etree.strip_elements(root, etree.Comment, *DROP_TAGS, with_tail=False)
+
+    text = ' '.join(' '.join(root.itertext()).split())[:MAX_TEXT]
+    links = []
+    for a in root.iter('a'):
+        href = a.get('href')
+        if href is not None:
+            link = _keep_link(url, href, a.text_content())
+            if link:
+                links.append(link)
+    return text, links
+
+
+class _PageTarget:
+    """
+    lxml parser target that collects the same text and links as _extract_lxml, from parse events.
+    A space goes in at every tag boundary, like joining itertext(); DROP_TAGS and comments are
+    skipped without one, as strip_elements merges the text around them.
+    """
+
+    def __init__(self, url):
+        self.url = url
+        self.parts = []
+        self.size = 0
+        self.links = []
+        self._dropped = 0  # depth inside a dropped element
+        self._anchor = None  # (href, anchor text parts) while inside <a href>
+
+    def start(self, tag, attrib):
+        if self._dropped or tag in DROP_TAGS:
+            self._dropped += 1
+            return
+        self.parts.append(' ')
+        if tag == 'a' and attrib.get('href') is not None:
+            self._anchor = (attrib['href'], [])
+
+    def end(self, tag):
+        if self._dropped:
+            self._dropped -= 1
+            return
+        self.parts.append(' ')
+        if tag == 'a' and self._anchor:
+            link = _keep_link(self.url, self._anchor[0], ''.join(self._anchor[1]))
+            if link:
+                self.links.append(link)
+            self._anchor = None
+
+    def data(self, data):
+        if not self._dropped:
+            self.parts.append(data)
+            self.size += len(data)
+            if self._anchor:
+                self._anchor[1].append(data)
+
+    def text(self):
+        return ' '.join(''.join(self.parts).split())
+
+    def close(self):
+        return self
+
+
+def _extract_lxml_stream(html, url, chunk=16384):
+    # Feeds the page to the parser in chunks and stops once MAX_TEXT characters of visible text are
+    # in, so the rest of a long page is never parsed (links further down are not collected either)
+    from lxml import etree
+
+    target = _PageTarget(url)
+    parser = etree.HTMLParser(target=target)
+    try:
+        for start in range(0, len(html), chunk):
+            parser.feed(html[start:start + chunk])
+            if target.size > MAX_TEXT and len(target.text()) > MAX_TEXT:
+                break
+        parser.close()
+    except etree.LxmlError:
+        if not target.parts:
+            return '', []
+    return target.text()[:MAX_TEXT], target.links
+
+
+def _extract_bs4(html, url, features):
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(html, features)
+
+    # Remove scripts, styles, nav, header, footer
+    for tag in soup(DROP_TAGS):
+        tag.decompose()
+
+    text = soup.get_text(separator=' ', strip=True)
+    text = ' '.join(text.split())[:MAX_TEXT]
+
+    links = []
+    for a in soup.find_all('a', href=True):
+        link = _keep_link(url, a['href'], a.get_text())
+        if link:
+            links.append(link)
+    return text, links
+
+
+BACKENDS = {
+    'lxml': _extract_lxml_stream,
+    'lxml-tree': _extract_lxml,
+    'bs4-lxml': lambda html, url: _extract_bs4(html, url, 'lxml'),
+    'html.parser': lambda html, url: _extract_bs4(html, url, 'html.parser'),
+}
+
+
+def extract_page(html, url, encoding=None, backend='lxml'):
+    """
+    Pull the visible text and the candidate internal links out of one page.
+    html may be raw bytes (decoded with `encoding` or the page's meta charset) or str.
+    Returns (text, links) where text is already whitespace-collapsed and cut to 3000 chars
+    and links are (absolute url, keyword score) pairs resolved against `url`.
+    'lxml' parses with lxml incrementally and stops once the text is complete; 'lxml-tree' builds
+    the whole tree first; 'bs4-lxml' and 'html.parser' go through BeautifulSoup like the original
+    scrape_website_with_links did.
+    """
+    return BACKENDS[backend](decode_html(html, encoding), url)
+
+
+def default_workers():
+    # Worker processes are forked so scripts without a __main__ guard are not re-run in each worker
+    if 'fork' not in multiprocessing.get_all_start_methods():
+        return 0
+    return os.cpu_count() or 1
+
+
+class ExtractionPool:
+    """
+    Runs extract_page in a pool of worker processes so parsing does not serialize behind the GIL
+    once fetching is concurrent. workers=0 parses inline (handy for one-off scrapes).
+    """
+
+    def __init__(self, workers=None, backend='lxml'):
+        self.workers = default_workers() if workers is None else workers
+        self.backend = backend
+        self._executor = None
+        if self.workers > 0:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers, mp_context=multiprocessing.get_context('fork')
+            )
+            # Fork the workers now, before the caller starts any threads of its own
+            self._executor.submit(int).result()
+
+    async def extract(self, html, url, encoding=None):
+        if self._executor is None:
+            return extract_page(html, url, encoding, self.backend)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, extract_page, html, url, encoding, self.backend)
+
+    def map(self, pages, chunksize=16):
+        """
+        Synchronous bulk extraction of (html, url) pairs.
+        """
+        if self._executor is None:
+            return [extract_page(html, url, None, self.backend) for html, url in pages]
+        htmls, urls = zip(*pages) if pages else ((), ())
+        n = len(htmls)
+        return list(self._executor.map(extract_page, htmls, urls, [None] * n, [self.backend] * n,
+                                       chunksize=chunksize))
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
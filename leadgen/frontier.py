@@ -0,0 +1,91 @@
+import asyncio
+import heapq
+import itertools
+from urllib.parse import urlsplit
+from urllib.robotparser import RobotFileParser
+
+from .page_cache import normalize_url
+from .rate_limit import domain_of
+
+
+def seen_key(url):
+    """
+    Identity of a page for de-duplication: the cache's normalized URL without the scheme
+    or a leading www., so http/https, fragment and trailing-slash variants are one page.
+    """
+    normalized = normalize_url(url)
+    rest = normalized.split('://', 1)[-1]
+    return rest[4:] if rest.startswith('www.') else rest
+
+
+def same_site(url, root_host):
+    """
+    True if url is on root_host (as returned by domain_of) or one of its subdomains.
+    """
+    if urlsplit(url).scheme not in ('http', 'https'):
+        return False
+    host = domain_of(url)
+    return host == root_host or host.endswith('.' + root_host)
+
+
+class Frontier:
+    """
+    Crawl frontier for one site. Pages come out best keyword score first (ties in discovery order),
+    and a URL is only ever queued once: the seen-set is checked when a link is pushed,
+    so duplicate links never grow the queue.
+    """
+
+    def __init__(self, root_url):
+        self.root_host = domain_of(root_url)
+        self._heap = []
+        self._seen = set()
+        self._order = itertools.count()
+        self.push(root_url, float('inf'))
+
+    def push(self, url, score=0):
+        key = seen_key(url)
+        if key in self._seen or not same_site(url, self.root_host):
+            return False
+        self._seen.add(key)
+        heapq.heappush(self._heap, (-score, next(self._order), url))
+        return True
+
+    def pop(self):
+        return heapq.heappop(self._heap)[2]
+
+    def __len__(self):
+        return len(self._heap)
+
+
+class RobotsCache:
+    """
+    Parsed robots.txt per scheme + host, fetched once per crawl with fetch_text(url) -> str
+    (an async callable that raises on HTTP errors). A missing or unreadable robots.txt allows everything.
+    """
+
+    def __init__(self, fetch_text, user_agent='*'):
+        self.fetch_text = fetch_text
+        self.user_agent = user_agent
+        self._parsers = {}
+        self.stats = {'fetched': 0, 'blocked': 0}
+
+    async def _load(self, robots_url):
+        parser = RobotFileParser(robots_url)
+        try:
+            parser.parse((await self.fetch_text(robots_url)).splitlines())
+        except Exception:
+            parser.allow_all = True
+        self.stats['fetched'] += 1
+        return parser
+
+    async def allowed(self, url):
+        parts = urlsplit(url)
+        robots_url = f"{parts.scheme}://{parts.netloc}/robots.txt"
+        if robots_url not in self._parsers:
+            # Store the task, so pages of one site crawled concurrently share a single fetch
+            self._parsers[robots_url] = asyncio.ensure_future(self._load(robots_url))
+        parser = await self._parsers[robots_url]
+        if parser.can_fetch(self.user_agent, url):
+            return True
+        self.stats['blocked'] += 1
+        return False
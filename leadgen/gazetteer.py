@@ -0,0 +1,189 @@
+"""
+Offline gazetteer for HQ checks: ZIP code -> state and city -> state without any network call.
+
+ZIP3_STATE is a 1000-entry uint8 array indexed by the first three digits of a ZIP code, holding
+an index into STATES (0 = not assigned), built from the USPS prefix ranges below. Cities come from
+us_cities.csv next to this module; a city listed in more than one state needs a state to tell
+them apart. hq_state() resolves the addresses in a page text ("San Diego, CA 92101") and
+place_state() a free-form place such as a Crunchbase location.
+"""
+import os
+import re
+import threading
+
+import numpy as np
+
+STATE_NAMES = {
+    'alabama': 'AL', 'alaska': 'AK', 'arizona': 'AZ', 'arkansas': 'AR', 'california': 'CA', 'colorado': 'CO',
+    'connecticut': 'CT', 'delaware': 'DE', 'district of columbia': 'DC', 'florida': 'FL', 'georgia': 'GA',
+    'hawaii': 'HI', 'idaho': 'ID', 'illinois': 'IL', 'indiana': 'IN', 'iowa': 'IA', 'kansas': 'KS',
+    'kentucky': 'KY', 'louisiana': 'LA', 'maine': 'ME', 'maryland': 'MD', 'massachusetts': 'MA',
+    'michigan': 'MI', 'minnesota': 'MN', 'mississippi': 'MS', 'missouri': 'MO', 'montana': 'MT',
+    'nebraska': 'NE', 'nevada': 'NV', 'new hampshire': 'NH', 'new jersey': 'NJ', 'new mexico': 'NM',
+    'new york': 'NY', 'north carolina': 'NC', 'north dakota': 'ND', 'ohio': 'OH', 'oklahoma': 'OK',
+    'oregon': 'OR', 'pennsylvania': 'PA', 'rhode island': 'RI', 'south carolina': 'SC', 'south dakota': 'SD',
+    'tennessee': 'TN', 'texas': 'TX', 'utah': 'UT', 'vermont': 'VT', 'virginia': 'VA', 'washington': 'WA',
+    'west virginia': 'WV', 'wisconsin': 'WI', 'wyoming': 'WY', 'puerto rico': 'PR', 'virgin islands': 'VI',
+    'guam': 'GU',
+}
+STATES = [''] + sorted(set(STATE_NAMES.values()) | {'AA', 'AE', 'AP'})  # AA/AE/AP: military mail
+
+# First three ZIP digits per state (inclusive ranges)
+ZIP3_RANGES = {
+    'NY': [(5, 5), (100, 149)], 'PR': [(6, 7), (9, 9)], 'VI': [(8, 8)], 'MA': [(10, 27), (55, 55)],
+    'RI': [(28, 29)], 'NH': [(30, 38)], 'ME': [(39, 49)], 'VT': [(50, 54), (56, 59)], 'CT': [(60, 69)],
+    'NJ': [(70, 89)], 'AE': [(90, 98)], 'PA': [(150, 196)], 'DE': [(197, 199)], 'DC': [(200, 200), (202, 205), (569, 569)],
+    'VA': [(201, 201), (220, 246)], 'MD': [(206, 219)], 'WV': [(247, 268)], 'NC': [(270, 289)],
+    'SC': [(290, 299)], 'GA': [(300, 319), (398, 399)], 'FL': [(320, 339), (341, 349)], 'AA': [(340, 340)],
+    'AL': [(350, 369)], 'TN': [(370, 385)], 'MS': [(386, 397)], 'KY': [(400, 427)], 'OH': [(430, 459)],
+    'IN': [(460, 479)], 'MI': [(480, 499)], 'IA': [(500, 528)], 'WI': [(530, 549)], 'MN': [(550, 567)],
+    'SD': [(570, 577)], 'ND': [(580, 588)], 'MT': [(590, 599)], 'IL': [(600, 629)], 'MO': [(630, 658)],
+    'KS': [(660, 679)], 'NE': [(680, 693)], 'LA': [(700, 715)], 'AR': [(716, 729)],
+    'OK': [(730, 732), (734, 749)], 'TX': [(733, 733), (750, 799), (885, 885)], 'CO': [(800, 816)],
+    'WY': [(820, 831)], 'ID': [(832, 838)], 'UT': [(840, 847)], 'AZ': [(850, 865)], 'NM': [(870, 884)],
+    'NV': [(889, 898)], 'CA': [(900, 961)], 'AP': [(962, 966)], 'HI': [(967, 968)], 'GU': [(969, 969)],
+    'OR': [(970, 979)], 'WA': [(980, 994)], 'AK': [(995, 999)],
+}
+
+CITIES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'us_cities.csv')
+
+
+def _zip3_table():
+    table = np.zeros(1000, dtype=np.uint8)
+    for state, ranges in ZIP3_RANGES.items():
+        for lo, hi in ranges:
+            table[lo:hi + 1] = STATES.index(state)
+    return table
+
+
+ZIP3_STATE = _zip3_table()
+_CODES = set(STATES) - {''}
+
+_address = None
+
+
+def address_regex():
+    """
+    "City, ST 12345", "City, State 12345-6789", "ST 12345" or "City, ST" (the city is up to four
+    capitalized words). State names are a trie (signals.trie_regex), compiled on first use.
+    """
+    global _address
+    if _address is None:
+        from .signals import trie_regex
+
+        state = trie_regex([n.title().replace(' Of ', ' of ') for n in STATE_NAMES]) + '|[A-Z]{2}'
+        _address = re.compile(
+            r"(?:(?P<city>[A-Z][A-Za-z.'-]*(?: [A-Z][A-Za-z.'-]*){0,3}),\s*)?"
+            rf"\b(?P<state>{state})\.?,?(?:\s+(?P<zip>\d{{5}})(?:-\d{{4}})?)?\b"
+        )
+    return _address
+
+
+def state_code(name):
+    """
+    'CA', 'ca', 'California' -> 'CA'; None for anything else.
+    """
+    if not name:
+        return None
+    name = name.strip().rstrip('.')
+    if name.upper() in _CODES:
+        return name.upper()
+    return STATE_NAMES.get(name.lower())
+
+
+def zip_state(zip_code):
+    """
+    State of one ZIP code ('92101', '92101-1234' or 92101), or None if the prefix is not assigned.
+    """
+    digits = str(zip_code).strip()[:5]
+    if len(digits) < 5 or not digits.isdigit():
+        return None
+    return STATES[ZIP3_STATE[int(digits[:3])]] or None
+
+
+_cities = None
+_cities_lock = threading.Lock()
+
+
+def cities():
+    """
+    {lowercase city: set of states} from us_cities.csv, loaded once.
+    """
+    global _cities
+    with _cities_lock:
+        if _cities is None:
+            table = {}
+            with open(CITIES_PATH, encoding='utf-8') as f:
+                next(f)
+                for line in f:
+                    city, state = line.rstrip('\n').rsplit(',', 1)
+                    table.setdefault(city.lower(), set()).add(state)
+            _cities = table
+        return _cities
+
+
+def state_cities(state):
+    """
+    Lowercase names of the cities listed in `state` and in no other state.
+    """
+    return sorted(city for city, states in cities().items() if states == {state})
+
+
+def city_state(city, state=None):
+    """
+    State of a city: its only state in the table, or `state` if the city exists there. None otherwise.
+    """
+    states = cities().get(city.strip().lower()) if city else None
+    if not states:
+        return None
+    if state:
+        return state if state in states else None
+    return next(iter(states)) if len(states) == 1 else None
+
+
+def resolve_address(city, state, zip_code):
+    """
+    State of one parsed address: the ZIP decides when it is known, else the written state (checked
+    against the city table when the city is listed there), else the city alone.
+    """
+    by_zip = zip_state(zip_code) if zip_code else None
+    if by_zip:
+        return by_zip
+    code = state_code(state)
+    if code and city and cities().get(city.lower()) and not city_state(city, code):
+        return None  # e.g. "Dallas, CA": the city is known, and not in that state
+    return code or (city_state(city) if city else None)
+
+
+def place_state(place):
+    """
+    State of a free-form place ("San Diego, California, United States", "Austin, TX 78701", "Fresno"),
+    from the tables only; None if they cannot tell.
+    """
+    if not place:
+        return None
+    for m in address_regex().finditer(place):
+        state = resolve_address(*m.group('city', 'state', 'zip'))
+        if state:
+            return state
+    parts = [p.strip() for p in place.split(',') if p.strip()]
+    for part in parts:
+        state = state_code(part) if len(part) > 2 else None
+        if state:
+            return state
+    return city_state(parts[0]) if parts else None
+
+
+def hq_state(text):
+    """
+    Most-mentioned state among the addresses in one page text (first mentioned on a tie), or None.
+    """
+    votes = {}
+    for m in address_regex().finditer(text or ''):
+        city, state, zip_code = m.group('city', 'state', 'zip')
+        if not zip_code and not city:
+            continue  # a bare "CA" or "Texas" is no address
+        resolved = resolve_address(city, state, zip_code)
+        if resolved:
+            votes[resolved] = votes.get(resolved, 0) + 1
+    return max(votes, key=votes.get) if votes else None
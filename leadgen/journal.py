@@ -0,0 +1,132 @@
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+
+STAGES = ['website', 'text_hash', 'relevance', 'relevance_version', 'revenue']
+
+
+def text_hash(text):
+    return hashlib.sha1(text.encode('utf-8')).hexdigest()
+
+
+class Journal:
+    """
+    Durable record of per-company stage results for full_pipeline.py (SQLite).
+    Every result is committed as soon as it is recorded, so a crash, CAPTCHA wall or Ctrl-C
+    only loses the lookups that were in flight. Scraped texts are stored once by hash.
+    A value of None is a completed stage with no result (e.g. no website found).
+    """
+
+    def __init__(self, path='pipeline_journal.sqlite'):
+        self.path = path
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS results (
+                company TEXT NOT NULL,
+                stage TEXT NOT NULL,
+                value TEXT,
+                recorded_at REAL NOT NULL,
+                PRIMARY KEY (company, stage)
+            );
+            CREATE TABLE IF NOT EXISTS texts (
+                text_hash TEXT PRIMARY KEY,
+                text TEXT NOT NULL
+            );
+        """)
+
+    def close(self):
+        self.conn.close()
+
+    def reset(self):
+        """
+        Forget all stage results (a fresh, non-resumed run). Stored texts are kept.
+        """
+        with self._lock:
+            self.conn.execute("DELETE FROM results")
+            self.conn.commit()
+
+    def record(self, company, stage, value):
+        with self._lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO results (company, stage, value, recorded_at) VALUES (?, ?, ?, ?)",
+                (company, stage, json.dumps(value), time.time())
+            )
+            self.conn.commit()
+
+    def record_many(self, stage, items):
+        """
+        Record {company: value} (or (company, value) pairs) for one stage in a single transaction.
+        """
+        items = items.items() if isinstance(items, dict) else items
+        now = time.time()
+        with self._lock:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO results (company, stage, value, recorded_at) VALUES (?, ?, ?, ?)",
+                ((company, stage, json.dumps(value), now) for company, value in items)
+            )
+            self.conn.commit()
+
+    def has(self, company, stage):
+        with self._lock:
+            return self.conn.execute(
+                "SELECT 1 FROM results WHERE company = ? AND stage = ?", (company, stage)
+            ).fetchone() is not None
+
+    def get(self, company, stage, default=None):
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT value FROM results WHERE company = ? AND stage = ?", (company, stage)
+            ).fetchone()
+        return json.loads(row[0]) if row else default
+
+    def completed(self, stage, companies=None):
+        """
+        {company: value} for every company (or every one of `companies`) that has finished this stage.
+        """
+        with self._lock:
+            if companies is None:
+                rows = self.conn.execute("SELECT company, value FROM results WHERE stage = ?", (stage,)).fetchall()
+            else:
+                rows = []
+                companies = list(companies)
+                for i in range(0, len(companies), 500):
+                    part = companies[i:i + 500]
+                    rows += self.conn.execute(
+                        f"SELECT company, value FROM results WHERE stage = ? AND company IN ({','.join('?' * len(part))})",
+                        (stage, *part)
+                    ).fetchall()
+        return {company: json.loads(value) for company, value in rows}
+
+    def save_text(self, text):
+        """
+        Store a scraped text and return its hash (None for no text).
+        """
+        if text is None:
+            return None
+        h = text_hash(text)
+        with self._lock:
+            self.conn.execute("INSERT OR IGNORE INTO texts (text_hash, text) VALUES (?, ?)", (h, text))
+            self.conn.commit()
+        return h
+
+    def load_text(self, h):
+        if h is None:
+            return None
+        with self._lock:
+            row = self.conn.execute("SELECT text FROM texts WHERE text_hash = ?", (h,)).fetchone()
+        return row[0] if row else None
+
+    def table(self, companies=None):
+        """
+        One dict per company with every stage recorded so far (missing stages are None).
+        """
+        merged = {}
+        for stage in STAGES:
+            for company, value in self.completed(stage, companies).items():
+                merged.setdefault(company, {'company_name': company})[stage] = value
+        order = companies if companies is not None else sorted(merged)
+        return [{'company_name': c, **dict.fromkeys(STAGES), **merged.get(c, {})} for c in order]
@@ -0,0 +1,144 @@
+import re
+import sqlite3
+import threading
+import time
+
+from .text import normalize_company
+
+DAY = 24 * 3600
+
+# field: (TTL for a found value, TTL for a cached "nothing found"), in seconds
+DEFAULT_TTLS = {
+    'website': (180 * DAY, 14 * DAY),  # websites rarely move
+    'revenue': (60 * DAY, 7 * DAY),    # ZoomInfo estimates get revised
+}
+
+LEGAL_SUFFIXES = {
+    'inc', 'incorporated', 'llc', 'llp', 'lp', 'ltd', 'limited', 'corp', 'corporation',
+    'co', 'company', 'plc', 'pc', 'pllc',
+}
+
+MISSING = object()  # returned by get() when there is no usable entry (None is a cached negative)
+
+
+def company_key(name):
+    """
+    Store key for a company name: normalize_company, then casefold, drop punctuation and
+    trailing legal suffixes, so "Acme, Inc." / "ACME Inc" / "Acme" share one entry.
+    """
+    words = re.sub(r"[^\w\s]", " ", normalize_company(name).casefold()).split()
+    while len(words) > 1 and words[-1] in LEGAL_SUFFIXES:
+        words.pop()
+    return ' '.join(words)
+
+
+class LookupStore:
+    """
+    Results of browser lookups (website, revenue) shared across runs (SQLite).
+    Each field has its own timestamp and TTL; a lookup that found nothing is cached too,
+    with a shorter TTL, so hopeless names are not searched again on every run.
+    Nothing is loaded up front, so opening a large store is instant.
+    """
+
+    def __init__(self, path='lookup_store.sqlite', ttls=None):
+        self.path = path
+        self.ttls = {**DEFAULT_TTLS, **(ttls or {})}
+        self.stats = {'hits': 0, 'negative_hits': 0, 'misses': 0}
+        self._lock = threading.Lock()
+        # Shared by `worker` processes: wait for another writer as long as the work queue does
+        self.conn = sqlite3.connect(path, timeout=60, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS lookups (
+                key TEXT PRIMARY KEY,
+                name TEXT NOT NULL,
+                website TEXT,
+                website_source TEXT,
+                website_at REAL,
+                revenue REAL,
+                revenue_source TEXT,
+                revenue_at REAL
+            ) WITHOUT ROWID;
+        """)
+
+    def close(self):
+        self.conn.close()
+
+    def _usable(self, field, value, stored_at, now):
+        if stored_at is None:
+            return False
+        positive_ttl, negative_ttl = self.ttls[field]
+        return now - stored_at < (negative_ttl if value is None else positive_ttl)
+
+    def get(self, name, field):
+        """
+        Cached value for one field (None = cached "nothing found"), or MISSING if there is
+        no entry or it has expired.
+        """
+        return self.get_many([name], field).get(name, MISSING)
+
+    def get_many(self, names, field):
+        """
+        {name: value} for every name with a usable entry for this field.
+        """
+        if field not in self.ttls:
+            raise ValueError(f"Unknown lookup field: {field}")
+        keys = {}
+        for name in names:
+            keys.setdefault(company_key(name), []).append(name)
+        rows = []
+        key_list = list(keys)
+        with self._lock:
+            for i in range(0, len(key_list), 500):
+                part = key_list[i:i + 500]
+                rows += self.conn.execute(
+                    f"SELECT key, {field}, {field}_at FROM lookups WHERE key IN ({','.join('?' * len(part))})",
+                    part
+                ).fetchall()
+
+        now = time.time()
+        found = {}
+        for key, value, stored_at in rows:
+            if self._usable(field, value, stored_at, now):
+                for name in keys[key]:
+                    found[name] = value
+        hits = len(found)
+        negatives = sum(1 for value in found.values() if value is None)
+        self.stats['hits'] += hits - negatives
+        self.stats['negative_hits'] += negatives
+        self.stats['misses'] += len(names) - hits
+        return found
+
+    def put(self, name, field, value, source):
+        if field not in self.ttls:
+            raise ValueError(f"Unknown lookup field: {field}")
+        with self._lock:
+            self.conn.execute(
+                f"INSERT INTO lookups (key, name, {field}, {field}_source, {field}_at) VALUES (?, ?, ?, ?, ?) "
+                f"ON CONFLICT(key) DO UPDATE SET name = excluded.name, {field} = excluded.{field}, "
+                f"{field}_source = excluded.{field}_source, {field}_at = excluded.{field}_at",
+                (company_key(name), name, value, source, time.time())
+            )
+            self.conn.commit()
+
+    def forget(self, name, field=None):
+        """
+        Drop one field (or the whole entry) so the next run looks it up again.
+        """
+        with self._lock:
+            if field is None:
+                self.conn.execute("DELETE FROM lookups WHERE key = ?", (company_key(name),))
+            else:
+                self.conn.execute(
+                    f"UPDATE lookups SET {field} = NULL, {field}_source = NULL, {field}_at = NULL WHERE key = ?",
+                    (company_key(name),)
+                )
+            self.conn.commit()
+
+    def summary(self):
+        total = self.stats['hits'] + self.stats['negative_hits'] + self.stats['misses']
+        served = self.stats['hits'] + self.stats['negative_hits']
+        return (f"lookup store: {self.stats['hits']} hits, {self.stats['negative_hits']} cached not-found, "
+                f"{self.stats['misses']} misses ({100 * served / total if total else 0:.0f}% of lookups "
+                f"needed no browser query)")
@@ -0,0 +1,257 @@
+"""
+Run metrics for `rank`: per-stage latency histograms, outcome counters (ok / error / captcha ...),
+bytes downloaded and cache hit rates.
+
+Stages report through the module-level `metrics` registry. With a sink open, every timed event is
+appended to a JSON-lines file as it happens and the final totals are written as the last line;
+summary() renders the same totals as a table for the end of a run.
+
+An optional Profiler runs cProfile (or pyinstrument) around every event of one stage, or every
+event keyed by one company, and writes a single accumulated profile when the run ends.
+"""
+import contextlib
+import json
+import os
+import re
+import threading
+import time
+from collections import Counter, defaultdict
+
+# Histogram bucket upper bounds in seconds; slower events go into an overflow bucket
+BUCKETS = (0.001, 0.002, 0.005, 0.01, 0.02, 0.05, 0.1, 0.2, 0.5, 1, 2, 5, 10, 20, 60, 120)
+
+PROFILERS = ('cprofile', 'pyinstrument')
+
+
+class Histogram:
+    """
+    Fixed-bucket latency histogram; quantiles are bucket upper bounds (capped at the slowest event).
+    """
+
+    def __init__(self):
+        self.buckets = [0] * (len(BUCKETS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, seconds):
+        i = 0
+        while i < len(BUCKETS) and seconds > BUCKETS[i]:
+            i += 1
+        self.buckets[i] += 1
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+
+    def quantile(self, q):
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for bound, n in zip(BUCKETS + (self.max,), self.buckets):
+            seen += n
+            if seen >= rank:
+                return min(bound, self.max)
+        return self.max
+
+    def to_dict(self):
+        return {
+            'count': self.count, 'total': round(self.total, 6), 'max': round(self.max, 6),
+            'p50': round(self.quantile(0.5), 6), 'p95': round(self.quantile(0.95), 6),
+            'buckets': {str(bound): n for bound, n in zip(BUCKETS + ('inf',), self.buckets) if n},
+        }
+
+
+class Profiler:
+    """
+    Profiles every event whose stage or key is one of targets. Profiling is per thread, so only one
+    event is profiled at a time (events that overlap an active one are skipped); in the crawler's
+    event loop, other coroutines that run while a profiled event awaits are included.
+    """
+
+    def __init__(self, target, tool='cprofile', directory='profiles'):
+        if tool not in PROFILERS:
+            raise ValueError(f"Unknown profiler: {tool} (choose from {', '.join(PROFILERS)})")
+        self.name = target
+        self.targets = {target}
+        self.tool = tool
+        self.directory = directory
+        self.events = 0
+        self._profile = None
+        self._busy = threading.Lock()
+
+    def watch(self, key):
+        """
+        Also profile events keyed by key (e.g. the website of a profiled company).
+        """
+        self.targets.add(key)
+
+    def _start(self):
+        if self._profile is None:
+            if self.tool == 'pyinstrument':
+                import pyinstrument
+
+                self._profile = pyinstrument.Profiler()
+            else:
+                import cProfile
+
+                self._profile = cProfile.Profile()
+        if self.tool == 'pyinstrument':
+            self._profile.start()
+        else:
+            self._profile.enable()
+
+    def _stop(self):
+        if self.tool == 'pyinstrument':
+            self._profile.stop()
+        else:
+            self._profile.disable()
+
+    @contextlib.contextmanager
+    def profiling(self, stage, key=None):
+        if (stage not in self.targets and key not in self.targets) or not self._busy.acquire(blocking=False):
+            yield
+            return
+        try:
+            self._start()
+            try:
+                yield
+            finally:
+                self._stop()
+                self.events += 1
+        finally:
+            self._busy.release()
+
+    def save(self):
+        """
+        Write the accumulated profile; returns its path, or None if nothing matched.
+        """
+        if self._profile is None:
+            return None
+        os.makedirs(self.directory, exist_ok=True)
+        base = os.path.join(self.directory, re.sub(r'[^\w.-]+', '_', self.name))
+        if self.tool == 'pyinstrument':
+            path = base + '.html'
+            with open(path, 'w') as f:
+                f.write(self._profile.output_html())
+        else:
+            path = base + '.prof'
+            self._profile.dump_stats(path)
+        return path
+
+
+class Metrics:
+    """
+    Thread-safe registry of stage timings and counters.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.histograms = defaultdict(Histogram)
+        self.outcomes = defaultdict(Counter)
+        self.counters = Counter()
+        self.caches = {}
+        self.profiler = None
+        self._sink = None
+
+    def open(self, path, profiler=None):
+        """
+        Start appending events to a JSON-lines file (None = keep totals only) and attach a Profiler.
+        """
+        self.close()
+        self._sink = open(path, 'a', buffering=1) if path else None
+        self.profiler = profiler
+
+    def close(self):
+        """
+        Write the final totals to the sink and the profile to disk. Returns the profile path, if any.
+        """
+        path = self.profiler.save() if self.profiler else None
+        if self._sink:
+            self._emit({'summary': self.snapshot()})
+            self._sink.close()
+            self._sink = None
+        self.profiler = None
+        return path
+
+    def _emit(self, record):
+        if self._sink:
+            line = json.dumps({'ts': round(time.time(), 3), **record}, default=str)
+            with self._lock:
+                self._sink.write(line + '\n')
+
+    def count(self, name, n=1):
+        with self._lock:
+            self.counters[name] += n
+
+    def observe(self, stage, seconds, outcome='ok', key=None, **fields):
+        with self._lock:
+            self.histograms[stage].add(seconds)
+            self.outcomes[stage][outcome] += 1
+        self._emit({'stage': stage, 'key': key, 'seconds': round(seconds, 6), 'outcome': outcome, **fields})
+
+    @contextlib.contextmanager
+    def timer(self, stage, key=None, **fields):
+        """
+        Time the block as one event of stage. The block may set event['outcome'] and add fields to
+        the yielded dict; an exception that escapes it makes the outcome 'error' unless one was set.
+        """
+        event = dict(fields)
+        profiling = self.profiler.profiling(stage, key) if self.profiler else contextlib.nullcontext()
+        start = time.perf_counter()
+        try:
+            with profiling:
+                yield event
+        except BaseException as e:
+            event.setdefault('outcome', 'error')
+            event.setdefault('error', type(e).__name__)
+            raise
+        finally:
+            self.observe(stage, time.perf_counter() - start, event.pop('outcome', 'ok'), key, **event)
+
+    def watch_cache(self, name, stats, misses=('misses',)):
+        """
+        Report a cache's hit rate from its stats dict: every key not in misses counts as a hit.
+        """
+        self.caches[name] = (stats, misses)
+
+    def cache_rates(self):
+        rates = {}
+        for name, (stats, misses) in self.caches.items():
+            total = sum(stats.values())
+            hits = total - sum(stats.get(k, 0) for k in misses)
+            rates[name] = {'hits': hits, 'lookups': total, 'hit_rate': round(hits / total, 4) if total else None}
+        return rates
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                'stages': {stage: {**h.to_dict(), 'outcomes': dict(self.outcomes[stage])}
+                           for stage, h in sorted(self.histograms.items())},
+                'counters': dict(sorted(self.counters.items())),
+                'caches': self.cache_rates(),
+            }
+
+    def summary(self):
+        """
+        End-of-run table: one row per stage, then counters and cache hit rates.
+        """
+        with self._lock:
+            stages = [(stage, h, dict(self.outcomes[stage])) for stage, h in sorted(self.histograms.items())]
+            counters = sorted(self.counters.items())
+        if not stages:
+            return "metrics: nothing recorded"
+        lines = [f"{'stage':<24} {'count':>7} {'p50 ms':>9} {'p95 ms':>9} {'max ms':>9} {'total s':>9}  outcomes"]
+        for stage, h, outcomes in stages:
+            outcomes = ', '.join(f"{name} {n}" for name, n in sorted(outcomes.items()))
+            lines.append(f"{stage:<24} {h.count:>7} {1000 * h.quantile(0.5):>9.1f} {1000 * h.quantile(0.95):>9.1f} "
+                         f"{1000 * h.max:>9.1f} {h.total:>9.1f}  {outcomes}")
+        if counters:
+            lines.append("counters: " + ', '.join(f"{name} {n}" for name, n in counters))
+        for name, rate in self.cache_rates().items():
+            if rate['lookups']:
+                lines.append(f"{name}: {rate['hits']}/{rate['lookups']} hits ({100 * rate['hit_rate']:.0f}%)")
+        return '\n'.join(lines)
+
+
+metrics = Metrics()
@@ -0,0 +1,70 @@
+"""
+Lazily loaded relevance model and vectorizer.
+Nothing is unpickled (and scikit-learn is not imported) until a command actually scores text.
+"""
+import functools
+import hashlib
+import os
+
+MODEL_PATH = 'relevance_model.pkl'
+VECTORIZER_PATH = 'vectorizer.pkl'
+COMPACT_PATH = 'relevance_model'
+
+
+@functools.lru_cache(maxsize=None)
+def load_model(path=MODEL_PATH):
+    import joblib
+
+    return joblib.load(path)
+
+
+@functools.lru_cache(maxsize=None)
+def load_vectorizer(path=VECTORIZER_PATH):
+    import joblib
+
+    return joblib.load(path)
+
+
+def file_version(path):
+    """
+    Short content hash of a saved artifact; changes whenever the file is retrained and rewritten.
+    """
+    h = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            h.update(block)
+    return h.hexdigest()[:12]
+
+
+def model_version(model_path=MODEL_PATH, vectorizer_path=VECTORIZER_PATH):
+    """
+    'vectorizer:classifier' version string recorded next to every relevance score.
+    """
+    return f"{file_version(vectorizer_path)}:{file_version(model_path)}"
+
+
+@functools.lru_cache(maxsize=None)
+def load_scorer(compact_path=COMPACT_PATH):
+    """
+    (model, vectorizer) for score_texts. Uses the compact artifact (vectorizer None) when it was
+    exported from the current pickles, or when there are no pickles; otherwise unpickles them.
+    """
+    if os.path.exists(os.path.join(compact_path, 'meta.json')):
+        from .compact_model import CompactModel
+
+        compact = CompactModel(compact_path)
+        have_pickles = os.path.exists(MODEL_PATH) and os.path.exists(VECTORIZER_PATH)
+        if not have_pickles or compact.source_version == model_version():
+            return compact, None
+        print(f"'{compact_path}/' is older than {MODEL_PATH}; run `python -m leadgen export-model` to refresh it")
+    return load_model(), load_vectorizer()
+
+
+def scorer_version(model, vectorizer):
+    """
+    model_version of a load_scorer() result; for the compact artifact, the version of the pickles
+    it was exported from (read from its meta.json, so the pickles need not be deployed).
+    """
+    if vectorizer is None:
+        return model.source_version or 'compact'
+    return model_version()
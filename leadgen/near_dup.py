@@ -0,0 +1,161 @@
+"""
+Near-duplicate detection for scraped texts: MinHash signatures of word shingles, indexed with
+locality-sensitive hashing (LSH) so finding a text's near-duplicates never compares it against
+every other text.
+
+Small contractor sites built on the same template vendor, and franchise locations, serve almost
+the same text. The index lets training drop near-identical rows, lets scoring reuse the score of
+a near-identical text, and split_blocks / strip_seen_blocks drop blocks a site repeats on every page.
+"""
+import re
+import threading
+import zlib
+
+import numpy as np
+
+NUM_PERM = 64
+BANDS = 8  # 8 bands of 8 rows: texts with Jaccard similarity >= 0.9 are candidates with probability > 0.99
+SHINGLE_WORDS = 4
+MAX_CACHED_WORDS = 500_000
+
+_MIX = np.uint64(0x9E3779B97F4A7C15)  # odd 64-bit constant for combining word hashes
+_BLOCK_END = re.compile(r'(?<=[.!?])\s+')
+_word_hashes = {}
+
+
+def _word_hash_table(words):
+    # Scraped texts share most of their vocabulary, so word hashes are memoized (the table is
+    # replaced, not cleared, when it grows too big, so a caller holding the old one is unaffected)
+    global _word_hashes
+    if len(_word_hashes) > MAX_CACHED_WORDS:
+        _word_hashes = {}
+    table = _word_hashes
+    for word in set(words).difference(table):
+        table[word] = zlib.crc32(word.encode())
+    return table
+
+
+def shingles(text, k=SHINGLE_WORDS):
+    """
+    Distinct 64-bit hashes of the text's k-word shingles (the whole text if it is shorter than k words);
+    words are the lowercased, whitespace-separated tokens.
+    Each word is hashed once; a shingle's hash combines its words' hashes arithmetically.
+    """
+    words = text.lower().split()
+    if not words:
+        return np.empty(0, dtype=np.uint64)
+    hashes = np.fromiter(map(_word_hash_table(words).__getitem__, words), dtype=np.uint64, count=len(words))
+    k = min(k, len(words))
+    n = len(words) - k + 1
+    combined = np.zeros(n, dtype=np.uint64)
+    with np.errstate(over='ignore'):
+        for i in range(k):
+            combined = combined * _MIX + hashes[i:i + n]
+    return np.unique(combined)
+
+
+class MinHasher:
+    """
+    MinHash signatures with num_perm multiply-shift hash functions; the share of equal positions in two
+    signatures estimates the Jaccard similarity of the two shingle sets.
+    """
+
+    def __init__(self, num_perm=NUM_PERM, seed=1):
+        rng = np.random.default_rng(seed)
+        self.a = rng.integers(1, 2 ** 63, num_perm, dtype=np.uint64) | np.uint64(1)  # odd multipliers
+        self.b = rng.integers(0, 2 ** 63, num_perm, dtype=np.uint64)
+
+    def signature(self, text):
+        hashes = shingles(text)
+        if not len(hashes):
+            return np.full(len(self.a), 0xFFFFFFFF, dtype=np.uint32)
+        # (a*x + b) mod 2^64, top 32 bits; uint64 arithmetic wraps, which is the mod
+        with np.errstate(over='ignore'):
+            return ((hashes[:, None] * self.a + self.b) >> np.uint64(32)).min(axis=0).astype(np.uint32)
+
+
+def similarity(sig1, sig2):
+    return np.count_nonzero(sig1 == sig2) / len(sig1)
+
+
+class NearDupIndex:
+    """
+    LSH index of signatures, each stored under a key with an optional value (e.g. a relevance score).
+    query(signature) returns the key of the most similar stored text at or above threshold, or None.
+    Safe to use from several threads.
+    """
+
+    def __init__(self, threshold=0.9, num_perm=NUM_PERM, bands=BANDS, seed=1):
+        self.threshold = threshold
+        self.hasher = MinHasher(num_perm, seed)
+        self.rows = num_perm // bands
+        self.buckets = [{} for _ in range(bands)]
+        self.signatures = {}
+        self.values = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.signatures)
+
+    def signature(self, text):
+        return self.hasher.signature(text)
+
+    def _bands(self, sig):
+        return [sig[i * self.rows:(i + 1) * self.rows].tobytes() for i in range(len(self.buckets))]
+
+    def add(self, key, sig, value=None):
+        with self._lock:
+            self.signatures[key] = sig
+            self.values[key] = value
+            for bucket, band in zip(self.buckets, self._bands(sig)):
+                bucket.setdefault(band, []).append(key)
+
+    def query(self, sig):
+        with self._lock:
+            candidates = {key for bucket, band in zip(self.buckets, self._bands(sig)) for key in bucket.get(band, ())}
+            best, best_sim = None, self.threshold
+            for key in candidates:
+                sim = similarity(sig, self.signatures[key])
+                if sim >= best_sim:
+                    best, best_sim = key, sim
+            return best
+
+
+def near_duplicates(texts, threshold=0.9, groups=None):
+    """
+    For each text, the index of an earlier text it nearly duplicates, or -1. With groups (e.g. labels),
+    only texts in the same group count as duplicates.
+    """
+    index = NearDupIndex(threshold)
+    matches = []
+    for i, text in enumerate(texts):
+        sig = index.signature(text)
+        group = groups[i] if groups is not None else None
+        match = index.query(sig)
+        if match is not None and index.values[match] == group:
+            matches.append(match)
+        else:
+            matches.append(-1)
+            index.add(i, sig, group)
+    return matches
+
+
+def split_blocks(text):
+    """
+    Sentence-sized blocks of one page's extracted text.
+    """
+    return [block for block in _BLOCK_END.split(text) if block]
+
+
+def strip_seen_blocks(text, seen):
+    """
+    Drop the blocks of a page that an earlier page of the same site already had (template sidebars,
+    repeated calls to action, "website by" lines); seen is the set of block hashes so far and is updated.
+    """
+    kept = []
+    for block in split_blocks(text):
+        h = zlib.crc32(block.encode())
+        if h not in seen:
+            kept.append(block)
+    seen.update(zlib.crc32(block.encode()) for block in kept)
+    return ' '.join(kept)
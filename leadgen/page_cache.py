@@ -0,0 +1,177 @@
+import hashlib
+import sqlite3
+import threading
+import time
+from collections import namedtuple
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+CachedPage = namedtuple('CachedPage', ['url', 'body', 'etag', 'last_modified', 'fetched_at', 'encoding'])
+
+DEFAULT_PORTS = {'http': 80, 'https': 443}
+
+
+def normalize_url(url):
+    """
+    Canonical form used as the cache key: lowercase scheme/host, no default port,
+    no fragment, no trailing slash, sorted query string.
+    """
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or '').lower()
+    if parts.port and parts.port != DEFAULT_PORTS.get(scheme):
+        host = f"{host}:{parts.port}"
+    path = parts.path.rstrip('/') or '/'
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    return urlunsplit((scheme, host, path, query, ''))
+
+
+def url_key(url):
+    return hashlib.sha1(normalize_url(url).encode()).hexdigest()
+
+
+class PageCache:
+    """
+    On-disk cache of fetched pages (SQLite).
+    Page bodies are stored once per content hash, so identical template pages share a row.
+    Entries older than ttl seconds are stale and get revalidated with ETag/Last-Modified.
+    Once the stored bodies exceed max_bytes, the least recently used pages are evicted.
+    """
+
+    def __init__(self, path='page_cache.sqlite', ttl=7 * 24 * 3600, max_bytes=512 * 1024 * 1024):
+        self.path = path
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.stats = {'hits': 0, 'misses': 0, 'revalidations': 0}
+        self._lock = threading.Lock()
+        # Shared by `worker` processes: wait for another writer as long as the work queue does
+        self.conn = sqlite3.connect(path, timeout=60, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS blobs (
+                content_hash TEXT PRIMARY KEY,
+                body BLOB NOT NULL,
+                size INTEGER NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS pages (
+                key TEXT PRIMARY KEY,
+                url TEXT NOT NULL,
+                content_hash TEXT NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                fetched_at REAL NOT NULL,
+                accessed_at REAL NOT NULL,
+                encoding TEXT
+            );
+            CREATE INDEX IF NOT EXISTS pages_accessed ON pages(accessed_at);
+            CREATE INDEX IF NOT EXISTS pages_content ON pages(content_hash);
+        """)
+        columns = [row[1] for row in self.conn.execute("PRAGMA table_info(pages)")]
+        if 'encoding' not in columns:  # caches written before raw bytes were stored
+            self.conn.execute("ALTER TABLE pages ADD COLUMN encoding TEXT")
+            self.conn.execute("UPDATE pages SET encoding = 'utf-8'")
+            self.conn.commit()
+        self.total_bytes = self.conn.execute("SELECT COALESCE(SUM(size), 0) FROM blobs").fetchone()[0]
+
+    def close(self):
+        self.conn.close()
+
+    def get(self, url):
+        """
+        Look up a page. Returns a CachedPage (fresh or stale) or None.
+        """
+        key = url_key(url)
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT p.url, b.body, p.etag, p.last_modified, p.fetched_at, p.encoding "
+                "FROM pages p JOIN blobs b ON b.content_hash = p.content_hash WHERE p.key = ?",
+                (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            self.conn.execute("UPDATE pages SET accessed_at = ? WHERE key = ?", (time.time(), key))
+            self.conn.commit()
+        return CachedPage(*row)
+
+    def is_fresh(self, page):
+        return time.time() - page.fetched_at < self.ttl
+
+    def conditional_headers(self, page):
+        headers = {}
+        if page.etag:
+            headers['If-None-Match'] = page.etag
+        if page.last_modified:
+            headers['If-Modified-Since'] = page.last_modified
+        return headers
+
+    def put(self, url, body, etag=None, last_modified=None, encoding=None):
+        """
+        Store a page body (raw bytes, or str which is stored as utf-8).
+        """
+        if isinstance(body, str):
+            body, encoding = body.encode('utf-8'), 'utf-8'
+        data = body
+        content_hash = hashlib.sha1(data).hexdigest()
+        key = url_key(url)
+        now = time.time()
+        with self._lock:
+            cur = self.conn.execute(
+                "INSERT OR IGNORE INTO blobs (content_hash, body, size) VALUES (?, ?, ?)",
+                (content_hash, data, len(data))
+            )
+            if cur.rowcount:
+                self.total_bytes += len(data)
+            old = self.conn.execute("SELECT content_hash FROM pages WHERE key = ?", (key,)).fetchone()
+            self.conn.execute(
+                "INSERT OR REPLACE INTO pages "
+                "(key, url, content_hash, etag, last_modified, fetched_at, accessed_at, encoding) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, url, content_hash, etag, last_modified, now, now, encoding)
+            )
+            if old and old[0] != content_hash:
+                self._drop_orphans([old[0]])
+            if self.total_bytes > self.max_bytes:
+                self._evict()
+            self.conn.commit()
+
+    def refresh(self, url):
+        """
+        Mark a stale page as fresh again after a 304 Not Modified.
+        """
+        now = time.time()
+        with self._lock:
+            self.conn.execute(
+                "UPDATE pages SET fetched_at = ?, accessed_at = ? WHERE key = ?",
+                (now, now, url_key(url))
+            )
+            self.conn.commit()
+
+    def _drop_orphans(self, hashes):
+        for content_hash in hashes:
+            if self.conn.execute("SELECT 1 FROM pages WHERE content_hash = ? LIMIT 1", (content_hash,)).fetchone():
+                continue
+            row = self.conn.execute("SELECT size FROM blobs WHERE content_hash = ?", (content_hash,)).fetchone()
+            if row:
+                self.conn.execute("DELETE FROM blobs WHERE content_hash = ?", (content_hash,))
+                self.total_bytes -= row[0]
+
+    def _evict(self):
+        # Drop least recently used pages until we are back under 90% of the budget
+        target = self.max_bytes * 0.9
+        while self.total_bytes > target:
+            rows = self.conn.execute(
+                "SELECT key, content_hash FROM pages ORDER BY accessed_at LIMIT 100"
+            ).fetchall()
+            if not rows:
+                break
+            for key, content_hash in rows:
+                self.conn.execute("DELETE FROM pages WHERE key = ?", (key,))
+                self._drop_orphans([content_hash])
+                if self.total_bytes <= target:
+                    break
+
+    def summary(self):
+        lookups = self.stats['hits'] + self.stats['misses'] + self.stats['revalidations']
+        hit_rate = (self.stats['hits'] + self.stats['revalidations']) / lookups if lookups else 0.0
+        return (f"page cache: {self.stats['hits']} hits, {self.stats['misses']} misses, "
+                f"{self.stats['revalidations']} revalidated ({hit_rate:.0%} served from cache)")
@@ -0,0 +1,264 @@
+"""
+`rank`: find each company's website, scrape and score it, look up revenue, and rank.
+"""
+import os
+import sys
+
+from .crawler import PERMANENT_FAILURES, scrape_many
+from .driver_pool import DriverPool, make_headless_driver
+from .extraction import ExtractionPool
+from .journal import Journal
+from .lookup_store import LookupStore
+from .metrics import Profiler, metrics
+from .models import load_scorer, scorer_version
+from .near_dup import NearDupIndex
+from .page_cache import PageCache
+from .planner import DEFAULT_CHECKS, StagePlanner
+from .resolvers import DEFAULT_RESOLVERS, ResolverChain, make_resolvers
+from .rate_limit import DomainRateLimiter
+from .scoring import ScoringStage
+from .streaming import ResultWriter, external_sort, partial_path_for, read_companies
+from .text import detect_acquisition, normalize_company
+
+COLUMNS = ['final_score', 'company_name', 'relevance_score', 'revenue', 'website', 'skip_reason']
+# One output schema for every chunk: a chunk whose revenues are all whole numbers, or whose
+# websites are all missing, must not decide the column types of the Parquet file
+COLUMN_TYPES = {'final_score': 'float64', 'company_name': 'string', 'relevance_score': 'float64',
+                'revenue': 'float64', 'website': 'string', 'skip_reason': 'string'}
+RULE_VERSION = 'rule'  # relevance set by a rule (no text, acquired), not by a model
+
+
+def result_row(row, skip_reason=None):
+    """
+    Output row for one company from its merged journal record.
+    """
+    relevance_score = row['relevance'] if row['relevance'] is not None else 0
+    revenue = row['revenue']
+
+    # Combined score (simple: relevance + checks)
+    final_score = relevance_score * (1 if revenue else 0)
+
+    return {
+        'final_score': final_score,
+        'company_name': row['company_name'],
+        'relevance_score': relevance_score,
+        'revenue': (revenue if revenue else 0),
+        'website': row['website'],
+        'skip_reason': skip_reason
+    }
+
+
+class RankRun:
+    """
+    One run of the ranking pipeline. Every stage result goes through the journal,
+    so with resume=True a stage only runs for companies that have no result for it yet.
+    driver_factory and site_limiter can be swapped out, e.g. for the offline benchmark's fake web.
+    A text at least near_dup similar to one already scored in this run reuses its score (0 = always score).
+    """
+
+    def __init__(self, journal_path='pipeline_journal.sqlite', resume=False, browsers=3,
+                 cache_path='page_cache.sqlite', planner=None, lookup_store_path='lookup_store.sqlite',
+                 resolver=None, metrics_path=None, profiler=None, driver_factory=make_headless_driver,
+                 site_limiter=None, near_dup=0):
+        self.journal = Journal(journal_path)
+        if not resume:
+            self.journal.reset()
+        self.browsers = browsers
+        self.cache_path = cache_path
+        self.planner = planner or StagePlanner()
+        self.lookups = LookupStore(lookup_store_path)
+        self.resolver = resolver or ResolverChain(make_resolvers())
+        self.skipped = {}
+        self.metrics_path = metrics_path
+        self.profiler = profiler
+        self.driver_factory = driver_factory
+        self.site_limiter = site_limiter
+        self.near_dup = near_dup
+
+    def record_website(self, company, url, source):
+        self.lookups.put(company, 'website', url, source)
+        self.journal.record(company, 'website', url)
+        print(url)
+
+    # Browser lookup; imported here so nothing loads Selenium before a browser is needed
+    def lookup_revenue(self, company, driver):
+        from .search import check_revenue_zoominfo
+
+        with metrics.timer('revenue', company) as event:
+            revenue = check_revenue_zoominfo(company, driver)
+            event['outcome'] = 'found' if revenue else 'not_found'
+        self.lookups.put(company, 'revenue', revenue, 'zoominfo')
+        self.journal.record(company, 'revenue', revenue)
+        print(company, "→", revenue)
+        return revenue
+
+    def from_store(self, companies, stage):
+        """
+        Record every company the lookup store already knows for this stage; return the rest.
+        """
+        known = self.lookups.get_many(companies, stage)
+        for company, value in known.items():
+            self.journal.record(company, stage, value)
+        return [c for c in companies if c not in known]
+
+    def record_scores(self, companies, probs):
+        # Probability of relevant (1), tagged with the model that produced it so `rescore` can find stale rows
+        self.journal.record_many('relevance', [(c, round(float(p), 2)) for c, p in zip(companies, probs)])
+        self.journal.record_many('relevance_version', [(c, self.version) for c in companies])
+
+    def record_rule(self, company, relevance):
+        self.journal.record(company, 'relevance', relevance)
+        self.journal.record(company, 'relevance_version', RULE_VERSION)
+
+    def submit_for_scoring(self, company, scraped_text):
+        if not scraped_text:
+            self.record_rule(company, 0.5)  # No text = irrelevant
+        elif detect_acquisition(scraped_text):
+            self.record_rule(company, 0)
+        else:
+            self.scorer.submit(company, scraped_text)
+            print(f"Got text for {company}")
+
+    def process_chunk(self, names):
+        """
+        Run every stage for one chunk of companies and return their result rows.
+        """
+        journal = self.journal
+
+        # Resolve websites: cheap HTTP backends first, browsers only for what they miss
+        done = journal.completed('website', names)
+        with metrics.timer('chunk.websites', companies=len(names)):
+            self.resolver.resolve_many(self.from_store([c for c in names if c not in done], 'website'),
+                                       self.pool, self.record_website)
+        websites = journal.completed('website', names)
+        if self.profiler and self.profiler.name in websites:
+            self.profiler.watch(websites[self.profiler.name])  # profile the company's crawl too
+
+        # Crawl every resolved site concurrently; texts are scored in micro-batches as they arrive
+        text_hashes = journal.completed('text_hash', names)
+        scored = journal.completed('relevance', names)
+        for company in names:
+            if company in text_hashes and company not in scored:
+                self.submit_for_scoring(company, journal.load_text(text_hashes[company]))
+
+        todo = [c for c in names if c in websites and c not in text_hashes]
+        failures = {}
+
+        def on_scraped(i, text):
+            reason = failures.get(websites[todo[i]]) if text is None else None
+            if reason is not None and reason not in PERMANENT_FAILURES:
+                return  # a timeout or connection error: left out of the journal so --resume crawls it again
+            journal.record(todo[i], 'text_hash', journal.save_text(text))
+            self.submit_for_scoring(todo[i], text)
+
+        with metrics.timer('chunk.crawl', companies=len(todo)):
+            scrape_many([websites[c] for c in todo], cache=self.page_cache, limiter=self.site_limiter,
+                        on_result=on_scraped, extractor=self.extractor, failures=failures)
+            self.scorer.flush()
+
+        # Revenue, only for companies that pass the cheap checks (re-planned on every run, so
+        # changing --min-score on a resumed run takes effect)
+        done = journal.completed('revenue', names)
+        pending = [row for row in journal.table(names) if row['company_name'] not in done]
+        survivors, skipped = self.planner.plan(pending, journal.load_text)
+        self.skipped.update(skipped)
+        with metrics.timer('chunk.revenue', companies=len(survivors)):
+            self.pool.map(self.lookup_revenue, self.from_store(survivors, 'revenue'))
+
+        # Merge everything recorded in the journal into result rows
+        return [result_row(row, skipped.get(row['company_name'])) for row in journal.table(names)]
+
+    def start(self):
+        """
+        Start the stage workers (parser processes, scoring thread, browser pool) for process_chunk.
+        """
+        # The parser processes are forked before the scoring and browser threads start
+        self.extractor = ExtractionPool()
+        model, vectorizer = load_scorer()
+        self.version = scorer_version(model, vectorizer)
+        reuse = NearDupIndex(self.near_dup) if self.near_dup else None
+        self.scorer = ScoringStage(model, vectorizer, self.record_scores, reuse=reuse)
+        self.pool = DriverPool(size=self.browsers, factory=self.driver_factory)
+        self.page_cache = PageCache(self.cache_path)
+        self.site_limiter = self.site_limiter or DomainRateLimiter()
+        metrics.open(self.metrics_path, self.profiler)
+        metrics.watch_cache('page cache', self.page_cache.stats)
+        metrics.watch_cache('lookup store', self.lookups.stats)
+
+    def stop(self):
+        self.scorer.close()
+        self.extractor.close()
+        self.pool.close()
+
+    def finish(self):
+        """
+        Print the run summary and write out the metrics and profile.
+        """
+        self.print_summary()
+        profile_path = metrics.close()
+        if self.metrics_path:
+            print(f"Stage metrics written to '{self.metrics_path}'")
+        if profile_path:
+            print(f"Profile of {self.profiler.events} '{self.profiler.name}' events written to '{profile_path}'")
+
+    def unfinished(self, names):
+        return sum(1 for c in names if not (self.journal.has(c, 'website') and self.journal.has(c, 'text_hash') and
+                                            (self.journal.has(c, 'revenue') or c in self.skipped)))
+
+    def run(self, input_path='new_companies.csv', output_path='ranked_companies.csv', chunk_size=500):
+        partial_path = partial_path_for(output_path)
+        self.start()
+
+        # Stream the input: each chunk flows through every stage and is appended to the partial
+        # results file before the next chunk is read
+        unfinished = 0
+        try:
+            with ResultWriter(partial_path, COLUMNS, COLUMN_TYPES) as writer:
+                for names in read_companies(input_path, chunk_size, normalize=normalize_company):
+                    writer.write(self.process_chunk(names))
+                    unfinished += self.unfinished(names)
+                    print(f"{writer.rows_written} companies written to {partial_path}")
+        finally:
+            self.stop()
+
+        self.finish()
+        if unfinished:
+            print(f"{unfinished} companies have unfinished lookups; re-run with --resume to retry them.")
+
+        # Rank and save (external merge sort, so the ranking never has to fit in memory)
+        external_sort(partial_path, output_path, key='final_score', ascending=False, types=COLUMN_TYPES)
+        if os.path.exists(partial_path):
+            os.remove(partial_path)
+        print(f"Pipeline complete. Check '{output_path}' for rankings.")
+
+    def print_summary(self):
+        print(self.planner.summary())
+        print(self.lookups.summary())
+        print(self.resolver.summary())
+        print(self.page_cache.summary())
+        print(f"site rate limiter: {self.site_limiter.stats['throttled']} throttled responses, "
+              f"{self.site_limiter.stats['waited']:.1f} s spent waiting")
+        print(f"Scored {self.scorer.stats['scored']} texts in {self.scorer.stats['batches']} batches")
+        if self.scorer.reuse is not None:
+            print(f"Reused the score of a near-identical text for {self.scorer.stats['reused']} texts")
+        if 'leadgen.search' in sys.modules:
+            from .search import search_limiter
+            print(f"search engines: {search_limiter.stats['requests']} queries, {search_limiter.stats['throttled']} CAPTCHAs, "
+                  f"{search_limiter.stats['waited']:.1f} s spent waiting")
+        print(metrics.summary())
+
+
+def run_from_args(args, journal_path, resume):
+    """
+    RankRun configured from the stage options shared by `rank` and `worker`.
+    """
+    planner = StagePlanner(args.min_score, args.checks.split(',') if args.checks else DEFAULT_CHECKS)
+    resolver = ResolverChain(make_resolvers(args.resolvers.split(',') if args.resolvers else DEFAULT_RESOLVERS))
+    profiler = Profiler(args.profile, args.profiler, args.profile_dir) if args.profile else None
+    return RankRun(journal_path, resume, args.browsers, cache_path=args.cache, planner=planner,
+                   lookup_store_path=args.lookup_store, resolver=resolver, metrics_path=args.metrics or None,
+                   profiler=profiler, near_dup=args.near_dup)
+
+
+def main(args):
+    run_from_args(args, args.journal, args.resume).run(args.input, args.output, args.chunk_size)
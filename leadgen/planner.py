@@ -0,0 +1,93 @@
+"""
+Cost-ordered stage planning for `rank`.
+
+final_score = relevance_score * (1 if revenue else 0), so a company's relevance is an upper bound
+on its final score. The cheap checks below run on what the pipeline already has (the relevance
+score and the scraped text) before any rate-limited browser lookup, cheapest first, and stop at
+the first one that fails. Only the companies that survive get a revenue lookup.
+"""
+from collections import Counter
+
+from .signals import analyze, hq_in_ca
+
+# Browser queries each lookup stage costs per company
+LOOKUP_QUERIES = {'website': 1, 'revenue': 1}
+
+
+def _relevance(planner, row, signals_of):
+    relevance = row['relevance'] if row['relevance'] is not None else 0
+    return relevance >= planner.min_score
+
+
+def _acquisition(planner, row, signals_of):
+    signals = signals_of(row)
+    return not (signals and signals.acquisition)
+
+
+def _ca_hq(planner, row, signals_of):
+    signals = signals_of(row)
+    return signals is None or hq_in_ca(signals)  # No text = unknown, keep it
+
+
+# name: (relative cost, check); a check returns False when the company can be dropped
+CHECKS = {
+    'relevance': (0, _relevance),       # already scored
+    'acquisition': (1, _acquisition),   # scan of the scraped text
+    'ca_hq': (2, _ca_hq),               # same scan, already done by then
+}
+DEFAULT_CHECKS = ('relevance', 'acquisition')
+
+
+class StagePlanner:
+    """
+    Decides which companies still need the expensive lookups. `checks` are names from CHECKS
+    and always run in cost order, whatever order they are given in.
+    """
+
+    def __init__(self, min_score=0.1, checks=DEFAULT_CHECKS):
+        unknown = set(checks) - set(CHECKS)
+        if unknown:
+            raise ValueError(f"Unknown checks: {', '.join(sorted(unknown))} (choose from {', '.join(CHECKS)})")
+        self.min_score = min_score
+        self.checks = sorted(set(checks), key=lambda name: CHECKS[name][0])
+        self.stats = {'planned': 0, 'skipped': Counter(), 'queries_avoided': 0}
+
+    def skip_reason(self, row, load_text):
+        """
+        Name of the first check this journal row fails, or None if it should go on to the lookups.
+        """
+        cached = {}
+
+        def signals_of(row):
+            # Load and scan the scraped text at most once, and only if a check needs it
+            if 'signals' not in cached:
+                text = load_text(row['text_hash'])
+                cached['signals'] = analyze(text) if text else None
+            return cached['signals']
+
+        for name in self.checks:
+            if not CHECKS[name][1](self, row, signals_of):
+                return name
+        return None
+
+    def plan(self, rows, load_text, stage='revenue'):
+        """
+        Split journal rows into (companies to look up, {company: skip reason}).
+        """
+        survivors, skipped = [], {}
+        for row in rows:
+            reason = self.skip_reason(row, load_text)
+            if reason is None:
+                survivors.append(row['company_name'])
+            else:
+                skipped[row['company_name']] = reason
+                self.stats['skipped'][reason] += 1
+                self.stats['queries_avoided'] += LOOKUP_QUERIES[stage]
+        self.stats['planned'] += len(rows)
+        return survivors, skipped
+
+    def summary(self):
+        skipped = self.stats['skipped']
+        reasons = ', '.join(f"{name}: {skipped[name]}" for name in self.checks if skipped[name])
+        return (f"planner: {sum(skipped.values())} of {self.stats['planned']} companies stopped before the "
+                f"revenue lookup ({reasons or 'none'}); {self.stats['queries_avoided']} browser queries avoided")
@@ -0,0 +1,137 @@
+"""
+`prep`: scrape the labeled companies into the training set, incrementally.
+
+The training set is a Parquet store with one row per labeled company: its label, the scraped text,
+when it was scraped and, when a scrape failed, why. Each run diffs the labels file against the
+store and crawls only companies that are new or whose URL changed (plus earlier failures with
+--retry-failed), concurrently, retrying transient errors. Label edits need no crawling at all.
+"""
+import asyncio
+import os
+import time
+
+import pandas as pd
+
+from .crawler import NO_TEXT, ROBOTS_DISALLOWED, Crawler
+from .page_cache import PageCache
+
+STORE_COLUMNS = ['company_name', 'website_url', 'label_relevance', 'scraped_text', 'error', 'attempts', 'scraped_at']
+TEXT_COLUMNS = ['company_name', 'website_url', 'label_relevance', 'scraped_text']
+NO_URL = 'no website url'
+RETRY_DELAY = 2.0  # seconds before the first retry; doubles each time
+
+
+def read_labels(path):
+    df = pd.read_csv(path)
+
+    # Check and drop duplicate header rows (e.g., if first row looks like headers)
+    # Assuming the duplicate is something like "company,website,label," in the first data row
+    if not df.empty and df.iloc[0]['company_name'].strip().lower() == 'company':
+        df = df.drop(0).reset_index(drop=True)
+        print("Dropped duplicate header row.")
+
+    # Ensure columns are named correctly (in case the CSV has no headers)
+    df.columns = ['company_name', 'website_url', 'label_relevance'] if len(df.columns) == 3 else df.columns
+    df['website_url'] = df['website_url'].where(df['website_url'].notna(), None)
+
+    # A company labeled twice keeps its last row
+    return df.drop_duplicates('company_name', keep='last').reset_index(drop=True)
+
+
+def load_store(path, seed_csv=None):
+    """
+    The training set store; on the first run it is seeded from the CSV an older `prep` wrote, so
+    companies scraped back then are not crawled again.
+    """
+    if os.path.exists(path):
+        return pd.read_parquet(path)
+    if seed_csv and os.path.exists(seed_csv):
+        store = pd.read_csv(seed_csv)
+        store = store.drop_duplicates('company_name', keep='last')
+        store['error'] = None
+        store['attempts'] = 1
+        store['scraped_at'] = os.path.getmtime(seed_csv)
+        print(f"Seeded the store from {len(store)} rows of '{seed_csv}'")
+        return store[STORE_COLUMNS]
+    return pd.DataFrame(columns=STORE_COLUMNS)
+
+
+def diff(labels, store, retry_failed=False):
+    """
+    Labels merged with what the store has for each company, and the mask of rows to crawl.
+    """
+    stored = store.drop(columns=['label_relevance']).rename(columns={'website_url': 'stored_url'})
+    df = labels.merge(stored, on='company_name', how='left')
+    changed = df['website_url'].fillna('') != df['stored_url'].fillna('')
+    new = df['scraped_text'].isna() & df['error'].isna()
+    failed = df['scraped_text'].isna() & df['error'].notna()
+    todo = df['website_url'].notna() & (new | changed | (failed & retry_failed))
+
+    # Rows whose URL changed (or went away) lose their old text
+    df.loc[changed, ['scraped_text', 'error', 'scraped_at']] = None
+    df.loc[changed, 'attempts'] = 0
+    df.loc[df['website_url'].isna(), 'error'] = NO_URL
+    return df.drop(columns=['stored_url']), todo
+
+
+async def scrape_with_reasons(urls, cache, retries, concurrency):
+    """
+    {url: (text or None, failure reason or None, attempts)} for every url. Sites that raised an
+    error are retried with growing delays; sites that answered without text are not.
+    """
+    results = {}
+    async with Crawler(concurrency=concurrency, cache=cache) as crawler:
+        pending = list(dict.fromkeys(urls))
+        for attempt in range(1, retries + 2):
+            texts = await crawler.scrape_many(pending)
+            for url, text in zip(pending, texts):
+                results[url] = (text, crawler.failures.pop(url, None), attempt)
+            pending = [url for url in pending if results[url][1] not in (None, NO_TEXT, ROBOTS_DISALLOWED)]
+            if not pending or attempt > retries:
+                break
+            print(f"Retrying {len(pending)} sites in {RETRY_DELAY * 2 ** (attempt - 1):g} s")
+            await asyncio.sleep(RETRY_DELAY * 2 ** (attempt - 1))
+    return results
+
+
+def write_store(df, path):
+    # Write next to the store and swap it in, so an interrupted run never leaves half a file
+    tmp_path = path + '.tmp'
+    df.to_parquet(tmp_path, index=False)
+    os.replace(tmp_path, path)
+
+
+def main(args):
+    start = time.perf_counter()
+    labels = read_labels(args.labels)
+    store = load_store(args.store, args.output)
+    df, todo = diff(labels, store, args.retry_failed)
+    print(f"{len(labels)} labeled companies: {len(df) - int(todo.sum())} up to date, {int(todo.sum())} to scrape")
+
+    if todo.any():
+        page_cache = PageCache(args.cache)
+        urls = df.loc[todo, 'website_url'].tolist()
+        results = asyncio.run(scrape_with_reasons(urls, page_cache, args.retries, args.concurrency))
+        print(page_cache.summary())
+
+        now = time.time()
+        for i, url in zip(df.index[todo], urls):
+            text, error, attempts = results[url]
+            df.at[i, 'scraped_text'] = text
+            df.at[i, 'error'] = None if text else (error or NO_TEXT)
+            df.at[i, 'attempts'] = (0 if pd.isna(df.at[i, 'attempts']) else df.at[i, 'attempts']) + attempts
+            df.at[i, 'scraped_at'] = now
+
+    df['attempts'] = df['attempts'].fillna(0).astype(int)
+    df['scraped_at'] = pd.to_numeric(df['scraped_at'])
+    write_store(df[STORE_COLUMNS], args.store)
+
+    # Failures stay in the store with their reason instead of being dropped
+    failed = df[df['scraped_text'].isna()]
+    for reason, count in failed['error'].value_counts().items():
+        print(f"  {count:4d} without text: {reason}")
+
+    # The plain CSV of scraped rows, for scripts that still read it
+    df[df['scraped_text'].notna()].to_csv(args.output, columns=TEXT_COLUMNS, index=False)
+    print(f"Training set: {len(df) - len(failed)} companies with text, {len(failed)} without, "
+          f"in '{args.store}' and '{args.output}' ({time.perf_counter() - start:.1f} s)")
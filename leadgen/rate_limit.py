@@ -0,0 +1,155 @@
+import asyncio
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlsplit
+
+CAPTCHA_MARKERS = [
+    'unusual traffic from your computer network',
+    '/sorry/index',
+    'our systems have detected unusual traffic',
+    'g-recaptcha',
+    'are you a robot',
+    'verify you are human',
+]
+
+
+class CaptchaError(Exception):
+    """
+    Raised by lookups that hit a CAPTCHA page, so the result is not mistaken for "nothing found".
+    """
+
+
+def domain_of(url):
+    """
+    Rate-limit key for a URL: lowercase host (plus a non-default port) without a leading www.
+    Bare domains (e.g. 'google.com') are returned as-is.
+    """
+    if '//' not in url:
+        host = url.lower()
+    else:
+        parts = urlsplit(url)
+        host = (parts.hostname or '').lower()
+        if parts.port and parts.port not in (80, 443):
+            host = f"{host}:{parts.port}"
+    return host[4:] if host.startswith('www.') else host
+
+
+def looks_like_captcha(text):
+    if not text:
+        return False
+    text = text.lower()
+    return any(marker in text for marker in CAPTCHA_MARKERS)
+
+
+def parse_retry_after(value):
+    """
+    Retry-After is either a number of seconds or an HTTP date. Returns seconds (or None).
+    """
+    if value is None:
+        return None
+    try:
+        return max(0.0, float(value))
+    except (TypeError, ValueError):
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class _Bucket:
+    def __init__(self, rate, burst):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+
+
+class DomainRateLimiter:
+    """
+    Token bucket per domain with AIMD (additive increase, multiplicative decrease) rate control.
+    Each domain starts at `rate` requests/sec with up to `burst` back-to-back requests.
+    Every successful response adds `increase` to the domain's rate (up to max_rate);
+    a 429/503 or a CAPTCHA page multiplies it by `decrease` (down to min_rate),
+    and a Retry-After header blocks the domain for that long.
+    Callers block with wait(url) or `await wait_async(url)` and report back with feedback().
+    overrides maps a domain to its own (rate, burst, max_rate).
+    """
+
+    def __init__(self, rate=2.0, burst=3, min_rate=0.05, max_rate=10.0,
+                 increase=0.1, decrease=0.5, overrides=None):
+        self.rate = rate
+        self.burst = burst
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.increase = increase
+        self.decrease = decrease
+        self.overrides = {domain_of(d): v for d, v in (overrides or {}).items()}
+        self.stats = {'requests': 0, 'throttled': 0, 'waited': 0.0}
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def _bucket(self, domain):
+        bucket = self._buckets.get(domain)
+        if bucket is None:
+            rate, burst, _ = self.overrides.get(domain, (self.rate, self.burst, self.max_rate))
+            bucket = self._buckets[domain] = _Bucket(rate, burst)
+        return bucket
+
+    def _max_rate(self, domain):
+        return self.overrides.get(domain, (None, None, self.max_rate))[2]
+
+    def reserve(self, url):
+        """
+        Take a token for this domain and return how long the caller must wait before using it.
+        """
+        domain = domain_of(url)
+        with self._lock:
+            bucket = self._bucket(domain)
+            now = time.monotonic()
+            bucket.tokens = min(bucket.burst, bucket.tokens + (now - bucket.updated) * bucket.rate)
+            bucket.updated = now
+            bucket.tokens -= 1
+            delay = 0.0 if bucket.tokens >= 0 else -bucket.tokens / bucket.rate
+            delay = max(delay, bucket.blocked_until - now)
+            self.stats['requests'] += 1
+            self.stats['waited'] += delay
+            return delay
+
+    def wait(self, url):
+        delay = self.reserve(url)
+        if delay > 0:
+            time.sleep(delay)
+        return delay
+
+    async def wait_async(self, url):
+        delay = self.reserve(url)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        return delay
+
+    def feedback(self, url, status=200, retry_after=None, captcha=False):
+        """
+        Report the outcome of a request so the domain's rate can adapt.
+        Returns True when the response was a throttle signal.
+        """
+        domain = domain_of(url)
+        throttled = captcha or status in (429, 503)
+        with self._lock:
+            bucket = self._bucket(domain)
+            if throttled:
+                self.stats['throttled'] += 1
+                bucket.rate = max(self.min_rate, bucket.rate * self.decrease)
+                bucket.tokens = min(bucket.tokens, 0)
+                pause = parse_retry_after(retry_after)
+                if pause:
+                    bucket.blocked_until = max(bucket.blocked_until, time.monotonic() + pause)
+            elif 200 <= status < 400:
+                bucket.rate = min(self._max_rate(domain), bucket.rate + self.increase)
+        return throttled
+
+    def current_rate(self, url):
+        with self._lock:
+            return self._bucket(domain_of(url)).rate
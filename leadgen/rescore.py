@@ -0,0 +1,127 @@
+"""
+`rescore`: re-apply a retrained model to the texts already stored in the journal and re-rank,
+without crawling or any browser lookups.
+
+Every relevance score is recorded with the version of the model that produced it, so only rows
+scored by another version are recomputed. TF-IDF rows are cached per vectorizer version, so when
+only the classifier was retrained nothing is re-vectorized.
+"""
+import glob
+import os
+import time
+
+import numpy as np
+
+from .journal import Journal
+from .models import load_model, load_vectorizer, model_version
+from .pipeline import COLUMN_TYPES, COLUMNS, RULE_VERSION, result_row
+from .streaming import ResultWriter, external_sort, partial_path_for
+from .text import detect_acquisition, preprocess_text
+
+
+class TfidfCache:
+    """
+    TF-IDF rows of stored texts (keyed by text hash) for one vectorizer version, saved as a sparse
+    .npz matrix plus a .npy array of hashes. Caches for older vectorizer versions are deleted.
+    """
+
+    def __init__(self, directory='tfidf_cache', vectorizer_version=''):
+        self.directory = directory
+        self.version = vectorizer_version
+        self.matrix = None
+        self.index = {}
+        self.stats = {'reused': 0, 'transformed': 0}
+        matrix_path, keys_path = self._paths()
+        if os.path.exists(matrix_path) and os.path.exists(keys_path):
+            import scipy.sparse
+
+            self.matrix = scipy.sparse.load_npz(matrix_path).tocsr()
+            self.index = {h: i for i, h in enumerate(np.load(keys_path))}
+
+    def _paths(self):
+        base = os.path.join(self.directory, self.version)
+        return base + '.npz', base + '.keys.npy'
+
+    def rows(self, hashes, vectorizer, load_text):
+        """
+        TF-IDF matrix with one row per hash, transforming (and caching) only the texts not seen before.
+        """
+        import scipy.sparse
+
+        missing = list(dict.fromkeys(h for h in hashes if h not in self.index))
+        self.stats['reused'] += len(hashes) - len(missing)
+        self.stats['transformed'] += len(missing)
+        if missing:
+            X_new = vectorizer.transform([preprocess_text(load_text(h) or '') for h in missing])
+            self.matrix = X_new.tocsr() if self.matrix is None else scipy.sparse.vstack([self.matrix, X_new]).tocsr()
+            start = len(self.index)
+            self.index.update((h, start + i) for i, h in enumerate(missing))
+            self.save()
+        return self.matrix[[self.index[h] for h in hashes]]
+
+    def save(self):
+        import scipy.sparse
+
+        os.makedirs(self.directory, exist_ok=True)
+        matrix_path, keys_path = self._paths()
+        for path in glob.glob(os.path.join(self.directory, '*.npz')) + glob.glob(os.path.join(self.directory, '*.keys.npy')):
+            if path not in (matrix_path, keys_path):
+                os.remove(path)
+        scipy.sparse.save_npz(matrix_path, self.matrix)
+        keys = sorted(self.index, key=self.index.get)
+        np.save(keys_path, np.array(keys, dtype='U40'))
+
+
+def rescore(journal, cache_dir='tfidf_cache', force=False):
+    """
+    Re-score every stored text whose score came from another model version. Returns the number rescored.
+    """
+    version = model_version()
+    rows = journal.table()
+    stale = [row for row in rows if row['text_hash']
+             and row['relevance_version'] != RULE_VERSION
+             and (force or row['relevance_version'] != version)]
+    if not stale:
+        return 0
+
+    # Rows scored before versions were recorded may be acquisitions that a rule set to 0
+    rules = {}
+    for row in stale:
+        if row['relevance_version'] is None and detect_acquisition(journal.load_text(row['text_hash']) or ''):
+            rules[row['company_name']] = 0
+    stale = [row for row in stale if row['company_name'] not in rules]
+    journal.record_many('relevance', rules)
+    journal.record_many('relevance_version', dict.fromkeys(rules, RULE_VERSION))
+
+    if stale:
+        cache = TfidfCache(cache_dir, version.split(':')[0])
+        X = cache.rows([row['text_hash'] for row in stale], load_vectorizer(), journal.load_text)
+        probs = load_model().predict_proba(X)[:, 1]
+        companies = [row['company_name'] for row in stale]
+        journal.record_many('relevance', [(c, round(float(p), 2)) for c, p in zip(companies, probs)])
+        journal.record_many('relevance_version', dict.fromkeys(companies, version))
+        print(f"TF-IDF rows: {cache.stats['reused']} reused from cache, {cache.stats['transformed']} transformed")
+    return len(stale) + len(rules)
+
+
+def main(args):
+    start = time.perf_counter()
+    journal = Journal(args.journal)
+    n = rescore(journal, args.tfidf_cache, args.force)
+    print(f"Rescored {n} companies with model {model_version()}")
+
+    # Re-rank every company in the journal; companies never looked up for revenue keep final_score 0
+    partial_path = partial_path_for(args.output)
+    looked_up = journal.completed('revenue')
+    rows = journal.table()
+    missing_revenue = sum(1 for row in rows if row['company_name'] not in looked_up)
+    with ResultWriter(partial_path, COLUMNS, COLUMN_TYPES) as writer:
+        for i in range(0, len(rows), 5000):
+            writer.write([result_row(row) for row in rows[i:i + 5000]])
+    external_sort(partial_path, args.output, key='final_score', ascending=False, types=COLUMN_TYPES)
+    if os.path.exists(partial_path):
+        os.remove(partial_path)
+
+    print(f"Re-ranked {writer.rows_written} companies into '{args.output}' in {time.perf_counter() - start:.1f} s")
+    if missing_revenue:
+        print(f"{missing_revenue} companies have no revenue lookup; run `rank --resume` to look them up.")
@@ -0,0 +1,269 @@
+"""
+Website resolution backends for `rank`.
+
+A backend yields candidate URLs for a company, best first. ResolverChain tries the cheap HTTP
+backends first on a thread pool and hands only the companies they could not resolve to the
+browser backends, so a browser is started only when it is actually needed. The BAD_DOMAINS
+filter is applied by the chain, so it holds for every backend.
+"""
+import re
+import socket
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qs, quote_plus, urlsplit
+
+import requests
+
+from .crawler import HEADERS
+from .lookup_store import company_key
+from .metrics import metrics
+from .rate_limit import CaptchaError, looks_like_captcha
+from .search import BAD_DOMAINS, GOOGLE_SEARCH, is_bad_domain, search_result_links
+
+
+class Resolver:
+    """
+    Base class for website resolution backends.
+    uses_browser backends get a leased WebDriver; the others get driver=None.
+    """
+    name = 'resolver'
+    uses_browser = False
+
+    def candidates(self, company, driver=None):
+        """
+        Iterable of URLs that may be the company's website, best first (may be lazy).
+        """
+        raise NotImplementedError
+
+
+class DomainGuessResolver(Resolver):
+    """
+    Guess the domain from the company name ("Acme Heating, Inc." -> acmeheating.com, acme-heating.com)
+    and keep the guesses that resolve in DNS, answer, and look like the company's own site: its
+    first key word and at least half of its key words appear in the page title or the start of
+    the body text, and the page is not a parked or for-sale domain.
+    """
+    name = 'domain-guess'
+
+    PARKED = re.compile(r'domain (?:name )?(?:is |may be )?for sale|buy this domain|parked (?:free|domain)|'
+                        r'this domain (?:is|has|may)|hugedomains|sedo\.com|dan\.com|afternic')
+
+    def __init__(self, patterns=('https://www.{slug}.com', 'https://{slug}.com'), timeout=3, min_length=4,
+                 max_bytes=65536, text_chars=2000):
+        self.patterns = patterns
+        self.timeout = timeout
+        self.min_length = min_length  # shorter slugs are too likely to be someone else's domain
+        self.max_bytes = max_bytes  # how much of the page is read to confirm it
+        self.text_chars = text_chars  # how much of the body text is searched for the name
+
+    def key_words(self, company):
+        return [re.sub(r'[^a-z0-9]', '', w) for w in company_key(company).split()]
+
+    def slugs(self, company):
+        words = [w for w in self.key_words(company) if w]
+        slugs = [''.join(words), '-'.join(words)]
+        return [s for i, s in enumerate(slugs) if len(s) >= self.min_length and s not in slugs[:i]]
+
+    def names_company(self, html, company):
+        """
+        True if the start of the page (title and first body text) names the company.
+        """
+        import lxml.html
+
+        try:
+            doc = lxml.html.fromstring(html)
+        except Exception:  # empty or not HTML
+            return False
+        body = doc.find('body')
+        text = ' '.join([doc.findtext('.//title') or '', body.text_content()[:self.text_chars] if body is not None else ''])
+        text = ' '.join(re.sub(r'[^a-z0-9]', ' ', text.lower()).split())
+        if self.PARKED.search(text):
+            return False
+        present = set(text.split())
+        words = [w for w in self.key_words(company) if w]
+        if not words or words[0] not in present:
+            return False
+        return 2 * sum(1 for w in words if w in present) >= len(words)
+
+    def probe(self, url, company):
+        """
+        Final URL after redirects if the site is up and names the company, else None.
+        """
+        try:
+            socket.getaddrinfo(urlsplit(url).hostname, None)
+        except (socket.gaierror, UnicodeError):
+            return None
+        try:
+            with requests.get(url, headers=HEADERS, timeout=self.timeout, stream=True) as response:
+                if response.status_code >= 400:
+                    return None
+                html = b''
+                for chunk in response.iter_content(8192):
+                    html += chunk
+                    if len(html) >= self.max_bytes:
+                        break
+        except requests.RequestException:
+            return None
+        return response.url if self.names_company(html, company) else None
+
+    def candidates(self, company, driver=None):
+        for slug in self.slugs(company):
+            for pattern in self.patterns:
+                url = self.probe(pattern.format(slug=slug), company)
+                if url:
+                    yield url
+
+
+class HtmlSearchResolver(Resolver):
+    """
+    Plain-HTML search endpoint fetched with requests and parsed with lxml (no JavaScript needed).
+    Result links that go through a redirect (?uddg=<target>) are unwrapped.
+    """
+    name = 'html-search'
+
+    def __init__(self, search_url='https://html.duckduckgo.com/html/?q={query}',
+                 link_xpath="//a[contains(concat(' ', normalize-space(@class), ' '), ' result__a ')]/@href",
+                 timeout=10, limiter=None):
+        self.search_url = search_url
+        self.link_xpath = link_xpath
+        self.timeout = timeout
+        self.limiter = limiter
+
+    def candidates(self, company, driver=None):
+        import lxml.html
+
+        from . import search
+
+        limiter = self.limiter or search.search_limiter
+        url = self.search_url.format(query=quote_plus(f"{company} official website"))
+        limiter.wait(url)
+        response = requests.get(url, headers=HEADERS, timeout=self.timeout)
+        if limiter.feedback(url, response.status_code, response.headers.get('Retry-After'),
+                            captcha=looks_like_captcha(response.text)):
+            raise CaptchaError(f"Throttled by {self.name} while searching for {company}")
+        response.raise_for_status()
+
+        for href in lxml.html.fromstring(response.content).xpath(self.link_xpath):
+            target = parse_qs(urlsplit(href).query).get('uddg')
+            yield target[0] if target else href
+
+
+class SeleniumResolver(Resolver):
+    """
+    Google results in a real browser (the original get_company_website).
+    """
+    name = 'selenium'
+    uses_browser = True
+
+    def __init__(self, search_url=GOOGLE_SEARCH, limiter=None):
+        self.search_url = search_url
+        self.limiter = limiter
+
+    def candidates(self, company, driver=None):
+        return search_result_links(driver, f"{company} official website", self.search_url, self.limiter)
+
+
+RESOLVERS = {
+    'domain-guess': DomainGuessResolver,
+    'html-search': HtmlSearchResolver,
+    'selenium': SeleniumResolver,
+}
+DEFAULT_RESOLVERS = ('domain-guess', 'html-search', 'selenium')
+
+
+def make_resolvers(names=DEFAULT_RESOLVERS):
+    unknown = set(names) - set(RESOLVERS)
+    if unknown:
+        raise ValueError(f"Unknown resolvers: {', '.join(sorted(unknown))} (choose from {', '.join(RESOLVERS)})")
+    return [RESOLVERS[name]() for name in names]
+
+
+class ResolverChain:
+    """
+    Runs backends in order until one yields a URL that is not on a bad domain.
+    Cheap backends always run before browser backends. on_result(company, url, source) is called
+    as soon as a company is settled; url None means every backend came up empty.
+    """
+
+    def __init__(self, backends, bad_domains=BAD_DOMAINS, workers=8):
+        self.cheap = [b for b in backends if not b.uses_browser]
+        self.browser = [b for b in backends if b.uses_browser]
+        self.bad_domains = bad_domains
+        self.workers = workers
+        self.stats = {b.name: {'tried': 0, 'resolved': 0, 'errors': 0, 'latency': []} for b in backends}
+        self._lock = threading.Lock()
+
+    def first_good(self, backend, company, driver=None):
+        """
+        First clean candidate from one backend, or None. Errors from cheap backends count as a miss;
+        errors from browser backends propagate (a CAPTCHA must not be recorded as "no website").
+        """
+        start = time.perf_counter()
+        url, error = None, None
+        with metrics.timer(f'resolve.{backend.name}', company) as event:
+            try:
+                for candidate in backend.candidates(company, driver):
+                    if candidate and not is_bad_domain(candidate, self.bad_domains):
+                        url = candidate
+                        break
+            except Exception as e:
+                error = e
+            if error is not None:
+                event['outcome'] = 'captcha' if isinstance(error, CaptchaError) else 'error'
+            else:
+                event['outcome'] = 'resolved' if url else 'not_found'
+        with self._lock:
+            stats = self.stats[backend.name]
+            stats['tried'] += 1
+            stats['resolved'] += url is not None
+            stats['errors'] += error is not None
+            stats['latency'].append(time.perf_counter() - start)
+        if error is not None:
+            if backend.uses_browser:
+                raise error
+            print(f"{backend.name} failed for {company}: {error}")
+        return url
+
+    def _try_cheap(self, company, on_result, final):
+        for backend in self.cheap:
+            url = self.first_good(backend, company)
+            if url:
+                on_result(company, url, backend.name)
+                return True
+        if final:
+            on_result(company, None, self.cheap[-1].name)
+        return False
+
+    def _try_browser(self, company, driver, on_result):
+        for backend in self.browser:
+            url = self.first_good(backend, company, driver)
+            if url:
+                on_result(company, url, backend.name)
+                return url
+        on_result(company, None, self.browser[-1].name)
+        return None
+
+    def resolve_many(self, companies, pool, on_result):
+        """
+        Resolve every company. pool is a DriverPool; it is only used for what the cheap backends missed.
+        """
+        left = list(companies)
+        if self.cheap and left:
+            final = not self.browser
+            with ThreadPoolExecutor(self.workers) as executor:
+                settled = list(executor.map(lambda c: self._try_cheap(c, on_result, final), left))
+            left = [c for c, ok in zip(left, settled) if not ok]
+        if self.browser and left:
+            pool.map(lambda c, driver: self._try_browser(c, driver, on_result), left)
+
+    def summary(self):
+        lines = []
+        for name, stats in self.stats.items():
+            if not stats['tried']:
+                continue
+            median = statistics.median(stats['latency']) if stats['latency'] else 0
+            lines.append(f"{name}: {stats['resolved']}/{stats['tried']} resolved, {stats['errors']} errors, "
+                         f"median {1000 * median:.0f} ms")
+        return "resolvers: " + ("; ".join(lines) if lines else "nothing to resolve")
@@ -0,0 +1,111 @@
+"""
+Revenue mentions -> revenue in millions, one engine for every caller.
+
+A mention is found by the first pattern in PATTERNS that matches anywhere in the text (so "revenue
+is $12M" beats an earlier "$3M in funding"); its value may use K/M/B/bn/thousand/million/billion,
+a "USD" or "$" prefix, thousands separators, or a range ("$10-50 million", "$10M to $50M", whose
+midpoint is the revenue). A value without a unit is not a revenue: "$1,299" is a price and
+"1,200 employees" a head count.
+
+parse_revenue(text) also gives the low and high ends, a confidence and the name of the pattern.
+"""
+import re
+
+_NUM = r'\d+(?:,\d{3})*(?:\.\d+)?'
+_UNIT = r'(?:thousand|million|billion|mil|mm|bn|k|m|b)\b'
+_SEP = r'\s?(?:-|–|to)\s?\$?\s?'
+# A value needs a unit (on its last number)
+_VALUE = rf'\$?\s?{_NUM}(?:\s?{_UNIT})?(?:{_SEP}{_NUM})?\s?{_UNIT}'
+
+# (name, confidence, text that must come right before the value), in priority order
+PATTERNS = [
+    ('revenue_is', 0.9, r'revenue\s+(?:is|was|of)\s+(?:about\s+|approximately\s+|around\s+|~\s?)?'),
+    ('revenue_near', 0.7, r'revenue[^$]{0,40}?(?<![\d.,])'),
+    ('dollar', 0.5, r'\$'),
+    ('usd', 0.5, r'usd(?<!\wusd)\s?'),
+]
+RANGE_CONFIDENCE = 0.8  # multiplier for ranges
+CONTEXT_PATTERNS = ('revenue_is', 'revenue_near')  # revenue named next to the value; what ZoomInfo and Bing lookups accept
+BING_WINDOW = 100  # characters after a Bing "<company>'s revenue" that may hold its value
+
+# Millions per unit
+UNITS = {'k': 1e-3, 'thousand': 1e-3, 'm': 1.0, 'mm': 1.0, 'mil': 1.0, 'million': 1.0,
+         'b': 1e3, 'bn': 1e3, 'billion': 1e3}
+
+# One regex per pattern, run on lowercased text; each starts with a literal, so the regex engine
+# skips straight to the places it could match
+_FINDERS = [re.compile(rf'{prefix}({_VALUE})') for _, _, prefix in PATTERNS]
+_PARTS = re.compile(rf'\$?\s?(?P<lo>{_NUM})(?:\s?(?P<lo_unit>{_UNIT}))?(?:{_SEP}(?P<hi>{_NUM}))?'
+                    rf'(?:\s?(?P<hi_unit>{_UNIT}))?')
+
+# Kept for the single-pass text signals: a cheap test for "could this text mention revenue at all"
+REVENUE_CUE = r'\$\s?\d|usd\s?\$?\s?\d|revenue'
+
+
+def _to_millions(lo, lo_unit, hi, hi_unit):
+    # A range with one unit ("$10-50 million") uses it for both ends
+    lo_unit = lo_unit or hi_unit
+    low = float(lo.replace(',', '')) * UNITS[lo_unit]
+    high = float(hi.replace(',', '')) * UNITS[hi_unit or lo_unit] if hi else low
+    return low, high
+
+
+def parse_revenue(text):
+    """
+    (revenue in millions, low, high, confidence, pattern name) for one text, or None.
+    """
+    if not text:
+        return None
+    lower = text.lower()
+    for i, finder in enumerate(_FINDERS):
+        m = finder.search(lower)
+        if m:
+            break
+    else:
+        return None
+    parts = _PARTS.match(m.group(1))
+    low, high = _to_millions(*parts.group('lo', 'lo_unit', 'hi', 'hi_unit'))
+    name, confidence, _ = PATTERNS[i]
+    if parts.group('hi'):
+        confidence *= RANGE_CONFIDENCE
+    return (low + high) / 2, low, high, round(confidence, 2), name
+
+
+def revenue_millions(text, patterns=None):
+    """
+    Revenue in millions from one text, or None; with patterns, only a mention found by one of them counts.
+    """
+    parsed = parse_revenue(text)
+    if parsed is None or (patterns is not None and parsed[4] not in patterns):
+        return None
+    return parsed[0]
+
+
+def extract_revenue(text):
+    """
+    Revenue in millions from any page text (e.g. a search results page), or None.
+    """
+    return revenue_millions(text)
+
+
+def parse_zoominfo_revenue(snippet):
+    """
+    Revenue in millions from a ZoomInfo search snippet ("... revenue is $12.5 Million ..."), or None.
+    """
+    return revenue_millions(snippet, CONTEXT_PATTERNS)
+
+
+def parse_bing_revenue(text, company):
+    """
+    Revenue in millions from a Bing results page, or None. Only a value named shortly after "what is
+    revenue" or "<company>'s revenue" counts, so other companies' revenues on the page are skipped.
+    """
+    if not text or not company:
+        return None
+    lower = text.lower()
+    anchor = re.compile(rf"(?:what is|{re.escape(company.lower())}['’]s)\s+(?=revenue)")
+    for m in anchor.finditer(lower):
+        revenue = revenue_millions(lower[m.end():m.end() + BING_WINDOW], CONTEXT_PATTERNS)
+        if revenue is not None:
+            return revenue
+    return None
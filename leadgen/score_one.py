@@ -0,0 +1,25 @@
+"""
+`score-one`: scrape and score a single company website (optionally with a revenue lookup).
+"""
+from .crawler import scrape_website_with_links
+from .models import load_scorer
+from .scoring import score_texts
+
+
+def main(args):
+    scraped_text = scrape_website_with_links(args.url)
+    if scraped_text:
+        relevance_score = score_texts(*load_scorer(), [scraped_text])[0]  # Probability of relevant (1)
+        print(f"Got text for {args.company}")
+    else:
+        relevance_score = 0  # No text = irrelevant
+    print(f"Relevance: {relevance_score:.2f}")
+
+    if args.revenue:
+        # Only this path needs a browser
+        from .driver_pool import DriverPool
+        from .search import check_revenue_zoominfo
+
+        with DriverPool(size=1) as pool, pool.leased() as driver:
+            revenue_zoominfo = check_revenue_zoominfo(args.company, driver)
+        print(f"Zoominfo revenue: {revenue_zoominfo}")
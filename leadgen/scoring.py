@@ -0,0 +1,139 @@
+import queue
+import threading
+import time
+
+from .metrics import metrics
+from .text import preprocess_text
+
+
+def score_texts(model, vectorizer, texts):
+    """
+    Relevance probability for each raw scraped text.
+    One sparse-matrix transform and one predict_proba for the whole batch.
+    With vectorizer None, model is a CompactModel that scores the texts itself.
+    """
+    if len(texts) == 0:
+        return []
+    processed = [preprocess_text(t) for t in texts]
+    if vectorizer is None:
+        return model.score(processed)
+    X = vectorizer.transform(processed)
+    return model.predict_proba(X)[:, 1]
+
+
+class ScoringStage:
+    """
+    Micro-batching scorer fed from a queue.
+    Producers (e.g. crawler callbacks) call submit(key, text) as texts arrive; a background thread
+    scores them in batches of up to batch_size, flushing early once the oldest queued text has
+    waited max_latency seconds. on_scored(keys, probabilities) is called once per batch.
+    With reuse (a NearDupIndex), a text nearly identical to one already scored takes that text's
+    score without going through the model; signatures are computed on the scoring thread, so
+    submit() stays cheap for the producer.
+    """
+
+    _CLOSE = object()
+    _FLUSH = object()
+
+    def __init__(self, model, vectorizer, on_scored, batch_size=256, max_latency=0.5, reuse=None):
+        self.model = model
+        self.vectorizer = vectorizer
+        self.on_scored = on_scored
+        self.batch_size = batch_size
+        self.max_latency = max_latency
+        self.reuse = reuse
+        self.stats = {'batches': 0, 'scored': 0, 'reused': 0}
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def submit(self, key, text):
+        self._queue.put((key, text))
+
+    def flush(self):
+        """
+        Block until every text submitted so far has been scored.
+        """
+        done = threading.Event()
+        self._queue.put((self._FLUSH, done))
+        done.wait()
+
+    def close(self):
+        """
+        Score whatever is still queued and stop the worker.
+        """
+        self._queue.put(self._CLOSE)
+        self._thread.join()
+
+    def _reuse_scores(self, batch):
+        """
+        Texts of the batch that still need the model, with their signatures; the others get the
+        score of their near-duplicate through on_scored.
+        """
+        fresh, reused = [], []
+        for key, text in batch:
+            sig = self.reuse.signature(text)
+            match = self.reuse.query(sig)
+            if match is None:
+                fresh.append((key, text, sig))
+            else:
+                reused.append((key, self.reuse.values[match]))
+        if reused:
+            self.stats['reused'] += len(reused)
+            metrics.count('score_reused', len(reused))
+            self.on_scored([key for key, _ in reused], [prob for _, prob in reused])
+        return fresh
+
+    def _flush(self, batch):
+        if self.reuse is not None:
+            batch = self._reuse_scores(batch)
+        else:
+            batch = [(key, text, None) for key, text in batch]
+        if not batch:
+            return
+        keys = [key for key, _, _ in batch]
+        try:
+            with metrics.timer('score', texts=len(batch)):
+                probs = score_texts(self.model, self.vectorizer, [text for _, text, _ in batch])
+                self.on_scored(keys, probs)
+        except Exception as e:
+            print(f"Error scoring batch of {len(batch)}: {e}")
+            return
+        if self.reuse is not None:
+            for (key, _, sig), prob in zip(batch, probs):
+                self.reuse.add(key, sig, prob)
+        self.stats['batches'] += 1
+        self.stats['scored'] += len(batch)
+
+    def _run(self):
+        batch = []
+        deadline = None
+        while True:
+            timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                item = None
+            if item is self._CLOSE:
+                self._flush(batch)
+                return
+            if item is not None and item[0] is self._FLUSH:
+                self._flush(batch)
+                batch = []
+                deadline = None
+                item[1].set()
+                continue
+            if item is not None:
+                if not batch:
+                    deadline = time.monotonic() + self.max_latency
+                batch.append(item)
+            if len(batch) >= self.batch_size or (batch and time.monotonic() >= deadline):
+                self._flush(batch)
+                batch = []
+                deadline = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,138 @@
+"""
+Single-pass text signals: acquisition keywords, CA cities, CA state mentions, ZIP codes and revenue
+cues from one scan of the lowercased text (only texts with a cue go through the revenue parser,
+and only texts with a ZIP code or state mention go through the gazetteer's address parser).
+
+Keyword and city lists are compiled into a trie-shaped regex, so the whole phrase set is matched
+in one pass inside the regex engine (the Aho-Corasick idea: cost grows with the text, not with
+the number of phrases) instead of one `phrase in text` scan per phrase.
+"""
+import re
+from collections import namedtuple
+
+from . import gazetteer
+from .revenue import REVENUE_CUE, extract_revenue
+
+# City names that are mostly ordinary words in page text ("orange", "commerce", "vista")
+COMMON_WORD_CITIES = {'anderson', 'auburn', 'bell', 'carson', 'ceres', 'commerce', 'corona', 'davis',
+                      'eureka', 'exeter', 'imperial', 'needles', 'orange', 'paramount', 'patterson',
+                      'taft', 'vernon', 'vista', 'walnut', 'woodland'}
+# The original list: always counted as California, even where another state has a city of the
+# same name (Pasadena, TX); an address in the text ("Pasadena, TX 77506") still decides first
+CORE_CA_CITIES = [
+    "los angeles", "san diego", "san jose", "san francisco",
+    "oakland", "irvine", "anaheim", "pasadena", "fremont",
+    "santa clara", "santa ana", "riverside", "burbank"
+]
+# ... plus every city the gazetteer lists only in California
+CA_CITIES = sorted(set(CORE_CA_CITIES) | {c for c in gazetteer.state_cities('CA') if c not in COMMON_WORD_CITIES})
+
+ACQUISITION_KEYWORDS = ['acquired by', 'merged with', 'taken over by', 'sold to', 'now part of']
+
+# hq_state: state of the addresses in the text (see gazetteer.hq_state), None if it has none
+Signals = namedtuple('Signals', ['acquisition', 'ca_cities', 'ca_mention', 'zips', 'revenue', 'hq_state'])
+
+
+def trie_regex(phrases):
+    """
+    Regex source matching any of phrases, shaped as a trie so shared prefixes are tested once.
+    Where one phrase extends another, the longer one wins.
+    """
+    trie = {}
+    for phrase in phrases:
+        node = trie
+        for ch in phrase:
+            node = node.setdefault(ch, {})
+        node[''] = True
+
+    def build(node):
+        branches = [re.escape(ch) + build(child) for ch, child in sorted(node.items()) if ch != '']
+        if not branches:
+            return ''
+        body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        if '' in node:
+            return '(?:' + body + ')?'
+        return body
+
+    return build(trie) or '(?!)'
+
+
+def _is_word_char(ch):
+    return ch.isalnum() or ch == '_'
+
+
+class TextAnalyzer:
+    """
+    Precompiled matcher for every text signal. analyze(text) lowercases once and makes one pass.
+    Keywords match anywhere (substring semantics, like the original `keyword in text` checks);
+    cities, states and ZIP codes only as whole words. Matches do not overlap.
+    """
+
+    def __init__(self, acquisition_keywords=ACQUISITION_KEYWORDS, cities=CA_CITIES):
+        self.acquisition_keywords = {k.lower() for k in acquisition_keywords}
+        self.cities = {c.lower() for c in cities}
+        # Every branch starts with a literal or a digit, so the regex engine can skip ahead to
+        # possible first characters; the leading \b of city, state and ZIP matches is tested in analyze()
+        self._scan = re.compile(
+            r'(?P<phrase>' + trie_regex(self.acquisition_keywords | self.cities) + r')'
+            r'|(?P<state>ca(?:lifornia)?\b)'
+            r'|(?P<zip>\d{5}\b)'
+            r'|(?P<rev>' + REVENUE_CUE + r')'
+        )
+
+    def analyze(self, text):
+        if not text:
+            return Signals(False, set(), False, set(), None, None)
+        lower = text.lower()
+        acquisition = False
+        cities, zips = set(), set()
+        state = False
+        revenue_cue = False
+        for m in self._scan.finditer(lower):
+            kind = m.lastgroup
+            start, end = m.span()
+            if kind == 'phrase':
+                phrase = m.group('phrase')
+                if phrase in self.acquisition_keywords:
+                    acquisition = True
+                if phrase in self.cities and not (start and _is_word_char(lower[start - 1])) \
+                        and not (end < len(lower) and _is_word_char(lower[end])):
+                    cities.add(phrase)
+            elif kind in ('state', 'zip'):
+                if start and _is_word_char(lower[start - 1]):
+                    continue
+                if kind == 'state':
+                    state = True
+                else:
+                    zips.add(m.group('zip'))
+            else:
+                revenue_cue = True
+        # Only texts that could mention revenue go through the revenue parser (which picks the best mention),
+        # and only texts that could hold an address through the address parser
+        revenue = extract_revenue(text) if revenue_cue else None
+        hq_state = gazetteer.hq_state(text) if zips else None
+        return Signals(acquisition, cities, state, zips, revenue, hq_state)
+
+
+_default = None
+
+
+def analyze(text):
+    """
+    Signals for one text using the default keyword and city lists.
+    """
+    global _default
+    if _default is None:
+        _default = TextAnalyzer()
+    return _default.analyze(text)
+
+
+def hq_in_ca(signals):
+    """
+    check_hq_from_site's verdict from precomputed signals: the state of the text's addresses when it
+    has any, else any California cue (state mention, CA-only city or California ZIP code).
+    """
+    if signals.hq_state:
+        return signals.hq_state == 'CA'
+    return bool(signals.ca_mention or signals.ca_cities
+                or any(gazetteer.zip_state(z) == 'CA' for z in signals.zips))
@@ -0,0 +1,159 @@
+import heapq
+import os
+import tempfile
+
+import pandas as pd
+
+
+def read_companies(path, chunksize=500, column='company_name', normalize=None):
+    """
+    Yield lists of company names, chunksize rows at a time, without loading the whole file.
+    Names already seen in an earlier chunk are skipped.
+    """
+    seen = set()
+    for chunk in pd.read_csv(path, usecols=[column], chunksize=chunksize):
+        names = []
+        for name in chunk[column].dropna():
+            name = normalize(name) if normalize else name
+            if name not in seen:
+                seen.add(name)
+                names.append(name)
+        if names:
+            yield names
+
+
+def partial_path_for(output_path):
+    """
+    Where results are written before the final sort: the output path with '.partial' before its
+    extension ('ranked.csv' -> 'ranked.partial.csv', 'ranked' -> 'ranked.partial'), never the output itself.
+    """
+    root, ext = os.path.splitext(output_path)
+    return f"{root}.partial{ext}"
+
+
+def typed_frame(rows, columns, types=None):
+    """
+    DataFrame of rows with each column in `types` ({column: 'float64' or 'string'}) coerced to
+    that type, whatever the values in this particular batch happen to be (all ints, all None).
+    """
+    df = pd.DataFrame(rows, columns=columns)
+    for column, kind in (types or {}).items():
+        if kind == 'string':
+            values = df[column]
+            df[column] = values.astype(str).astype(object).where(values.notna(), None)
+        else:
+            df[column] = pd.to_numeric(df[column]).astype(kind)
+    return df
+
+
+class ResultWriter:
+    """
+    Appends result rows to a CSV or Parquet file as they are produced,
+    so partial results are on disk (and visible) while the run is still going.
+    With types ({column: 'float64' or 'string'}), every Parquet batch is written with that one
+    schema instead of one inferred from the first batch.
+    """
+
+    def __init__(self, path, columns, types=None):
+        self.path = path
+        self.columns = columns
+        self.types = types
+        self.parquet = path.endswith('.parquet')
+        self.rows_written = 0
+        self._writer = None
+        if os.path.exists(path):
+            os.remove(path)
+
+    def write(self, rows):
+        if not rows:
+            return
+        df = typed_frame(rows, self.columns, self.types)
+        if self.parquet:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+
+            schema = None
+            if self.types:
+                schema = pa.schema([(c, pa.type_for_alias(self.types.get(c, 'string'))) for c in self.columns])
+            table = pa.Table.from_pandas(df, schema=schema, preserve_index=False)
+            if self._writer is None:
+                self._writer = pq.ParquetWriter(self.path, table.schema)
+            self._writer.write_table(table.cast(self._writer.schema))
+        else:
+            df.to_csv(self.path, mode='a', header=self.rows_written == 0, index=False)
+        self.rows_written += len(df)
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def iter_chunks(path, chunksize):
+    if path.endswith('.parquet'):
+        import pyarrow.parquet as pq
+
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunksize):
+            yield batch.to_pandas()
+    else:
+        yield from pd.read_csv(path, chunksize=chunksize)
+
+
+def external_sort(in_path, out_path, key='final_score', ascending=False, chunksize=50000, types=None):
+    """
+    Sort a results file that may not fit in memory: sort chunksize rows at a time into
+    temporary run files, then k-way merge the runs into out_path (written with `types`, as in ResultWriter).
+    Ties keep their input order.
+    """
+    runs = []
+    columns = None
+    seq = 0
+    tmpdir = tempfile.mkdtemp(prefix='ranksort_')
+    try:
+        for chunk in iter_chunks(in_path, chunksize) if os.path.exists(in_path) else ():
+            columns = list(chunk.columns)
+            chunk = chunk.assign(_seq=range(seq, seq + len(chunk)))
+            seq += len(chunk)
+            chunk = chunk.sort_values([key, '_seq'], ascending=[ascending, True], kind='stable')
+            run_path = os.path.join(tmpdir, f'run{len(runs)}.csv')
+            chunk.to_csv(run_path, index=False)
+            runs.append(run_path)
+
+        if not runs:
+            empty = typed_frame([], columns or list(types or []), types)
+            empty.to_parquet(out_path) if out_path.endswith('.parquet') else empty.to_csv(out_path, index=False)
+            return 0
+
+        def rows(run_path):
+            # Each run is read back in small pieces so the merge stays bounded in memory
+            for chunk in pd.read_csv(run_path, chunksize=max(1, chunksize // len(runs))):
+                yield from chunk.itertuples(index=False, name=None)
+
+        key_pos = columns.index(key)
+        sign = 1 if ascending else -1
+
+        def sort_key(row):
+            value = row[key_pos]
+            missing = value != value  # NaN sorts last
+            return (missing, 0 if missing else sign * value, row[-1])
+
+        merged = heapq.merge(*(rows(r) for r in runs), key=sort_key)
+        with ResultWriter(out_path, columns, types) as writer:
+            batch = []
+            for row in merged:
+                batch.append(row[:-1])
+                if len(batch) >= chunksize:
+                    writer.write(batch)
+                    batch = []
+            writer.write(batch)
+        return seq
+    finally:
+        for run_path in runs:
+            os.remove(run_path)
+        os.rmdir(tmpdir)
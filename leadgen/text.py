@@ -0,0 +1,29 @@
+import re
+
+from .signals import ACQUISITION_KEYWORDS, CA_CITIES, analyze, hq_in_ca  # noqa: F401
+
+_NON_ALPHA = re.compile(r'[^a-zA-Z\s]')
+_SPACES = re.compile(r"\s+")
+
+
+# Function to preprocess text (same as training)
+def preprocess_text(text):
+    return _NON_ALPHA.sub('', text.lower())
+
+
+def normalize_company(name):
+    name = name.replace("+", " ")
+    name = name.replace("&", " and ")
+    name = _SPACES.sub(" ", name)
+    return name.strip()
+
+
+def detect_acquisition(text):
+    return 1 if analyze(text).acquisition else 0
+
+
+# Function to check HQ via website (address state from the gazetteer, else CA state, city or ZIP cues, from one scan)
+def check_hq_from_site(text):
+    if not text:
+        return None
+    return hq_in_ca(analyze(text))
@@ -0,0 +1,134 @@
+"""
+`train`: fit the TF-IDF + logistic regression relevance model on the scraped training set.
+
+The vectorizer and classifier form one sklearn Pipeline whose fitted TF-IDF steps are memoized
+on disk, so every candidate in the parameter search that shares vectorizer settings (and the
+final CV pass) reuses the same fitted vectorizer per fold. The search runs on all cores.
+"""
+import json
+import os
+import time
+
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.linear_model import LogisticRegression
+from sklearn.metrics import accuracy_score, classification_report
+from sklearn.model_selection import GridSearchCV, StratifiedKFold, cross_validate
+from sklearn.pipeline import Pipeline
+
+from .compact_model import export_compact
+from .models import COMPACT_PATH, MODEL_PATH, VECTORIZER_PATH, model_version
+from .near_dup import near_duplicates
+from .text import preprocess_text
+
+DATA_PATHS = ['training_set.parquet', 'labeled_companies_with_text.csv']  # first one that exists
+
+
+def parse_values(text, cast):
+    return [None if v.strip().lower() == 'none' else cast(v) for v in text.split(',')]
+
+
+def make_search(pipeline, grid, cv, method, jobs):
+    if method == 'halving':
+        from sklearn.experimental import enable_halving_search_cv  # noqa: F401
+        from sklearn.model_selection import HalvingGridSearchCV
+
+        return HalvingGridSearchCV(pipeline, grid, cv=cv, scoring='accuracy', n_jobs=jobs, factor=3,
+                                   refit=False, random_state=42)
+    # No refit: the final model is fitted once, after the CV pass below
+    return GridSearchCV(pipeline, grid, cv=cv, scoring='accuracy', n_jobs=jobs, refit=False)
+
+
+def main(args):
+    timings = {}
+    start = time.perf_counter()
+
+    # Load the training set: the `prep` store, or a CSV
+    data = args.data or next((p for p in DATA_PATHS if os.path.exists(p)), DATA_PATHS[-1])
+    df = pd.read_parquet(data) if data.endswith('.parquet') else pd.read_csv(data)
+    print(f"Training on '{data}'")
+
+    # Filter out rows with no scraped_text
+    df = df[df['scraped_text'].notna() & (df['scraped_text'] != '')]
+
+    # Drop near-duplicate rows (template sites, franchise locations) that would only repeat a label
+    duplicates = 0
+    if args.near_dup:
+        matches = near_duplicates(df['scraped_text'].tolist(), args.near_dup, df['label_relevance'].tolist())
+        duplicates = sum(1 for m in matches if m >= 0)
+        df = df[[m < 0 for m in matches]]
+        print(f"Dropped {duplicates} near-duplicate rows; {len(df)} left")
+
+    # Preprocess text: lowercase, remove non-alphabetic chars, etc.
+    X = df['scraped_text'].apply(preprocess_text).to_numpy()
+    y = df['label_relevance'].to_numpy()  # 1 or 0
+    timings['load'] = time.perf_counter() - start
+
+    # Features: TF-IDF vectorization, then Logistic Regression; fitted vectorizers are cached per fold
+    pipeline = Pipeline([
+        ('tfidf', TfidfVectorizer(max_features=1000, stop_words='english')),
+        ('clf', LogisticRegression()),
+    ], memory=joblib.Memory(args.cache_dir, verbose=0))
+    cv = StratifiedKFold(n_splits=5)
+
+    search = None
+    if args.search != 'none':
+        grid = {
+            'tfidf__max_features': parse_values(args.max_features, int),
+            'clf__C': parse_values(args.C, float),
+        }
+        t = time.perf_counter()
+        search = make_search(pipeline, grid, cv, args.search, args.jobs).fit(X, y)
+        timings['search'] = time.perf_counter() - t
+        pipeline.set_params(**search.best_params_)
+        print(f"Best parameters: {search.best_params_} (CV accuracy {search.best_score_:.3f})")
+
+    # One cross-validation pass gives both the fold scores and the out-of-fold predictions
+    t = time.perf_counter()
+    cv_result = cross_validate(pipeline, X, y, cv=cv, scoring='accuracy', n_jobs=args.jobs,
+                               return_estimator=True, return_indices=True)
+    y_pred_cv = np.empty_like(y)
+    for estimator, test_index in zip(cv_result['estimator'], cv_result['indices']['test']):
+        y_pred_cv[test_index] = estimator.predict(X[test_index])
+    cv_scores = cv_result['test_score']
+    timings['cv'] = time.perf_counter() - t
+    print(f"Cross-Validation Accuracy Scores: {cv_scores}")
+    print(f"Mean CV Accuracy: {cv_scores.mean():.3f} (+/- {cv_scores.std() * 2:.3f})")
+    print("Cross-Validation Report:\n", classification_report(y, y_pred_cv))
+
+    # Now train on full data and save (for use in pipeline)
+    t = time.perf_counter()
+    pipeline.fit(X, y)
+    timings['refit'] = time.perf_counter() - t
+    vectorizer, model = pipeline.named_steps['tfidf'], pipeline.named_steps['clf']
+    joblib.dump(model, MODEL_PATH)
+    joblib.dump(vectorizer, VECTORIZER_PATH)
+    export_compact(vectorizer, model, COMPACT_PATH, model_version())  # mmap-able copy used for scoring
+    timings['total'] = time.perf_counter() - start
+
+    print(f"\nTraining time ({len(y)} rows, n_jobs={args.jobs}):")
+    for phase, seconds in timings.items():
+        print(f"  {phase:<8} {seconds:8.2f} s")
+
+    report = {
+        'data': data,
+        'rows': int(len(y)),
+        'near_duplicates_dropped': duplicates,
+        'n_jobs': args.jobs,
+        'search': args.search,
+        'params': {k: pipeline.get_params()[k] for k in ('tfidf__max_features', 'clf__C')},
+        'cv_scores': cv_scores.tolist(),
+        'oof_accuracy': accuracy_score(y, y_pred_cv),
+        'timings': timings,
+    }
+    if search is not None:
+        results = search.cv_results_
+        report['candidates'] = [
+            {'params': params, 'mean_score': float(score), 'mean_fit_time': float(fit)}
+            for params, score, fit in zip(results['params'], results['mean_test_score'], results['mean_fit_time'])
+        ]
+    with open(args.report, 'w') as f:
+        json.dump(report, f, indent=2, default=str)
+    print(f"Timing report written to '{args.report}'")
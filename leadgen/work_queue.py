@@ -0,0 +1,326 @@
+"""
+Coordinator/worker mode for `rank`: `coordinate` shards the input into tasks on a queue and ranks
+the results once they are in; any number of `worker` processes lease tasks, run every stage for
+their companies and report the result rows back.
+
+The queue is a SQLite file (WAL, one short IMMEDIATE transaction per operation), which is safe for
+any number of worker processes on one machine, or on machines sharing a disk with working file
+locks. A task is leased for lease_seconds and the worker's heartbeat thread keeps extending the
+lease while it works; if the worker dies, the lease runs out and another worker picks the task
+up again, up to max_attempts times. A worker that lost its lease cannot report: whoever holds it
+now owns the result.
+"""
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+from collections import namedtuple
+from contextlib import contextmanager
+
+from .pipeline import COLUMN_TYPES, COLUMNS, run_from_args
+from .streaming import ResultWriter, external_sort, partial_path_for, read_companies
+from .text import normalize_company
+
+Task = namedtuple('Task', ['id', 'companies', 'attempts'])
+
+
+class WorkQueue:
+    """
+    SQLite task queue: tasks (lists of company names) go pending -> leased -> done, or back to
+    pending on failure / lease expiry, or to failed once max_attempts are used up.
+    """
+
+    def __init__(self, path='work_queue.sqlite', lease_seconds=300, max_attempts=3):
+        self.path = path
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(path, timeout=60, isolation_level=None, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS tasks (
+                id INTEGER PRIMARY KEY,
+                companies TEXT NOT NULL,
+                state TEXT NOT NULL DEFAULT 'pending',
+                attempts INTEGER NOT NULL DEFAULT 0,
+                worker TEXT,
+                lease_expires REAL,
+                error TEXT,
+                updated_at REAL
+            );
+            CREATE INDEX IF NOT EXISTS tasks_state ON tasks(state, lease_expires);
+            CREATE TABLE IF NOT EXISTS results (
+                company_name TEXT PRIMARY KEY,
+                task_id INTEGER NOT NULL,
+                row TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS workers (
+                worker TEXT PRIMARY KEY,
+                seen_at REAL NOT NULL,
+                tasks_done INTEGER NOT NULL DEFAULT 0
+            );
+        """)
+
+    def close(self):
+        self.conn.close()
+
+    @contextmanager
+    def _transaction(self):
+        # IMMEDIATE takes the write lock up front, so two workers can never lease the same task
+        with self._lock:
+            self.conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield self.conn
+            except BaseException:
+                self.conn.execute("ROLLBACK")
+                raise
+            self.conn.execute("COMMIT")
+
+    def enqueue(self, batches):
+        """
+        Add one task per list of company names. Returns the number of tasks added.
+        """
+        now = time.time()
+        with self._transaction() as conn:
+            n = conn.execute("SELECT COUNT(*) FROM tasks").fetchone()[0]
+            conn.executemany("INSERT INTO tasks (companies, updated_at) VALUES (?, ?)",
+                             ((json.dumps(batch), now) for batch in batches))
+            return conn.execute("SELECT COUNT(*) FROM tasks").fetchone()[0] - n
+
+    def lease(self, worker):
+        """
+        Lease the oldest pending task (or one whose lease expired) to worker; None if there is none.
+        """
+        now = time.time()
+        with self._transaction() as conn:
+            # Tasks whose last attempt died with the lease still out are given up on
+            conn.execute("UPDATE tasks SET state = 'failed', error = COALESCE(error, 'lease expired'), updated_at = ? "
+                         "WHERE state = 'leased' AND lease_expires < ? AND attempts >= ?",
+                         (now, now, self.max_attempts))
+            row = conn.execute("SELECT id, companies, attempts FROM tasks "
+                               "WHERE state = 'pending' OR (state = 'leased' AND lease_expires < ?) "
+                               "ORDER BY id LIMIT 1", (now,)).fetchone()
+            if row is None:
+                return None
+            conn.execute("UPDATE tasks SET state = 'leased', worker = ?, lease_expires = ?, attempts = attempts + 1, "
+                         "updated_at = ? WHERE id = ?", (worker, now + self.lease_seconds, now, row[0]))
+            self._seen(conn, worker, now)
+        return Task(row[0], json.loads(row[1]), row[2] + 1)
+
+    def heartbeat(self, task_id, worker):
+        """
+        Extend the lease. False if worker no longer holds it (it expired and was leased again).
+        """
+        now = time.time()
+        with self._transaction() as conn:
+            extended = conn.execute("UPDATE tasks SET lease_expires = ?, updated_at = ? "
+                                    "WHERE id = ? AND worker = ? AND state = 'leased'",
+                                    (now + self.lease_seconds, now, task_id, worker)).rowcount == 1
+            self._seen(conn, worker, now)
+        return extended
+
+    def complete(self, task_id, worker, rows):
+        """
+        Store the task's result rows and mark it done. False (and nothing stored) if worker lost the lease.
+        """
+        now = time.time()
+        with self._transaction() as conn:
+            if not self._holds(conn, task_id, worker):
+                return False
+            conn.executemany("INSERT OR REPLACE INTO results (company_name, task_id, row) VALUES (?, ?, ?)",
+                             ((row['company_name'], task_id, json.dumps(row, default=str)) for row in rows))
+            conn.execute("UPDATE tasks SET state = 'done', lease_expires = NULL, error = NULL, updated_at = ? "
+                         "WHERE id = ?", (now, task_id))
+            self._seen(conn, worker, now, done=1)
+        return True
+
+    def fail(self, task_id, worker, error):
+        """
+        Give the task back: pending again while it has attempts left, else failed.
+        """
+        now = time.time()
+        with self._transaction() as conn:
+            if not self._holds(conn, task_id, worker):
+                return False
+            conn.execute("UPDATE tasks SET state = CASE WHEN attempts < ? THEN 'pending' ELSE 'failed' END, "
+                         "worker = NULL, lease_expires = NULL, error = ?, updated_at = ? WHERE id = ?",
+                         (self.max_attempts, str(error)[:1000], now, task_id))
+        return True
+
+    @staticmethod
+    def _holds(conn, task_id, worker):
+        row = conn.execute("SELECT worker, state FROM tasks WHERE id = ?", (task_id,)).fetchone()
+        return row is not None and row[0] == worker and row[1] == 'leased'
+
+    @staticmethod
+    def _seen(conn, worker, now, done=0):
+        conn.execute("INSERT INTO workers (worker, seen_at, tasks_done) VALUES (?, ?, ?) "
+                     "ON CONFLICT(worker) DO UPDATE SET seen_at = excluded.seen_at, "
+                     "tasks_done = tasks_done + excluded.tasks_done", (worker, now, done))
+
+    def _read(self, sql, params=()):
+        with self._lock:
+            return self.conn.execute(sql, params).fetchall()
+
+    def counts(self):
+        counts = dict.fromkeys(('pending', 'leased', 'done', 'failed'), 0)
+        counts.update(self._read("SELECT state, COUNT(*) FROM tasks GROUP BY state"))
+        return counts
+
+    def finished(self):
+        counts = self.counts()
+        return counts['pending'] == 0 and counts['leased'] == 0
+
+    def workers(self, active_within=None):
+        """
+        (worker, seconds since last seen, tasks done) for every worker, most recently seen first.
+        """
+        now = time.time()
+        rows = self._read("SELECT worker, seen_at, tasks_done FROM workers ORDER BY seen_at DESC")
+        return [(w, now - seen, done) for w, seen, done in rows if active_within is None or now - seen <= active_within]
+
+    def failures(self):
+        return self._read("SELECT id, attempts, error FROM tasks WHERE state = 'failed' ORDER BY id")
+
+    def results(self, batch=5000):
+        """
+        Yield lists of result rows (dicts), batch at a time.
+        """
+        cursor = self.conn.execute("SELECT row FROM results ORDER BY rowid")
+        while True:
+            rows = cursor.fetchmany(batch)
+            if not rows:
+                return
+            yield [json.loads(row) for row, in rows]
+
+    def summary(self):
+        counts = self.counts()
+        return (f"queue: {counts['done']} done, {counts['leased']} leased, {counts['pending']} pending, "
+                f"{counts['failed']} failed tasks; {self._read('SELECT COUNT(*) FROM results')[0][0]} "
+                f"companies reported by {len(self.workers())} workers")
+
+
+class Heartbeat:
+    """
+    Background thread that extends a task's lease every `every` seconds while the task runs.
+    """
+
+    def __init__(self, queue, task, worker, every):
+        self.queue = queue
+        self.task = task
+        self.worker = worker
+        self.every = every
+        self.lost = False
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        while not self._stop.wait(self.every):
+            try:
+                if not self.queue.heartbeat(self.task.id, self.worker):
+                    self.lost = True
+                    return
+            except sqlite3.Error as e:
+                print(f"Heartbeat for task {self.task.id} failed: {e}")
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+
+
+def default_worker_id():
+    return f"{socket.gethostname()}-{os.getpid()}"
+
+
+def run_worker(queue, run, worker, poll=5.0, max_tasks=None):
+    """
+    Lease and process tasks with a started RankRun until the queue is finished (tasks leased by other
+    workers may still come back if those workers die, so this polls until they are done or failed).
+    Returns the number of tasks completed.
+    """
+    completed = 0
+    while max_tasks is None or completed < max_tasks:
+        task = queue.lease(worker)
+        if task is None:
+            if queue.finished():
+                break
+            time.sleep(poll)
+            continue
+
+        with Heartbeat(queue, task, worker, max(1.0, queue.lease_seconds / 3)) as heartbeat:
+            try:
+                rows = run.process_chunk(task.companies)
+            except Exception as e:
+                print(f"Task {task.id} failed on attempt {task.attempts}: {e!r}")
+                queue.fail(task.id, worker, repr(e))
+                continue
+        if heartbeat.lost or not queue.complete(task.id, worker, rows):
+            print(f"Lost the lease on task {task.id}; its results are discarded")
+            continue
+        completed += 1
+        print(f"Task {task.id} done ({len(task.companies)} companies, attempt {task.attempts})")
+    return completed
+
+
+def collect(queue, output_path):
+    """
+    Rank every reported result row into output_path. Returns the number of companies written.
+    """
+    partial_path = partial_path_for(output_path)
+    with ResultWriter(partial_path, COLUMNS, COLUMN_TYPES) as writer:
+        for rows in queue.results():
+            writer.write(rows)
+    external_sort(partial_path, output_path, key='final_score', ascending=False, types=COLUMN_TYPES)
+    if os.path.exists(partial_path):
+        os.remove(partial_path)
+    return writer.rows_written
+
+
+def coordinate(args):
+    if args.reset:
+        for suffix in ('', '-wal', '-shm'):
+            if os.path.exists(args.queue + suffix):
+                os.remove(args.queue + suffix)
+    queue = WorkQueue(args.queue, args.lease, args.max_attempts)
+    if sum(queue.counts().values()):
+        print(f"Queue '{args.queue}' already has tasks; continuing it (--reset to start over)")
+    else:
+        n = queue.enqueue(read_companies(args.input, args.task_size, normalize=normalize_company))
+        print(f"Queued {n} tasks of up to {args.task_size} companies from '{args.input}'")
+
+    if not args.wait:
+        return
+    while not queue.finished():
+        time.sleep(args.poll)
+        active = queue.workers(active_within=queue.lease_seconds)
+        print(f"{queue.summary()}; {len(active)} active")
+    print(queue.summary())
+    for task_id, attempts, error in queue.failures():
+        print(f"task {task_id} failed after {attempts} attempts: {error}")
+    n = collect(queue, args.output)
+    print(f"Ranked {n} companies into '{args.output}'")
+
+
+def work(args):
+    worker = args.worker_id or default_worker_id()
+    queue = WorkQueue(args.queue, args.lease, args.max_attempts)
+    # Each worker keeps its own journal, so a task it retries resumes where it left off
+    run = run_from_args(args, args.journal or f"worker_journal_{worker}.sqlite", resume=True)
+    run.start()
+    try:
+        n = run_worker(queue, run, worker, args.poll, args.max_tasks)
+    finally:
+        run.stop()
+    run.finish()
+    print(f"Worker {worker} completed {n} tasks. {queue.summary()}")
+
+
+def main(args):
+    return coordinate(args) if args.command == 'coordinate' else work(args)
@@ -0,0 +1,59 @@
+"""
+Cold-start benchmark for the leadgen CLI.
+
+For each subcommand, times `python -m leadgen <command> --help` and the import of the command's
+module in a fresh interpreter, and lists which heavy libraries that import pulls in.
+
+Usage: python testing/bench_cold_start.py [--repeat 5]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+from leadgen.cli import COMMANDS
+
+HEAVY = ['selenium', 'sklearn', 'geopy', 'joblib', 'pandas', 'aiohttp', 'lxml', 'bs4']
+
+PROBE = """
+import sys, time, json
+t = time.perf_counter()
+import importlib; importlib.import_module(sys.argv[1])
+elapsed = time.perf_counter() - t
+print(json.dumps({'import_s': elapsed, 'loaded': [m for m in sys.argv[2:] if m in sys.modules]}))
+"""
+
+
+def run_help(command):
+    t = time.perf_counter()
+    subprocess.run([sys.executable, '-m', 'leadgen', command, '--help'], cwd=ROOT,
+                   stdout=subprocess.DEVNULL, check=True)
+    return time.perf_counter() - t
+
+
+def probe_import(module):
+    out = subprocess.run([sys.executable, '-c', PROBE, module, *HEAVY], cwd=ROOT,
+                         capture_output=True, text=True, check=True).stdout
+    return json.loads(out)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'command':<10} {'--help (s)':>10} {'import (s)':>10}  heavy modules loaded")
+    for command, module in COMMANDS.items():
+        help_s = statistics.median(run_help(command) for _ in range(args.repeat))
+        probes = [probe_import(module) for _ in range(args.repeat)]
+        import_s = statistics.median(p['import_s'] for p in probes)
+        print(f"{command:<10} {help_s:>10.3f} {import_s:>10.3f}  {', '.join(probes[0]['loaded']) or '-'}")
+
+
+if __name__ == '__main__':
+    main()
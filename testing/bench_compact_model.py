@@ -0,0 +1,57 @@
+"""
+Benchmark + equivalence check: pickled sklearn model vs the compact mmap artifact.
+
+    python testing/bench_compact_model.py --data labeled_companies_with_text.csv --repeat 20
+
+Reports cold load time (fresh interpreter, including imports), scoring throughput on the
+scraped texts and the largest difference from predict_proba. Run from the directory that holds
+relevance_model.pkl, vectorizer.pkl and relevance_model/ (python -m leadgen export-model).
+"""
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+from leadgen.compact_model import CompactModel, verify
+from leadgen.models import load_model, load_vectorizer
+from leadgen.scoring import score_texts
+
+LOAD = {
+    'pickle': "from leadgen.models import load_model, load_vectorizer; load_model(); load_vectorizer()",
+    'compact': "from leadgen.compact_model import CompactModel; CompactModel()",
+}
+
+
+def cold_load(code):
+    t = time.perf_counter()
+    subprocess.run([sys.executable, '-c', f"import sys; sys.path.insert(0, {ROOT!r}); {code}"], check=True)
+    return time.perf_counter() - t
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--data', default='labeled_companies_with_text.csv')
+    parser.add_argument('--repeat', type=int, default=20, help="copies of the texts to score")
+    args = parser.parse_args()
+
+    for name, code in LOAD.items():
+        print(f"cold load {name:<8} {min(cold_load(code) for _ in range(3)):.3f} s")
+
+    texts = pd.read_csv(args.data)['scraped_text'].dropna().astype(str).tolist()
+    model, vectorizer, compact = load_model(), load_vectorizer(), CompactModel()
+    batch = texts * args.repeat
+    for name, (m, v) in {'pickle': (model, vectorizer), 'compact': (compact, None)}.items():
+        t = time.perf_counter()
+        score_texts(m, v, batch)
+        elapsed = time.perf_counter() - t
+        print(f"score {name:<8} {len(batch) / elapsed:8.0f} docs/s")
+    print(f"max abs difference from predict_proba: {verify(compact, vectorizer, model, texts):.2e}")
+
+
+if __name__ == '__main__':
+    main()
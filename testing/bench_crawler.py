@@ -0,0 +1,139 @@
+"""
+Benchmark: serial requests loop vs the concurrent crawler, against local HTTP servers.
+
+    python testing/bench_crawler.py --companies 200 --latency 0.05 --concurrency 8 32 64
+
+Each company gets a tiny site (home page + /services + /products) served with an
+artificial per-request latency, spread across several ports so the per-host limit
+behaves like it would against independent company sites.
+"""
+import argparse
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urljoin
+
+import requests
+from bs4 import BeautifulSoup
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from leadgen.crawler import HEADERS, scrape_many
+from leadgen.rate_limit import DomainRateLimiter
+
+FILLER = "We provide commercial HVAC installation, electrical service and refrigeration repair. " * 20
+
+
+def make_handler(latency):
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            time.sleep(latency)
+            company = self.path.strip('/').split('/')[0]
+            body = (
+                f"<html><head><title>{company}</title></head><body>"
+                f"<nav><a href='/{company}/about'>About</a></nav>"
+                f"<h1>{company}</h1><p>{FILLER}</p>"
+                f"<a href='/{company}/services'>Services</a> <a href='/{company}/products'>Products</a>"
+                "</body></html>"
+            ).encode()
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/html; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    return Handler
+
+
+def start_servers(n_hosts, latency):
+    servers = []
+    for _ in range(n_hosts):
+        server = ThreadingHTTPServer(('127.0.0.1', 0), make_handler(latency))
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+    return servers
+
+
+def serial_scrape(url, max_pages=3):
+    # The original blocking loop, kept here as the baseline
+    scraped_texts = []
+    visited = set()
+    try:
+        queue = [url]
+        while queue and len(visited) < max_pages:
+            current_url = queue.pop(0)
+            if current_url in visited:
+                continue
+            visited.add(current_url)
+            response = requests.get(current_url, headers=HEADERS, timeout=10)
+            response.raise_for_status()
+            soup = BeautifulSoup(response.text, 'html.parser')
+            for tag in soup(["script", "style", "nav", "header", "footer"]):
+                tag.decompose()
+            text = soup.get_text(separator=' ', strip=True)
+            text = ' '.join(text.split())[:3000]
+            if len(text) > 100:
+                scraped_texts.append(text)
+            for a in soup.find_all('a', href=True):
+                href = a['href']
+                full_url = urljoin(url, href)
+                if url in full_url and any(k in href.lower() for k in ['service', 'product', 'solution']):
+                    queue.append(full_url)
+        return ' '.join(scraped_texts) if scraped_texts else None
+    except Exception as e:
+        print(f"Error scraping {url}: {e}")
+        return None
+
+
+def report(label, n, seconds):
+    print(f"{label:<28} {n:>6} companies  {seconds:8.2f} s  {n / seconds * 60:10.1f} companies/min")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--companies', type=int, default=200)
+    parser.add_argument('--hosts', type=int, default=25)
+    parser.add_argument('--latency', type=float, default=0.05, help='seconds of server delay per request')
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[8, 32, 64])
+    parser.add_argument('--per-host', type=int, default=2)
+    parser.add_argument('--host-rate', type=float, default=50.0,
+                        help='requests/sec allowed per local host (each one stands in for several company domains)')
+    parser.add_argument('--serial-sleep', type=float, default=0.0,
+                        help='sleep after each company in the serial loop (data_prep.py used 2 s)')
+    parser.add_argument('--skip-serial', action='store_true')
+    args = parser.parse_args()
+
+    servers = start_servers(args.hosts, args.latency)
+    urls = [
+        f"http://127.0.0.1:{servers[i % len(servers)].server_address[1]}/company{i}"
+        for i in range(args.companies)
+    ]
+
+    reference = None
+    if not args.skip_serial:
+        start = time.perf_counter()
+        reference = []
+        for url in urls:
+            reference.append(serial_scrape(url))
+            time.sleep(args.serial_sleep)
+        report('serial', len(urls), time.perf_counter() - start)
+
+    for concurrency in args.concurrency:
+        start = time.perf_counter()
+        limiter = DomainRateLimiter(rate=args.host_rate, burst=args.per_host * 2, max_rate=args.host_rate)
+        texts = scrape_many(urls, concurrency=concurrency, per_host=args.per_host, limiter=limiter)
+        report(f'async concurrency={concurrency}', len(urls), time.perf_counter() - start)
+        if reference is not None and texts != reference:
+            print('  warning: crawler output differs from the serial loop')
+
+    for server in servers:
+        server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,75 @@
+"""
+Micro-benchmark: pages/sec for each HTML parser backend, then process-pool scaling.
+
+    python testing/bench_extraction.py --pages 2000 --size 60
+
+--size is the approximate page size in KB. Pages are synthetic company pages with
+nav/header/footer blocks, inline scripts and styles, and a few hundred links.
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from leadgen.extraction import BACKENDS, ExtractionPool, extract_page
+
+WORDS = ("commercial hvac installation electrical service refrigeration repair maintenance "
+         "contractor licensed california san diego industrial controls building automation "
+         "chiller boiler rooftop unit ductwork energy efficient retrofit emergency").split()
+
+
+def make_page(i, size_kb, rng):
+    blocks = [
+        "<html><head><title>Company %d</title><style>body{font-family:sans-serif}</style>"
+        "<script>var tracking = {id: %d};</script></head><body>" % (i, i),
+        "<header><a href='/'>Home</a></header><nav>" + ''.join(
+            f"<a href='/page{j}'>Page {j}</a>" for j in range(40)) + "</nav>",
+    ]
+    size = sum(len(b) for b in blocks)
+    while size < size_kb * 1024:
+        words = ' '.join(rng.choice(WORDS) for _ in range(60))
+        kind = rng.choice(['services', 'products', 'solutions', 'blog', 'careers'])
+        block = (f"<div class='section'><h2>{kind.title()}</h2><p>{words}</p>"
+                 f"<a href='/{kind}/{rng.randint(0, 999)}'>{kind}</a><!-- {words[:40]} --></div>")
+        blocks.append(block)
+        size += len(block)
+    blocks.append("<footer>&copy; Company</footer><script>init();</script></body></html>")
+    return ''.join(blocks).encode('utf-8')
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--pages', type=int, default=2000)
+    parser.add_argument('--size', type=int, default=60, help='approximate page size in KB')
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4, os.cpu_count() or 1])
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    pages = [(make_page(i, args.size, rng), f"https://company{i}.example.com/") for i in range(args.pages)]
+    total_mb = sum(len(html) for html, _ in pages) / 1e6
+    print(f"{args.pages} pages, {total_mb:.1f} MB")
+
+    reference = None
+    for backend in BACKENDS:
+        n = min(args.pages, 300) if backend != 'lxml' else args.pages
+        start = time.perf_counter()
+        results = [extract_page(html, url, backend=backend) for html, url in pages[:n]]
+        seconds = time.perf_counter() - start
+        if reference is None:
+            reference = results
+        agree = sum(a[0] == b[0] for a, b in zip(results, reference)) / n
+        print(f"{backend:<14} single process {n / seconds:10.1f} pages/s   text matches lxml on {agree:.0%}")
+
+    for workers in sorted(set(args.workers)):
+        with ExtractionPool(workers=workers) as pool:
+            pool.map(pages[:workers * 4])  # warm up the workers
+            start = time.perf_counter()
+            pool.map(pages)
+            seconds = time.perf_counter() - start
+        print(f"{'lxml':<14} {workers:>2} worker procs {args.pages / seconds:10.1f} pages/s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,55 @@
+"""
+Benchmark: HQ state resolution with the offline gazetteer (hq_state per page text, zip_state per
+ZIP code).
+
+    python testing/bench_gazetteer.py --companies 50000
+
+Texts are synthetic "About us" snippets with an address in one of a few states (and some with
+none); the answers are checked against the state each text was built with.
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from leadgen.gazetteer import hq_state, zip_state  # noqa: E402
+
+ADDRESSES = [
+    ('CA', "123 Main St, Fresno, CA 93721"), ('CA', "Suite 200, Irvine, California 92614"),
+    ('CA', "Headquarters: Santa Clara, CA"), ('TX', "500 Elm St, Dallas, TX 75201"),
+    ('OR', "Portland, OR 97201"), ('NY', "1 Broadway, New York, NY 10004-1050"),
+    ('WA', "Seattle, WA 98101"), ('NV', "Las Vegas, NV 89101"), (None, "Serving customers nationwide"),
+]
+TEMPLATE = ("{name} is a family-owned heating and air company. Call us at 555-0100 for service. "
+            "Contact: {address}. Licensed and insured since 1987.")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--companies', type=int, default=50000)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    picks = rng.integers(len(ADDRESSES), size=args.companies)
+    texts = [TEMPLATE.format(name=f"Company {i}", address=ADDRESSES[p][1]) for i, p in enumerate(picks)]
+    expected = [ADDRESSES[p][0] for p in picks]
+
+    start = time.perf_counter()
+    found = [hq_state(t) for t in texts]
+    seconds = time.perf_counter() - start
+    wrong = sum(1 for s, e in zip(found, expected) if s != e)
+    print(f"hq_state: {1e6 * seconds / len(texts):5.1f} us per company, {wrong} wrong states")
+
+    zips = [f"{z:05d}" for z in rng.integers(100000, size=len(texts))]
+    start = time.perf_counter()
+    states = [zip_state(z) for z in zips]
+    seconds = time.perf_counter() - start
+    print(f"zip_state: {1e6 * seconds / len(zips):.2f} us per ZIP code, "
+          f"{sum(1 for s in states if s is None)} of {len(zips)} random codes unassigned")
+
+
+if __name__ == '__main__':
+    main()
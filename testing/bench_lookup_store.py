@@ -0,0 +1,51 @@
+"""
+Micro-benchmark for the lookup store: open time and chunked lookups on a large store.
+
+    python testing/bench_lookup_store.py --entries 300000
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from leadgen.lookup_store import LookupStore
+
+SUFFIXES = ['Inc.', 'Inc', 'LLC', 'Corp', 'Co.', '']
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--entries', type=int, default=300000)
+    parser.add_argument('--chunk', type=int, default=500)
+    args = parser.parse_args()
+
+    path = os.path.join(tempfile.mkdtemp(), 'lookup_store.sqlite')
+    store = LookupStore(path)
+    t = time.perf_counter()
+    with store._lock:
+        store.conn.executemany(
+            "INSERT INTO lookups (key, name, website, website_source, website_at) VALUES (?, ?, ?, 'google', ?)",
+            ((f"company {i}", f"Company {i}", f"https://company{i}.example", time.time())
+             for i in range(args.entries))
+        )
+        store.conn.commit()
+    store.close()
+    print(f"filled {args.entries} entries in {time.perf_counter() - t:.1f} s "
+          f"({os.path.getsize(path) / 1e6:.1f} MB)")
+
+    t = time.perf_counter()
+    store = LookupStore(path)
+    print(f"open: {1000 * (time.perf_counter() - t):.1f} ms")
+
+    # Same companies under different spellings of the legal suffix
+    names = [f"Company {random.randrange(args.entries)} {random.choice(SUFFIXES)}" for _ in range(args.chunk)]
+    t = time.perf_counter()
+    found = store.get_many(names, 'website')
+    print(f"get_many({args.chunk}): {1000 * (time.perf_counter() - t):.1f} ms, {len(found)} hits")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,107 @@
+"""
+Benchmark: near-duplicate detection on a corpus where many sites share a template, and what it
+saves in scoring (ScoringStage with and without score reuse).
+
+    python testing/bench_near_dup.py --docs 5000 --template-share 0.4
+
+Documents are resampled from labeled_companies_with_text.csv (as in bench_scoring.py); a share of
+them are copies of a few template texts with a handful of words changed (company name, city,
+phone), like franchise locations or sites from one template vendor.
+"""
+import argparse
+import os
+import sys
+import time
+
+import joblib
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from bench_scoring import make_corpus  # noqa: E402
+from leadgen.near_dup import NearDupIndex, near_duplicates  # noqa: E402
+from leadgen.scoring import ScoringStage  # noqa: E402
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def with_templates(corpus, share, templates=20, edits=3, seed=1):
+    """
+    Replace `share` of the corpus with lightly edited copies of `templates` of its texts.
+    Returns (texts, template id or -1 per text).
+    """
+    rng = np.random.default_rng(seed)
+    bases = [corpus[i].split() for i in range(templates)]
+    texts, origin = [], []
+    for i, text in enumerate(corpus):
+        if i < templates:
+            texts.append(text)  # the templates themselves
+            origin.append(i)
+        elif rng.random() < share:
+            t = int(rng.integers(templates))
+            words = list(bases[t])
+            for _ in range(edits):
+                words[rng.integers(len(words))] = f"name{rng.integers(100000)}"
+            texts.append(' '.join(words))
+            origin.append(t)
+        else:
+            texts.append(text)
+            origin.append(-1)
+    return texts, origin
+
+
+def staged(model, vectorizer, texts, reuse):
+    out = {}
+
+    def on_scored(keys, probs):
+        out.update(zip(keys, probs))
+
+    with ScoringStage(model, vectorizer, on_scored, batch_size=256, max_latency=0.2, reuse=reuse) as stage:
+        start = time.perf_counter()
+        for i, text in enumerate(texts):
+            stage.submit(i, text)
+        submit_s = time.perf_counter() - start
+    return np.array([out[i] for i in range(len(texts))]), dict(stage.stats, submit_us=1e6 * submit_s / len(texts))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--docs', type=int, default=5000)
+    parser.add_argument('--template-share', type=float, default=0.4)
+    parser.add_argument('--threshold', type=float, default=0.9)
+    args = parser.parse_args()
+
+    texts, origin = with_templates(make_corpus(args.docs), args.template_share)
+    templated = sum(1 for o in origin if o >= 0) - 20
+
+    index = NearDupIndex()
+    start = time.perf_counter()
+    for text in texts:
+        index.signature(text)
+    per_text = (time.perf_counter() - start) / len(texts)
+    print(f"MinHash signature: {1e6 * per_text:.0f} us per text")
+
+    start = time.perf_counter()
+    matches = near_duplicates(texts, args.threshold)
+    seconds = time.perf_counter() - start
+    found = sum(1 for m in matches if m >= 0)
+    wrong = sum(1 for i, m in enumerate(matches) if m >= 0 and origin[i] != origin[m])
+    print(f"dedupe: {found} of {len(texts)} texts are near-duplicates ({templated} templated copies), "
+          f"{wrong} false matches, {seconds:.2f} s")
+
+    model = joblib.load(os.path.join(ROOT, 'relevance_model.pkl'))
+    vectorizer = joblib.load(os.path.join(ROOT, 'vectorizer.pkl'))
+    start = time.perf_counter()
+    reference, stats = staged(model, vectorizer, texts, None)
+    plain = time.perf_counter() - start
+    print(f"scoring, no reuse:   {plain:6.2f} s, {stats['scored']} texts through the model, "
+          f"submit {stats['submit_us']:.1f} us per text")
+    start = time.perf_counter()
+    probs, stats = staged(model, vectorizer, texts, NearDupIndex(args.threshold))
+    reused = time.perf_counter() - start
+    print(f"scoring, with reuse: {reused:6.2f} s, {stats['scored']} texts through the model, "
+          f"{stats['reused']} reused, submit {stats['submit_us']:.1f} us per text; "
+          f"max score difference {np.abs(probs - reference).max():.3f}")
+
+
+if __name__ == '__main__':
+    main()
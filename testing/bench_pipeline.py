@@ -0,0 +1,181 @@
+"""
+Benchmark: the whole `rank` pipeline (resolve, crawl, score, revenue lookup, rank) against a local
+fake web, so it runs offline and gives the same workload every time.
+
+    python testing/bench_pipeline.py --sizes 100 1000 10000 --latency 0.02 --save bench_pipeline.json
+    python testing/bench_pipeline.py --sizes 1000 --baseline bench_pipeline.json   # flag regressions
+
+Each size runs in its own process (so peak RSS is per size) in a temporary directory, with FakeDriver
+browsers and no rate limiting. Reports throughput, p50/p95 of the main stages (from the pipeline's
+own metrics) and peak RSS of the pipeline process and of its largest child (extraction workers).
+Run from the repository root so the relevance model is found.
+"""
+import argparse
+import contextlib
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from fake_web import FakeWeb, revenue_of  # noqa: E402
+
+STAGES = ['scrape', 'fetch', 'resolve.selenium', 'revenue', 'score']
+
+
+def unlimited():
+    from leadgen.rate_limit import DomainRateLimiter
+
+    return DomainRateLimiter(rate=1e9, burst=1e9, max_rate=1e9)
+
+
+def make_resolver(names, web, limiter):
+    from leadgen.resolvers import HtmlSearchResolver, ResolverChain, SeleniumResolver
+
+    backends = {
+        'html-search': lambda: HtmlSearchResolver(search_url=web.search_base + '/html/?q={query}', limiter=limiter),
+        'selenium': lambda: SeleniumResolver(limiter=limiter),
+    }
+    return ResolverChain([backends[name]() for name in names])
+
+
+def run_once(n, args, workdir):
+    """
+    One pipeline run over n fake companies; returns the measurements as a dict.
+    """
+    from leadgen import search
+    from leadgen.metrics import metrics
+    from leadgen.pipeline import RankRun
+    from leadgen.planner import StagePlanner
+
+    web = FakeWeb(hosts=args.hosts, page_bytes=args.page_bytes, fan_out=args.fan_out, latency=args.latency,
+                  search_latency=args.search_latency).start()
+    companies = web.companies(n)
+    input_path = os.path.join(workdir, 'companies.csv')
+    output_path = os.path.join(workdir, 'ranked.csv')
+    pd.DataFrame({'company_name': companies}).to_csv(input_path, index=False)
+
+    search.search_limiter = unlimited()  # the fake web never throttles; measure the pipeline, not the pacing
+    run = RankRun(os.path.join(workdir, 'journal.sqlite'), browsers=args.browsers,
+                  cache_path=os.path.join(workdir, 'page_cache.sqlite'), planner=StagePlanner(),
+                  lookup_store_path=os.path.join(workdir, 'lookup_store.sqlite'),
+                  resolver=make_resolver(args.resolvers.split(','), web, search.search_limiter),
+                  metrics_path=os.path.join(workdir, 'metrics.jsonl'), driver_factory=web.driver,
+                  site_limiter=unlimited())
+
+    start = time.perf_counter()
+    with open(os.path.join(workdir, 'pipeline.log'), 'w') as log, contextlib.redirect_stdout(log):
+        run.run(input_path, output_path, args.chunk_size)
+    wall = time.perf_counter() - start
+    web.stop()
+
+    ranked = pd.read_csv(output_path)
+    found = ranked[ranked['revenue'] > 0]
+    wrong = sum(1 for name, revenue in zip(found['company_name'], found['revenue']) if revenue_of(name) != revenue)
+    stages = metrics.snapshot()['stages']
+    return {
+        'companies': n,
+        'wall_s': round(wall, 2),
+        'companies_per_s': round(n / wall, 1),
+        'ranked': len(ranked),
+        'with_website': int(ranked['website'].notna().sum()),
+        'with_revenue': len(found),
+        'wrong_revenue': wrong,
+        'requests': web.requests,
+        'stages': {s: {k: stages[s][k] for k in ('count', 'p50', 'p95')} for s in STAGES if s in stages},
+        'peak_rss_mb': round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+        'peak_child_rss_mb': round(resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / 1024, 1),
+    }
+
+
+def print_table(results):
+    print(f"{'companies':>9} {'wall s':>8} {'per s':>7} " +
+          ' '.join(f"{s + ' p50/p95 ms':>26}" for s in STAGES) + f" {'RSS MB':>8} {'child MB':>9}")
+    for r in results:
+        cells = []
+        for s in STAGES:
+            st = r['stages'].get(s)
+            cell = f"{1000 * st['p50']:.0f}/{1000 * st['p95']:.0f}" if st else '-'
+            cells.append(f"{cell:>26}")
+        print(f"{r['companies']:>9} {r['wall_s']:>8.1f} {r['companies_per_s']:>7.1f} " + ' '.join(cells) +
+              f" {r['peak_rss_mb']:>8.0f} {r['peak_child_rss_mb']:>9.0f}")
+    for r in results:
+        if r['ranked'] != r['companies'] or r['wrong_revenue']:
+            print(f"WARNING: {r['companies']} companies in, {r['ranked']} ranked, {r['wrong_revenue']} wrong revenues")
+
+
+def compare(results, baseline, tolerance):
+    """
+    Regressions against a saved run: lower throughput, higher p95 or higher peak RSS beyond tolerance.
+    """
+    old = {r['companies']: r for r in baseline}
+    problems = []
+    for r in results:
+        b = old.get(r['companies'])
+        if not b:
+            continue
+        if r['companies_per_s'] < b['companies_per_s'] * (1 - tolerance):
+            problems.append(f"{r['companies']}: throughput {b['companies_per_s']} -> {r['companies_per_s']} companies/s")
+        if r['peak_rss_mb'] > b['peak_rss_mb'] * (1 + tolerance):
+            problems.append(f"{r['companies']}: peak RSS {b['peak_rss_mb']} -> {r['peak_rss_mb']} MB")
+        for s, st in r['stages'].items():
+            bs = b['stages'].get(s)
+            if bs and st['p95'] > bs['p95'] * (1 + tolerance) and st['p95'] - bs['p95'] > 0.005:
+                problems.append(f"{r['companies']}: {s} p95 {1000 * bs['p95']:.0f} -> {1000 * st['p95']:.0f} ms")
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100, 1000, 10000])
+    parser.add_argument('--hosts', type=int, default=8, help="fake web servers (distinct host:port pairs)")
+    parser.add_argument('--page-bytes', type=int, default=4000, help="text per page")
+    parser.add_argument('--fan-out', type=int, default=3, help="internal links per page")
+    parser.add_argument('--latency', type=float, default=0.02, help="seconds per site request")
+    parser.add_argument('--search-latency', type=float, default=0.05, help="seconds per search results page")
+    parser.add_argument('--browsers', type=int, default=3)
+    parser.add_argument('--resolvers', default='selenium', help="comma-separated: html-search, selenium")
+    parser.add_argument('--chunk-size', type=int, default=500)
+    parser.add_argument('--save', default=None, help="write the results as JSON")
+    parser.add_argument('--baseline', default=None, help="results JSON of an earlier run to compare against")
+    parser.add_argument('--tolerance', type=float, default=0.2, help="allowed relative slowdown")
+    parser.add_argument('--worker', type=int, default=None, help=argparse.SUPPRESS)
+    parser.add_argument('--result', default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker is not None:
+        with tempfile.TemporaryDirectory() as workdir:
+            result = run_once(args.worker, args, workdir)
+        with open(args.result, 'w') as f:
+            json.dump(result, f)
+        return
+
+    results = []
+    for n in args.sizes:
+        with tempfile.NamedTemporaryFile(suffix='.json', delete=False) as f:
+            result_path = f.name
+        subprocess.run([sys.executable, os.path.abspath(__file__), *sys.argv[1:], '--worker', str(n),
+                        '--result', result_path], check=True)
+        with open(result_path) as f:
+            results.append(json.load(f))
+        os.remove(result_path)
+        print(f"{n} companies: {results[-1]['wall_s']} s", flush=True)
+
+    print_table(results)
+    if args.save:
+        with open(args.save, 'w') as f:
+            json.dump(results, f, indent=2)
+    if args.baseline:
+        with open(args.baseline) as f:
+            problems = compare(results, json.load(f), args.tolerance)
+        print("\n".join(["Regressions:"] + problems) if problems else "No regressions against the baseline")
+        return 1 if problems else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
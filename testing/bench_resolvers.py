@@ -0,0 +1,127 @@
+"""
+Benchmark: median website-resolution latency per resolver backend, against a local fixture server.
+
+    python testing/bench_resolvers.py --companies 100 --latency 0.05 [--browser]
+
+The server plays every part: company home pages under /sites/<slug>, a plain-HTML search page
+(/html?q=...) and a Google-style results page (/search?q=... with div.tF2Cxc results). Every
+results page lists a bad domain first, so the BAD_DOMAINS filter is exercised for each backend.
+Every fourth home page is a parked "for sale" page, which domain-guess must reject (it confirms
+that a guessed site names the company). The selenium backend only runs with --browser (needs a
+local Chrome).
+"""
+import argparse
+import os
+import re
+import statistics
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, quote, urlsplit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from leadgen.driver_pool import DriverPool
+from leadgen.rate_limit import DomainRateLimiter
+from leadgen.resolvers import DomainGuessResolver, HtmlSearchResolver, ResolverChain, SeleniumResolver
+
+WORDS = ['Pacific', 'Summit', 'Golden', 'Coastal', 'Valley', 'Precision', 'Allied', 'Sierra']
+KINDS = ['HVAC', 'Electric', 'Mechanical', 'Refrigeration', 'Controls']
+
+
+def make_handler(latency, names):
+    class Handler(BaseHTTPRequestHandler):
+        def do_HEAD(self):
+            self.do_GET(head=True)
+
+        def do_GET(self, head=False):
+            time.sleep(latency)
+            parts = urlsplit(self.path)
+            query = parse_qs(parts.query).get('q', [''])[0].replace(' official website', '')
+            slug = re.sub(r'[^a-z0-9]', '', query.lower())
+            base = f"http://{self.headers['Host']}"
+            if parts.path == '/html':
+                body = (
+                    "<html><body>"
+                    f"<a class='result__a' href='//duckduckgo.com/l/?uddg={quote('https://www.linkedin.com/company/' + slug)}'>x</a>"
+                    f"<a class='result__a' href='//duckduckgo.com/l/?uddg={quote(base + '/sites/' + slug)}'>{query}</a>"
+                    "</body></html>"
+                )
+            elif parts.path == '/search':
+                body = (
+                    "<html><body>"
+                    f"<div class='tF2Cxc'><a href='https://www.facebook.com/{slug}'>x</a></div>"
+                    f"<div class='tF2Cxc'><a href='{base}/sites/{slug}'>{query}</a></div>"
+                    "</body></html>"
+                )
+            elif parts.path.startswith('/sites/') and parts.path[len('/sites/'):] in names:
+                i, name = names[parts.path[len('/sites/'):]]
+                if i % 4 == 0:
+                    body = f"<html><head><title>{parts.path[7:]}.com is for sale</title></head><body>Buy this domain</body></html>"
+                else:
+                    body = f"<html><head><title>{name} | Home</title></head><body><h1>{name}</h1></body></html>"
+            else:
+                self.send_response(404)
+                self.end_headers()
+                return
+            body = body.encode()
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/html; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            if not head:
+                self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--companies', type=int, default=100)
+    parser.add_argument('--latency', type=float, default=0.05, help="seconds added to every response")
+    parser.add_argument('--browser', action='store_true', help="also time the selenium backend (starts Chrome)")
+    args = parser.parse_args()
+
+    companies = [f"{WORDS[i % len(WORDS)]} {KINDS[i % len(KINDS)]} {i}, Inc." for i in range(args.companies)]
+    names = {re.sub(r'[^a-z0-9]', '', c.lower().replace(', inc.', '')): (i, c) for i, c in enumerate(companies)}
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), make_handler(args.latency, names))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+
+    limiter = DomainRateLimiter(rate=1000, burst=1000, max_rate=1000)  # measure the backend, not the throttle
+    backends = [
+        DomainGuessResolver(patterns=(base + '/sites/{slug}',)),
+        HtmlSearchResolver(search_url=base + '/html?q={query}', limiter=limiter),
+    ]
+    if args.browser:
+        backends.append(SeleniumResolver(search_url=base + '/search?q={query}', limiter=limiter))
+
+    print(f"{'backend':<14} {'resolved':>9} {'median ms':>10} {'p95 ms':>8}")
+    pool = DriverPool(size=1) if args.browser else None
+    try:
+        for backend in backends:
+            chain = ResolverChain([backend])
+            found = {}
+            if backend.uses_browser:
+                chain.resolve_many(companies, pool, lambda company, url, source: found.__setitem__(company, url))
+            else:
+                for company in companies:  # one at a time, so latency is per lookup
+                    found[company] = chain.first_good(backend, company)
+            latency = sorted(chain.stats[backend.name]['latency'])
+            p95 = latency[int(0.95 * (len(latency) - 1))]
+            resolved = sum(1 for url in found.values() if url)
+            print(f"{backend.name:<14} {resolved:>5}/{len(companies):<3} "
+                  f"{1000 * statistics.median(latency):>10.1f} {1000 * p95:>8.1f}")
+    finally:
+        if pool is not None:
+            pool.close()
+        server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,71 @@
+"""
+Benchmark: the revenue parser (parse_revenue, every pattern) vs the old one-regex-per-call
+ZoomInfo parser, on synthetic search snippets.
+
+    python testing/bench_revenue.py --snippets 100000
+
+Checks that both agree on every snippet the old parser understood.
+"""
+import argparse
+import os
+import re
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from leadgen.revenue import parse_revenue  # noqa: E402
+
+TEMPLATES = [
+    "{name}'s revenue is ${value} Million. {name} is a heating and air company in Fresno, California.",
+    "{name} annual revenue: ${value}M - ${high}M. Employees: 50-100. Industry: Construction.",
+    "{name} company profile, contacts and org chart. Find key people and phone numbers.",
+    "What is {name}'s revenue? {name} generates USD {value} billion in revenue.",
+    "{name} raised ${value}K in seed funding. Revenue is ${high},000,000 according to filings.",
+    "{name} - Electrical contractor. Founded 1987. Headquarters: San Diego, CA 92101.",
+]
+
+
+def legacy(snippet):
+    # parse_zoominfo_revenue before the bulk engine
+    m = re.search(r"revenue\s+is\s+\$?([0-9]+(?:\.[0-9]+)?)\s*(million|billion|m|b)", snippet, flags=re.IGNORECASE)
+    if not m:
+        return None
+    val = float(m.group(1))
+    return val * 1000 if m.group(2).lower() in ("b", "billion") else val
+
+
+def make_snippets(n, seed=0):
+    rng = np.random.default_rng(seed)
+    snippets = []
+    for i in range(n):
+        value = round(float(rng.uniform(1, 400)), 1)
+        snippets.append(TEMPLATES[i % len(TEMPLATES)].format(name=f"Company {i}", value=value, high=int(value) + 5))
+    return snippets
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--snippets', type=int, default=100000)
+    args = parser.parse_args()
+    snippets = make_snippets(args.snippets)
+
+    start = time.perf_counter()
+    old = [legacy(s) for s in snippets]
+    print(f"{'old per-snippet regex':<24} {time.perf_counter() - start:6.2f} s (\"revenue is\" form only)")
+
+    start = time.perf_counter()
+    new = [parse_revenue(s) for s in snippets]
+    print(f"{'parse_revenue':<24} {time.perf_counter() - start:6.2f} s")
+
+    mismatches = sum(1 for a, b in zip(old, new) if a is not None and (b is None or not np.isclose(a, b[0])))
+    patterns = {}
+    for parsed in new:
+        if parsed:
+            patterns[parsed[4]] = patterns.get(parsed[4], 0) + 1
+    print(f"{sum(patterns.values())} of {len(snippets)} snippets have a revenue (old parser: "
+          f"{sum(1 for a in old if a is not None)}); by pattern: {patterns}; {mismatches} disagreements")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,87 @@
+"""
+Benchmark: per-row scoring (one transform + predict_proba per company, as in the old loops)
+vs batched scoring and the micro-batching ScoringStage.
+
+    python testing/bench_scoring.py --docs 10000 20000
+
+Documents are synthesised by resampling words from labeled_companies_with_text.csv,
+so they look like real scraped text with a realistic vocabulary.
+"""
+import argparse
+import os
+import sys
+import time
+
+import joblib
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from leadgen.scoring import ScoringStage, score_texts
+from leadgen.text import preprocess_text
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def make_corpus(n, seed=0):
+    texts = pd.read_csv(os.path.join(ROOT, 'labeled_companies_with_text.csv'))['scraped_text'].dropna().tolist()
+    rng = np.random.default_rng(seed)
+    words = [t.split() for t in texts]
+    corpus = []
+    for i in range(n):
+        source = words[rng.integers(len(words))]
+        size = min(len(source), 450)
+        corpus.append(' '.join(rng.choice(source, size=size)))
+    return corpus
+
+
+def per_row(model, vectorizer, corpus):
+    return np.array([model.predict_proba(vectorizer.transform([preprocess_text(t)]))[0][1] for t in corpus])
+
+
+def staged(model, vectorizer, corpus, batch_size):
+    out = {}
+
+    def on_scored(keys, probs):
+        out.update(zip(keys, probs))
+
+    with ScoringStage(model, vectorizer, on_scored, batch_size=batch_size, max_latency=0.2) as stage:
+        for i, text in enumerate(corpus):
+            stage.submit(i, text)
+    return np.array([out[i] for i in range(len(corpus))])
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--docs', type=int, nargs='+', default=[10000])
+    parser.add_argument('--batch-sizes', type=int, nargs='+', default=[64, 256, 1024])
+    args = parser.parse_args()
+
+    model = joblib.load(os.path.join(ROOT, 'relevance_model.pkl'))
+    vectorizer = joblib.load(os.path.join(ROOT, 'vectorizer.pkl'))
+
+    for n in args.docs:
+        corpus = make_corpus(n)
+        print(f"--- {n} documents")
+
+        start = time.perf_counter()
+        reference = per_row(model, vectorizer, corpus)
+        seconds = time.perf_counter() - start
+        print(f"{'per-row':<24} {seconds:8.2f} s  {n / seconds:10.0f} docs/s")
+
+        start = time.perf_counter()
+        batch = score_texts(model, vectorizer, corpus)
+        seconds = time.perf_counter() - start
+        print(f"{'single batch':<24} {seconds:8.2f} s  {n / seconds:10.0f} docs/s")
+        assert np.allclose(batch, reference)
+
+        for batch_size in args.batch_sizes:
+            start = time.perf_counter()
+            probs = staged(model, vectorizer, corpus, batch_size)
+            seconds = time.perf_counter() - start
+            print(f"{f'stage batch_size={batch_size}':<24} {seconds:8.2f} s  {n / seconds:10.0f} docs/s")
+            assert np.allclose(probs, reference)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,91 @@
+"""
+Benchmark: per-check text matching (the original functions) vs the single-pass TextAnalyzer.
+
+    python testing/bench_signals.py --data labeled_companies_with_text.csv --repeat 20 --cities 300 2000
+
+Each corpus text is checked for acquisition keywords, the CA HQ heuristic and a revenue mention.
+--cities pads the CA city list with synthetic names to show how each approach scales with it.
+Also counts where both approaches disagree: acquisition and revenue answers should all agree, while
+HQ answers differ by design (the single pass resolves addresses with the gazetteer, the old check
+accepted any ZIP code starting with 9).
+"""
+import argparse
+import os
+import random
+import re
+import string
+import sys
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from leadgen.revenue import extract_revenue
+from leadgen.signals import ACQUISITION_KEYWORDS, CA_CITIES, TextAnalyzer, hq_in_ca
+
+EXTRAS = [" Acquired by Acme Holdings in 2019.", " Offices in Santa Clara, CA 95054.",
+          " Annual revenue of $12.5 million.", " Revenue: USD 40 M.", ""]
+
+
+# The original per-check functions, kept here as the baseline
+def legacy_acquisition(text, keywords):
+    text_lower = text.lower()
+    return 1 if any(keyword in text_lower for keyword in keywords) else 0
+
+
+def legacy_hq(text, cities):
+    if not text:
+        return None
+    text = text.lower()
+    if re.search(r"\bca\b|\bcalifornia\b", text):
+        return True
+    for city in cities:
+        if city in text:
+            return True
+    if re.search(r"\b9\d{4}\b", text):
+        return True
+    return False
+
+
+def make_cities(n):
+    rng = random.Random(0)
+    cities = list(CA_CITIES)
+    while len(cities) < n:
+        cities.append(' '.join(''.join(rng.choices(string.ascii_lowercase, k=rng.randint(4, 9)))
+                               for _ in range(rng.randint(1, 2))))
+    return cities
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--data', default='labeled_companies_with_text.csv')
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--cities', type=int, nargs='+', default=[300, 2000])
+    args = parser.parse_args()
+
+    base = pd.read_csv(args.data)['scraped_text'].dropna().astype(str).tolist()
+    rng = random.Random(1)
+    texts = [t + rng.choice(EXTRAS) for t in base * args.repeat]
+    mb = sum(len(t) for t in texts) / 1e6
+    print(f"{len(texts)} texts, {mb:.1f} MB")
+
+    for n in args.cities:
+        cities = make_cities(n)
+        t = time.perf_counter()
+        legacy = [(legacy_acquisition(x, ACQUISITION_KEYWORDS), legacy_hq(x, cities), extract_revenue(x)) for x in texts]
+        legacy_s = time.perf_counter() - t
+
+        analyzer = TextAnalyzer(cities=cities)
+        t = time.perf_counter()
+        signals = [analyzer.analyze(x) for x in texts]
+        single_s = time.perf_counter() - t
+        new = [(int(s.acquisition), hq_in_ca(s), s.revenue) for s in signals]
+
+        mismatches = sum(1 for a, b in zip(legacy, new) if (a[0], a[2]) != (b[0], b[2]))
+        hq_changed = sum(1 for a, b in zip(legacy, new) if a[1] != b[1])
+        print(f"{len(cities):>5} cities: per-check {mb / legacy_s:6.1f} MB/s, single pass {mb / single_s:6.1f} MB/s "
+              f"({legacy_s / single_s:.1f}x), {mismatches} mismatches, {hq_changed} HQ answers changed")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,120 @@
+"""
+Benchmark: full downloads + full-tree parsing vs the crawler's byte-budgeted streaming fetch,
+Content-Type check and incremental parse, on heavy company sites.
+
+    python testing/bench_streaming.py --sites 20 --html-mb 8 --pdf-mb 5
+
+Every site has a normal home page linking to a multi-megabyte /services page and a PDF catalog
+under /products. Each mode runs in its own process. "read" is the bytes the client took off the
+socket; over loopback the kernel buffers a few MB more of an abandoned response, which a real
+network link would not have carried.
+"""
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from leadgen.crawler import HEADERS, scrape_many
+from leadgen.extraction import extract_page
+from leadgen.metrics import metrics
+from leadgen.rate_limit import DomainRateLimiter
+
+PARAGRAPH = ("<div class='item'><h3>Rooftop unit service</h3><p>We install, repair and maintain commercial HVAC "
+             "systems, chillers, boilers and building controls for offices, warehouses and retail sites.</p></div>")
+
+
+def make_server(html_mb, pdf_mb):
+    home = ("<html><body><h1>Company</h1>" + PARAGRAPH * 40 +
+            "<a href='/services'>Services</a> <a href='/products/catalog.pdf'>Products</a> "
+            "<a href='/about'>About</a></body></html>").encode()
+    services = ("<html><body>" + PARAGRAPH * (html_mb * 1024 * 1024 // len(PARAGRAPH)) + "</body></html>").encode()
+    pdf = b"%PDF-1.4\n" + os.urandom(1024) * (pdf_mb * 1024)
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            path = self.path.split('/', 2)[-1]
+            if path.startswith('services'):
+                body, kind = services, 'text/html; charset=utf-8'
+            elif path.endswith('.pdf'):
+                body, kind = pdf, 'application/pdf'
+            elif path == 'robots.txt':
+                body, kind = b"User-agent: *\n", 'text/plain'
+            else:
+                body, kind = home, 'text/html; charset=utf-8'
+            self.send_response(200)
+            self.send_header('Content-Type', kind)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            try:
+                self.wfile.write(body)
+            except (BrokenPipeError, ConnectionResetError):
+                pass  # the client stopped reading
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def full_download(urls):
+    # The original approach: read every response completely, then parse the whole document
+    texts, read = [], 0
+    for url in urls:
+        pages = []
+        for page in (url, url + '/services', url + '/products/catalog.pdf', url + '/about'):
+            response = requests.get(page, headers=HEADERS, timeout=60)
+            read += len(response.content)
+            text, _ = extract_page(response.content, page, backend='lxml-tree')
+            pages.append(text)
+        texts.append(' '.join(pages))
+    return texts, read
+
+
+def streaming(urls):
+    limiter = DomainRateLimiter(rate=1e9, burst=1e9, max_rate=1e9)  # every site is on one local host
+    texts = scrape_many(urls, concurrency=4, max_pages=4, workers=0, limiter=limiter)
+    return texts, metrics.counters['bytes_downloaded']
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--sites', type=int, default=20)
+    parser.add_argument('--html-mb', type=int, default=8)
+    parser.add_argument('--pdf-mb', type=int, default=5)
+    parser.add_argument('--mode', choices=['full', 'streaming'], default=None, help=argparse.SUPPRESS)
+    parser.add_argument('--base', default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.mode:
+        urls = [f"{args.base}/site{i}" for i in range(args.sites)]
+        start = time.perf_counter()
+        texts, read = (full_download if args.mode == 'full' else streaming)(urls)
+        print(json.dumps({'seconds': time.perf_counter() - start, 'read_mb': read / 1e6,
+                          'peak_rss_mb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+                          'texts': sum(1 for t in texts if t)}))
+        return
+
+    server = make_server(args.html_mb, args.pdf_mb)
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    print(f"{args.sites} sites, each with a {args.html_mb} MB /services page and a {args.pdf_mb} MB PDF")
+    for mode in ('full', 'streaming'):
+        out = subprocess.run([sys.executable, os.path.abspath(__file__), '--sites', str(args.sites), '--mode', mode,
+                              '--base', base], capture_output=True, text=True, check=True).stdout
+        result = json.loads(out.strip().splitlines()[-1])
+        print(f"{mode:>10}: {result['seconds']:6.1f} s, {result['read_mb']:8.1f} MB read, "
+              f"peak RSS {result['peak_rss_mb']:6.0f} MB, {result['texts']} texts")
+
+
+if __name__ == '__main__':
+    main()
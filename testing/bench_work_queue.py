@@ -0,0 +1,125 @@
+"""
+Benchmark: coordinator/worker mode with several worker processes on one box, against the local
+fake web (see fake_web.py), for 1, 2 and 4 workers.
+
+    python testing/bench_work_queue.py --companies 400 --workers 1 2 4 --kill-one
+
+Every worker is a separate process with one browser, its own journal and the shared lookup store
+and page cache, like `python -m leadgen worker` started several times. With --kill-one, one worker
+(and its parser processes) is SIGKILLed after its first task; its leased task must come back after the lease expires and be
+finished by another worker. Each run checks that every company was reported exactly once.
+Run from the repository root so the relevance model is found.
+
+The CPU line shows how busy the box was; the workers mostly wait on the (simulated) network. Per-worker
+throughput falls with more workers because of the last round of tasks: 16 tasks of 25 on 3 workers
+take 6 rounds where 5.3 would do, and each worker's start-up (model load, browser) is paid once more.
+On one core, 3 workers reached 82% per worker with --task-size 25 and 90% with --task-size 10, with
+the cores 15% busy; smaller tasks even out the tail at the cost of more queue round trips.
+"""
+import argparse
+import contextlib
+import multiprocessing
+import os
+import resource
+import signal
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from fake_web import FakeWeb  # noqa: E402
+from leadgen.text import normalize_company  # noqa: E402
+from leadgen.work_queue import WorkQueue, collect, run_worker  # noqa: E402
+
+
+def unlimited():
+    from leadgen.rate_limit import DomainRateLimiter
+
+    return DomainRateLimiter(rate=1e9, burst=1e9, max_rate=1e9)
+
+
+def worker_process(workdir, web, worker, lease, browsers):
+    os.setsid()  # own process group, so a kill also takes down the worker's parser processes
+    from leadgen import search
+    from leadgen.pipeline import RankRun
+    from leadgen.resolvers import ResolverChain, SeleniumResolver
+
+    search.search_limiter = unlimited()
+    run = RankRun(os.path.join(workdir, f'journal_{worker}.sqlite'), resume=True, browsers=browsers,
+                  cache_path=os.path.join(workdir, 'page_cache.sqlite'),
+                  lookup_store_path=os.path.join(workdir, 'lookup_store.sqlite'),
+                  resolver=ResolverChain([SeleniumResolver(limiter=search.search_limiter)]),
+                  driver_factory=web.driver, site_limiter=unlimited())
+    queue = WorkQueue(os.path.join(workdir, 'queue.sqlite'), lease_seconds=lease)
+    with open(os.path.join(workdir, f'{worker}.log'), 'w') as log, contextlib.redirect_stdout(log):
+        run.start()
+        try:
+            run_worker(queue, run, worker, poll=0.5)
+        finally:
+            run.stop()
+
+
+def run_once(args, n_workers, web, companies):
+    with tempfile.TemporaryDirectory() as workdir:
+        queue = WorkQueue(os.path.join(workdir, 'queue.sqlite'), lease_seconds=args.lease)
+        tasks = queue.enqueue(companies[i:i + args.task_size] for i in range(0, len(companies), args.task_size))
+
+        start = time.perf_counter()
+        cpu_before = [resource.getrusage(who) for who in (resource.RUSAGE_CHILDREN, resource.RUSAGE_SELF)]
+        ctx = multiprocessing.get_context('fork')
+        procs = [ctx.Process(target=worker_process, args=(workdir, web, f'w{i}', args.lease, args.browsers))
+                 for i in range(n_workers)]
+        for p in procs:
+            p.start()
+
+        killed = None
+        if args.kill_one and n_workers > 1:
+            # Wait until the first worker has finished a task and is working on the next one
+            while not any(w == 'w0' and done for w, _, done in queue.workers()):
+                time.sleep(0.1)
+            os.killpg(procs[0].pid, signal.SIGKILL)
+            killed = procs[0].pid
+        for p in procs:
+            p.join()
+        wall = time.perf_counter() - start
+        # CPU seconds of the workers (with their parser processes) and of this process (the fake web)
+        workers_cpu, web_cpu = [after.ru_utime + after.ru_stime - before.ru_utime - before.ru_stime
+                                for before, after in zip(cpu_before, [resource.getrusage(who) for who in
+                                                                      (resource.RUSAGE_CHILDREN, resource.RUSAGE_SELF)])]
+
+        counts = queue.counts()
+        reported = sum(len(rows) for rows in queue.results())
+        ranked = collect(queue, os.path.join(workdir, 'ranked.csv'))
+        retried = queue._read("SELECT COUNT(*) FROM tasks WHERE attempts > 1")[0][0]
+        ok = counts['done'] == tasks and reported == ranked == len(companies)
+        print(f"{n_workers} workers: {len(companies) / wall:6.1f} companies/s ({wall:.1f} s), "
+              f"{counts['done']}/{tasks} tasks done, {retried} retried, {ranked} companies ranked"
+              f"{', killed one worker' if killed else ''} -> {'OK' if ok else 'MISMATCH'}", flush=True)
+        print(f"   CPU: workers {workers_cpu:.1f} s, fake web {web_cpu:.1f} s; "
+              f"{(workers_cpu + web_cpu) / (wall * os.cpu_count()):.0%} of {os.cpu_count()} cores busy", flush=True)
+        return len(companies) / wall
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--companies', type=int, default=400)
+    parser.add_argument('--task-size', type=int, default=25)
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4])
+    parser.add_argument('--browsers', type=int, default=1, help="browsers per worker")
+    parser.add_argument('--lease', type=float, default=5, help="seconds; short so a killed worker's task returns quickly")
+    parser.add_argument('--latency', type=float, default=0.05, help="seconds per site request")
+    parser.add_argument('--search-latency', type=float, default=0.2, help="seconds per search results page")
+    parser.add_argument('--kill-one', action='store_true')
+    args = parser.parse_args()
+
+    web = FakeWeb(hosts=8, latency=args.latency, search_latency=args.search_latency).start()
+    companies = [normalize_company(c) for c in web.companies(args.companies)]
+    base = None
+    for n in args.workers:
+        throughput = run_once(args, n, web, companies)
+        base = base or throughput / n
+        print(f"   per-worker throughput vs the first run: {throughput / (base * n):.0%}", flush=True)
+
+
+if __name__ == '__main__':
+    main()
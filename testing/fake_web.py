@@ -0,0 +1,234 @@
+"""
+A local fake web for offline benchmarks: synthetic company sites, a Google-like results page and
+a DuckDuckGo-like HTML results page, served by HTTP servers on 127.0.0.1, plus FakeDriver, a
+WebDriver stand-in that loads every search URL from those servers.
+
+    web = FakeWeb(hosts=4, page_bytes=4000, fan_out=3, latency=0.02).start()
+    companies = web.companies(1000)          # names whose sites and search results exist
+    driver = web.driver()                    # pass web.driver as DriverPool / RankRun factory
+
+Sites are spread over `hosts` servers (one port each) so per-host connection and rate limits
+behave like they would against independent company sites. Everything is derived from the company
+name, so any server can answer for any company and runs are reproducible.
+"""
+import random
+import re
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, quote, urlsplit
+
+import requests
+
+PREFIXES = ['Pacific', 'Golden State', 'Summit', 'Coastal', 'Sierra', 'Valley', 'Metro', 'Pioneer', 'Liberty', 'Apex']
+RELEVANT = ['Heating and Air', 'Electrical Services', 'Refrigeration', 'HVAC Supply', 'Mechanical Contractors']
+IRRELEVANT = ['Bakery', 'Dental Group', 'Law Offices', 'Pet Grooming', 'Florist']
+SUFFIXES = ['Inc.', 'LLC', 'Co.', '']
+
+RELEVANT_TEXT = ("We design, install and service commercial HVAC systems, rooftop units, chillers and refrigeration "
+                 "equipment, with 24/7 electrical and mechanical repair for facilities across the region. ")
+IRRELEVANT_TEXT = ("Our family bakery makes fresh bread, pastries and custom cakes every morning, and our cafe "
+                   "serves coffee, sandwiches and seasonal desserts for the whole neighborhood. ")
+EXTRAS = [" Headquartered in San Diego, CA 92101.", " Offices in Portland, OR 97201.",
+          " In 2021 the company was acquired by Northwind Holdings.", ""]
+SECTIONS = ['services', 'products', 'solutions', 'about']
+
+
+def slug_of(company):
+    return re.sub(r'[^a-z0-9]+', '-', company.lower()).strip('-')
+
+
+def _seed(company):
+    return zlib.crc32(company.encode())
+
+
+def revenue_of(company):
+    """
+    Revenue (millions) in the company's ZoomInfo snippet, or None for about a quarter of companies.
+    """
+    seed = _seed(company)
+    return None if seed % 4 == 0 else round(1 + seed % 400 / 4, 1)
+
+
+class FakeWeb:
+    def __init__(self, hosts=4, page_bytes=4000, fan_out=3, latency=0.0, search_latency=0.0):
+        self.hosts = hosts
+        self.page_bytes = page_bytes
+        self.fan_out = fan_out
+        self.latency = latency
+        self.search_latency = search_latency
+        self.servers = []
+        self.requests = 0
+        self._lock = threading.Lock()
+
+    def start(self):
+        for _ in range(self.hosts):
+            server = ThreadingHTTPServer(('127.0.0.1', 0), self._handler())
+            server.daemon_threads = True
+            server.request_queue_size = 128
+            threading.Thread(target=server.serve_forever, daemon=True).start()
+            self.servers.append(server)
+        return self
+
+    def stop(self):
+        for server in self.servers:
+            server.shutdown()
+            server.server_close()
+        self.servers = []
+
+    @property
+    def search_base(self):
+        return f"http://127.0.0.1:{self.servers[0].server_address[1]}"
+
+    def site_url(self, company):
+        port = self.servers[_seed(company) % len(self.servers)].server_address[1]
+        return f"http://127.0.0.1:{port}/{slug_of(company)}"
+
+    def companies(self, n, seed=0):
+        rng = random.Random(seed)
+        names = []
+        for i in range(n):
+            kind = RELEVANT if rng.random() < 0.6 else IRRELEVANT
+            names.append(' '.join(filter(None, [rng.choice(PREFIXES), rng.choice(kind), str(i), rng.choice(SUFFIXES)])))
+        return names
+
+    def driver(self):
+        return FakeDriver(self.search_base)
+
+    # Pages
+
+    def site_page(self, slug, section):
+        rng = random.Random(f"{slug}/{section}")
+        relevant = not any(slug_of(w) in slug for w in IRRELEVANT)
+        filler = RELEVANT_TEXT if relevant else IRRELEVANT_TEXT
+        body = (filler * (self.page_bytes // len(filler) + 1))[:self.page_bytes]
+        if not section:
+            body += rng.choice(EXTRAS)
+        links = ''.join(f"<a href='/{slug}/{SECTIONS[k % len(SECTIONS)]}-{k}'>{SECTIONS[k % len(SECTIONS)].title()}</a> "
+                        for k in range(self.fan_out))
+        return (f"<html><head><title>{slug}</title></head><body><nav><a href='/{slug}/contact'>Contact</a></nav>"
+                f"<h1>{slug}</h1><p>{body}</p>{links}<footer>Copyright {slug}</footer></body></html>")
+
+    def google_page(self, query):
+        # Same markup as Google's organic results: div.tF2Cxc > a[href], with the snippet text below
+        if 'site:zoominfo.com' in query:
+            company = query.split(' revenue site:')[0]
+            revenue = revenue_of(company)
+            snippet = (f"{company}'s revenue is ${revenue} Million" if revenue is not None
+                       else f"{company} company profile and contacts")
+            results = [(f"https://www.zoominfo.com/c/{slug_of(company)}/1", f"{company} - ZoomInfo", snippet)]
+        else:
+            company = query.replace(' official website', '')
+            results = [(f"https://www.facebook.com/{slug_of(company)}", f"{company} | Facebook", "Like us"),
+                       (self.site_url(company), company, f"Welcome to {company}")]
+        items = ''.join(f"<div class='g'><div class='tF2Cxc'><a href='{url}'><h3>{title}</h3></a>"
+                        f"<div class='VwiC3b'>{snippet}</div></div></div>" for url, title, snippet in results)
+        return f"<html><body><div id='search'>{items}</div></body></html>"
+
+    def html_search_page(self, query):
+        # DuckDuckGo's HTML endpoint: result links go through a /l/?uddg=<target> redirect
+        company = query.replace(' official website', '')
+        targets = [f"https://www.linkedin.com/company/{slug_of(company)}", self.site_url(company)]
+        links = ''.join(f"<a class='result__a' href='//duckduckgo.com/l/?uddg={quote(t, safe='')}'>{company}</a>"
+                        for t in targets)
+        return f"<html><body>{links}</body></html>"
+
+    def _handler(self):
+        web = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def do_GET(self):
+                with web._lock:
+                    web.requests += 1
+                parts = urlsplit(self.path)
+                query = parse_qs(parts.query).get('q', [''])[0]
+                if parts.path == '/robots.txt':
+                    self.send(200, "User-agent: *\nDisallow: /private/\n", 'text/plain')
+                elif parts.path == '/search':
+                    time.sleep(web.search_latency)
+                    self.send(200, web.google_page(query))
+                elif parts.path == '/html/':
+                    time.sleep(web.search_latency)
+                    self.send(200, web.html_search_page(query))
+                else:
+                    time.sleep(web.latency)
+                    slug, _, section = parts.path.strip('/').partition('/')
+                    self.send(200, web.site_page(slug, section))
+
+            def send(self, status, text, content_type='text/html'):
+                body = text.encode()
+                self.send_response(status)
+                self.send_header('Content-Type', f'{content_type}; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                try:
+                    self.wfile.write(body)
+                except (BrokenPipeError, ConnectionResetError):
+                    pass  # the client went away (e.g. a killed worker)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+
+class FakeElement:
+    def __init__(self, element):
+        self.element = element
+
+    @property
+    def text(self):
+        return ' '.join(self.element.text_content().split())
+
+    def get_attribute(self, name):
+        return self.element.get(name)
+
+    def find_elements(self, by, selector):
+        return [FakeElement(e) for e in self.element.cssselect(selector)]
+
+    def find_element(self, by, selector):
+        from selenium.common.exceptions import NoSuchElementException
+
+        found = self.find_elements(by, selector)
+        if not found:
+            raise NoSuchElementException(selector)
+        return found[0]
+
+
+class FakeDriver:
+    """
+    Enough of a Selenium WebDriver for the search lookups: get() loads the page from the fake web
+    (any engine's /search?q=... goes to the fake Google page) and elements are found with CSS selectors.
+    Only By.CSS_SELECTOR lookups are supported.
+    """
+
+    def __init__(self, search_base):
+        self.search_base = search_base
+        self.session = requests.Session()
+        self.current_url = 'about:blank'
+        self.page_source = '<html></html>'
+        self._root = None
+
+    def get(self, url):
+        import lxml.html
+
+        parts = urlsplit(url)
+        self.current_url = url
+        self.page_source = self.session.get(f"{self.search_base}/search?{parts.query}", timeout=30).text
+        self._root = FakeElement(lxml.html.fromstring(self.page_source))
+
+    def find_elements(self, by, selector):
+        return self._root.find_elements(by, selector) if self._root is not None else []
+
+    def find_element(self, by, selector):
+        from selenium.common.exceptions import NoSuchElementException
+
+        if self._root is None:
+            raise NoSuchElementException(selector)
+        return self._root.find_element(by, selector)
+
+    def quit(self):
+        self.session.close()
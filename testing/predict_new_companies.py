@@ -0,0 +1,49 @@
+"""
+Score the companies in testing/test_new_companies.csv (scrapes their live sites) and write
+testing/test_predictions.csv.
+
+    python testing/predict_new_companies.py
+"""
+import pandas as pd
+import joblib
+from sklearn.feature_extraction.text import TfidfVectorizer
+import numpy as np
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from leadgen.crawler import scrape_many
+from leadgen.text import preprocess_text
+
+
+def main():
+    # Load trained model and vectorizer
+    model = joblib.load('relevance_model.pkl')
+    vectorizer = joblib.load('vectorizer.pkl')
+
+    # Load new companies (CSV with company_name, website_url)
+    new_df = pd.read_csv('testing/test_new_companies.csv')  # Create this file
+
+    scraped = scrape_many(new_df['website_url'])
+
+    # Score every scraped text in one batch: one transform, one predict_proba
+    has_text = np.array([bool(t) for t in scraped])
+    relevance_prob = np.zeros(len(new_df))  # No text = irrelevant
+    relevance_pred = np.zeros(len(new_df), dtype=int)
+    if has_text.any():
+        X_new = vectorizer.transform([preprocess_text(t) for t in scraped if t])
+        relevance_prob[has_text] = model.predict_proba(X_new)[:, 1]  # Prob of relevant
+        relevance_pred[has_text] = model.predict(X_new)
+
+    # Save results
+    output_df = pd.DataFrame({
+        'company_name': new_df['company_name'],
+        'predicted_relevance': relevance_pred,
+        'relevance_probability': relevance_prob
+    })
+    output_df.to_csv('testing/test_predictions.csv', index=False)
+    print("Testing complete. Check 'testing/test_predictions.csv'.")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,63 @@
+"""
+The compact NumPy scorer must give the same probabilities as the scikit-learn model it was
+exported from.
+
+    python -m pytest testing/test_compact_model.py
+
+A small vectorizer and model are trained here with the settings `train` uses, so the check does
+not depend on the pickles in the repo (or the scikit-learn version they were pickled with).
+"""
+import os
+import sys
+
+import numpy as np
+import pytest
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.linear_model import LogisticRegression
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from leadgen.compact_model import CompactModel, export_compact, verify  # noqa: E402
+from leadgen.text import preprocess_text  # noqa: E402
+
+TEXTS = [
+    "Residential and commercial HVAC installation, heating and air conditioning repair in Fresno.",
+    "Licensed electrical contractor: panel upgrades, lighting retrofits and EV charger installs.",
+    "Family owned bakery with fresh bread, cakes and pastries baked daily.",
+    "Mechanical contractor for chillers, boilers and building controls across Southern California.",
+    "Boutique clothing store featuring local designers, shoes and accessories.",
+    "Commercial refrigeration service: walk-in coolers, ice machines and preventive maintenance.",
+    "Yoga studio offering beginner classes, meditation and wellness workshops.",
+    "Heating and cooling experts. 24/7 emergency furnace and air conditioner service!",
+    "Italian restaurant serving pizza, pasta and wine in downtown San Diego.",
+    "Industrial electric motor repair, controls integration and plant electrical services.",
+]
+LABELS = [1, 1, 0, 1, 0, 1, 0, 1, 0, 1]
+
+
+@pytest.fixture
+def trained():
+    vectorizer = TfidfVectorizer(max_features=1000, stop_words='english')
+    model = LogisticRegression().fit(vectorizer.fit_transform([preprocess_text(t) for t in TEXTS]), LABELS)
+    return vectorizer, model
+
+
+def test_compact_scorer_matches_sklearn(trained, tmp_path):
+    vectorizer, model = trained
+    export_compact(vectorizer, model, str(tmp_path))
+    unseen = ["Air conditioning and heating repair, furnace tune-ups", "Pizza and pasta delivery",
+              "", "words the model never saw", "HVAC HVAC HVAC electrical electrical"]
+    assert verify(CompactModel(str(tmp_path)), vectorizer, model, TEXTS + unseen) < 1e-9
+
+
+def test_unsupported_settings_are_refused(trained, tmp_path):
+    vectorizer, model = trained
+    vectorizer.set_params(ngram_range=(1, 2))
+    with pytest.raises(ValueError):
+        export_compact(vectorizer, model, str(tmp_path))
+
+
+def test_empty_batch(trained, tmp_path):
+    vectorizer, model = trained
+    export_compact(vectorizer, model, str(tmp_path))
+    assert len(CompactModel(str(tmp_path)).score([])) == 0
+    assert np.isclose(CompactModel(str(tmp_path)).score(['']), model.predict_proba(vectorizer.transform(['']))[:, 1])
@@ -0,0 +1,88 @@
+"""
+DriverPool checks with FakeDriver stubs (no browser, no network): lease/return, recycling a driver
+that died, and map() retrying on a fresh driver.
+
+    python -m pytest testing/test_driver_pool.py
+"""
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from leadgen.driver_pool import DriverPool  # noqa: E402
+from fake_web import FakeDriver  # noqa: E402
+
+
+def fake_driver():
+    return FakeDriver('http://127.0.0.1:9')  # never loaded: the tests do not call get()
+
+
+def crash(driver):
+    del driver.current_url  # the pool's health check reads current_url; a dead session raises there
+
+
+def test_lease_and_release_reuse_the_driver():
+    with DriverPool(size=2, factory=fake_driver) as pool:
+        driver = pool.lease()
+        pool.release(driver)
+        assert pool.lease() is driver
+        other = pool.lease()
+        assert other is not driver
+        assert pool.stats['started'] == 2 and pool.stats['leases'] == 3
+
+
+def test_driver_that_died_is_recycled():
+    with DriverPool(size=1, factory=fake_driver) as pool:
+        with pytest.raises(ValueError):
+            with pool.leased() as driver:
+                crash(driver)
+                raise ValueError("lookup failed")
+        fresh = pool.lease()
+        assert fresh is not driver
+        assert pool.stats['recycled'] == 1 and pool.stats['started'] == 2
+
+
+def test_failure_on_a_live_driver_keeps_it():
+    with DriverPool(size=1, factory=fake_driver) as pool:
+        with pytest.raises(ValueError):
+            with pool.leased() as driver:
+                raise ValueError("no revenue on the page")
+        assert pool.lease() is driver
+        assert pool.stats['recycled'] == 0
+
+
+def test_map_retries_an_item_on_a_fresh_driver():
+    crashed = []
+
+    def lookup(item, driver):
+        if item == 'b' and not crashed:
+            crashed.append(driver)
+            crash(driver)
+            raise RuntimeError("browser crashed")
+        return item.upper()
+
+    with DriverPool(size=2, factory=fake_driver) as pool:
+        assert pool.map(lookup, ['a', 'b', 'c', 'd']) == ['A', 'B', 'C', 'D']
+        assert pool.stats['recycled'] == 1
+
+
+def test_map_gives_up_after_retries():
+    def lookup(item, driver):
+        if item == 'b':
+            crash(driver)
+            raise RuntimeError("browser crashed")
+        return item.upper()
+
+    with DriverPool(size=1, factory=fake_driver) as pool:
+        assert pool.map(lookup, ['a', 'b', 'c'], retries=1) == ['A', None, 'C']
+        assert pool.stats['recycled'] == 2
+
+
+def test_map_raises_when_no_driver_can_be_started():
+    def broken_factory():
+        raise OSError("chromedriver not found")
+
+    with DriverPool(size=2, factory=broken_factory) as pool:
+        with pytest.raises(OSError):
+            pool.map(lambda item, driver: item, ['a', 'b', 'c'])
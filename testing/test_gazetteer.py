@@ -0,0 +1,44 @@
+"""
+HQ state checks: the offline gazetteer and the CA HQ verdict built on it.
+
+    python -m pytest testing/test_gazetteer.py
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from leadgen.gazetteer import city_state, hq_state, place_state, zip_state  # noqa: E402
+from leadgen.signals import CA_CITIES, CORE_CA_CITIES  # noqa: E402
+from leadgen.text import check_hq_from_site  # noqa: E402
+
+
+def test_zip_state():
+    assert zip_state('92101') == 'CA'
+    assert zip_state('92101-1234') == 'CA'
+    assert zip_state('06320') == 'CT'  # New London, not New York
+    assert zip_state('10001') == 'NY'
+    assert zip_state('00000') is None
+    assert zip_state('9210') is None
+
+
+def test_cities():
+    assert city_state('Fresno') == 'CA'
+    assert city_state('Portland') is None  # OR and ME
+    assert city_state('Portland', 'ME') == 'ME'
+    assert place_state('San Diego, California, United States') == 'CA'
+    assert place_state('Toronto, Ontario, Canada') is None
+
+
+def test_hq_state():
+    assert hq_state("Headquarters: 123 Main St, Fresno, CA 93721") == 'CA'
+    assert hq_state("Offices in Dallas, TX 75201 and Irvine, CA 92614, Dallas, TX 75202") == 'TX'
+    assert hq_state("We serve Texas") is None
+
+
+def test_check_hq_from_site():
+    assert set(CORE_CA_CITIES) <= set(CA_CITIES)
+    assert check_hq_from_site("Our office is in Pasadena.")
+    assert not check_hq_from_site("Visit us at 100 Main St, Pasadena, TX 77506")
+    assert check_hq_from_site("Call 90210 now")
+    assert not check_hq_from_site("Our office: Reno, NV 89501")
+    assert check_hq_from_site("") is None
@@ -0,0 +1,59 @@
+"""
+Training set store checks: the Parquet round trip, seeding from the old CSV and the label diff.
+
+    python -m pytest testing/test_prep.py
+
+The round trip needs pyarrow (as `prep` does) and is skipped without it.
+"""
+import os
+import sys
+
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from leadgen.prep import NO_URL, STORE_COLUMNS, diff, load_store, write_store  # noqa: E402
+
+
+def make_store():
+    return pd.DataFrame({
+        'company_name': ['Acme', 'Bolt', 'Cog'],
+        'website_url': ['https://acme.com', 'https://bolt.com', 'https://cog.com'],
+        'label_relevance': [1, 0, 1],
+        'scraped_text': ['acme text', None, 'cog text'],
+        'error': [None, 'TimeoutError', None],
+        'attempts': [1, 3, 1],
+        'scraped_at': [1000.0, 1000.0, 1000.0],
+    })[STORE_COLUMNS]
+
+
+def test_store_round_trip(tmp_path):
+    pytest.importorskip('pyarrow')
+    path = str(tmp_path / 'training_set.parquet')
+    store = make_store()
+    write_store(store, path)
+    assert not os.path.exists(path + '.tmp')
+    pd.testing.assert_frame_equal(load_store(path), store)
+
+
+def test_seed_from_csv(tmp_path):
+    csv = tmp_path / 'labeled_companies_with_text.csv'
+    make_store()[['company_name', 'website_url', 'label_relevance', 'scraped_text']].dropna().to_csv(csv, index=False)
+    store = load_store(str(tmp_path / 'missing.parquet'), str(csv))
+    assert list(store.columns) == STORE_COLUMNS
+    assert list(store['company_name']) == ['Acme', 'Cog']
+
+
+def test_diff():
+    labels = pd.DataFrame({
+        'company_name': ['Acme', 'Bolt', 'Cog', 'Dart', 'Echo'],
+        'website_url': ['https://acme.com', 'https://bolt.com', 'https://cog.io', 'https://dart.com', None],
+        'label_relevance': [0, 0, 1, 1, 1],
+    })
+    df, todo = diff(labels, make_store())
+    # Acme: label edit only; Bolt: failed earlier; Cog: new URL; Dart: new; Echo: no URL
+    assert list(todo) == [False, False, True, True, False]
+    assert df.loc[0, 'scraped_text'] == 'acme text' and df.loc[0, 'label_relevance'] == 0
+    assert pd.isna(df.loc[2, 'scraped_text'])
+    assert df.loc[4, 'error'] == NO_URL
+    assert list(diff(labels, make_store(), retry_failed=True)[1]) == [False, True, True, True, False]
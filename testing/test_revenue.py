@@ -0,0 +1,43 @@
+"""
+Revenue parser checks: real revenue mentions parse, prices and head counts do not.
+
+    python -m pytest testing/test_revenue.py
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from leadgen.revenue import extract_revenue, parse_bing_revenue, parse_revenue, parse_zoominfo_revenue  # noqa: E402
+
+
+def test_revenue_mentions():
+    assert parse_zoominfo_revenue("Acme's revenue is $12.5 Million.") == 12.5
+    assert parse_zoominfo_revenue("Acme revenue in 2021 was $7M") == 7.0
+    assert extract_revenue("Acme generates USD 1.2 billion in revenue") == 1200.0
+    assert extract_revenue("US$3.2bn revenue") == 3200.0
+    assert parse_bing_revenue("What is Acme's revenue? Annual revenue: $10-50 million", 'Acme') == 30.0
+
+
+def test_bing_revenue_is_the_company_s():
+    page = "Bolt's revenue is $900 million. Acme's revenue in 2023: $12M. What is revenue? ..."
+    assert parse_bing_revenue(page, 'Acme') == 12.0
+    assert parse_bing_revenue("Bolt's revenue is $900 million", 'Acme') is None
+    assert parse_bing_revenue("Acme (A+B) Co.'s revenue was $3 billion", 'Acme (A+B) Co.') == 3000.0
+
+
+def test_range_confidence():
+    revenue, low, high, confidence, pattern = parse_revenue("revenue is $10M to $50M")
+    assert (revenue, low, high, pattern) == (30.0, 10.0, 50.0, 'revenue_is')
+    assert confidence < parse_revenue("revenue is $10M")[3]
+
+
+def test_amounts_without_a_unit_are_not_revenue():
+    assert parse_zoominfo_revenue("acme revenue grew 15% last year with 1,200 employees") is None
+    assert extract_revenue("price $1,299 for a furnace") is None
+    assert extract_revenue("Call 1,200 customers served") is None
+
+
+def test_no_mention():
+    assert extract_revenue("") is None
+    assert extract_revenue(None) is None
+    assert parse_zoominfo_revenue("Acme raised $5M in seed funding") is None
@@ -0,0 +1,44 @@
+"""
+Result file checks: partial paths, typed batches and the external sort.
+
+    python -m pytest testing/test_streaming.py
+
+The Parquet case needs pyarrow and is skipped without it.
+"""
+import os
+import sys
+
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from leadgen.pipeline import COLUMN_TYPES, COLUMNS  # noqa: E402
+from leadgen.streaming import ResultWriter, external_sort, partial_path_for  # noqa: E402
+
+# The first chunk has whole-number revenues and no websites or skip reasons
+CHUNKS = [
+    [(0.0, 'Acme', 0.2, 0, None, None), (0.0, 'Bolt', 0.4, 0, None, None)],
+    [(0.9, 'Cog', 0.9, 23.8, 'https://cog.com', None), (0.0, 'Dart', 0.1, None, None, 'relevance')],
+]
+
+
+def test_partial_path_for():
+    assert partial_path_for('ranked.csv') == 'ranked.partial.csv'
+    assert partial_path_for('out/ranked.parquet') == 'out/ranked.partial.parquet'
+    assert partial_path_for('ranked_out') == 'ranked_out.partial'
+
+
+@pytest.mark.parametrize('ext', ['.csv', '.parquet', ''])
+def test_chunks_with_different_inferred_types(tmp_path, ext):
+    if ext == '.parquet':
+        pytest.importorskip('pyarrow')
+    output = str(tmp_path / f'ranked{ext}')
+    partial = partial_path_for(output)
+    with ResultWriter(partial, COLUMNS, COLUMN_TYPES) as writer:
+        for rows in CHUNKS:
+            writer.write(rows)
+    assert external_sort(partial, output, types=COLUMN_TYPES) == 4
+    df = pd.read_parquet(output) if ext == '.parquet' else pd.read_csv(output)
+    assert list(df['company_name']) == ['Cog', 'Acme', 'Bolt', 'Dart']
+    assert df['revenue'].tolist()[:3] == [23.8, 0.0, 0.0]
+    assert df['website'].tolist()[0] == 'https://cog.com'